@@ -3,7 +3,13 @@ from app.grid import SudokuGrid
 from app.validator import SudokuValidator
 from app.generator import SudokuGenerator
 from app.recursion import SudokuRecursion
+from app.exact_cover import SudokuExactCover
+from app.stack_search import SudokuStackSearch
 from app.iteration import SudokuIteration
+from app.candidates import SudokuCandidates
+from app.transform import SudokuTransformer
+from app.events import SudokuEvents, PrintEvents
+from app.registry import TechniqueRegistry, register_technique
 from app.utils import print_formatted_grid
 
 __all__ = [
@@ -13,7 +19,15 @@ __all__ = [
     "SudokuValidator",
     "SudokuGenerator",
     "SudokuRecursion",
+    "SudokuExactCover",
+    "SudokuStackSearch",
     "SudokuIteration",
+    "SudokuCandidates",
+    "SudokuTransformer",
+    "SudokuEvents",
+    "PrintEvents",
+    "TechniqueRegistry",
+    "register_technique",
     "print_formatted_grid"
     
 ]
@@ -0,0 +1,181 @@
+from typing import Dict, Iterator, Optional, Tuple, Union
+from contextlib import contextmanager
+import random
+import threading
+
+from app.main import SudokuFacade
+from app.grid import Puzzle
+
+# The idle facades of the current thread, keyed by backend, each with the random number generator its components share.
+_local = threading.local()
+
+@contextmanager
+def borrow_facade(backend: str = "recursion") -> Iterator[Tuple[SudokuFacade, random.Random]]:
+
+    """
+    Lends a facade to the caller for the duration of a with block, building one only if the current thread has none idle.
+
+    A facade is only ever held by one caller, in one thread, at a time, so the functions below never share a grid or any scratch state,
+    while a thread pool worker still reuses the same facade from one call to the next.
+
+    Parameters:
+
+        backend (str): The solving engine of the facade ('recursion', 'exact_cover' or 'stack_search').
+
+    Raises:
+
+        ValueError: If the backend is not a valid backend.
+
+    Returns:
+
+        Iterator[Tuple[SudokuFacade, random.Random]]: The facade, and the random number generator shared by its components.
+    
+    """
+
+    if backend not in SudokuFacade.backends:
+
+        raise ValueError(f"Please provide a valid backend (e.g., {' or '.join(SudokuFacade.backends)}).")
+
+    idle = getattr(_local, "idle", None)
+
+    if idle is None:
+
+        idle = _local.idle = {backend: [] for backend in SudokuFacade.backends}
+
+    if idle[backend]:
+
+        facade = idle[backend].pop()
+
+    else:
+
+        rng = random.Random()
+
+        facade = (SudokuFacade(backend=backend, rng=rng), rng)
+
+    try:
+
+        yield facade
+
+    finally:
+
+        idle[backend].append(facade)
+
+def is_valid(puzzle: Puzzle) -> bool:
+
+    """
+    Checks that no row, column or subgrid of a puzzle repeats a value.
+
+    Parameters:
+
+        puzzle (Puzzle): The puzzle to be checked, in any format accepted by SudokuGrid.load.
+
+    Raises:
+
+        ValueError: If the puzzle is not a valid puzzle format.
+
+    Returns:
+
+        bool: True if the puzzle is valid, otherwise False.
+    
+    """
+
+    with borrow_facade() as (sudoku, _):
+
+        sudoku.grid.load(puzzle)
+
+        return sudoku.validator.is_grid_valid()
+
+def solve(puzzle: Puzzle) -> Optional[str]:
+
+    """
+    Solves a puzzle by logical deduction followed by backtracking, as SudokuFacade.solve.
+
+    Parameters:
+
+        puzzle (Puzzle): The puzzle to be solved, in any format accepted by SudokuGrid.load.
+
+    Raises:
+
+        ValueError: If the puzzle is not a valid puzzle format.
+
+    Returns:
+
+        Optional[str]: The solution as a string of 81 digits, or None if the puzzle is invalid or unsolvable.
+    
+    """
+
+    with borrow_facade() as (sudoku, _):
+
+        sudoku.grid.load(puzzle)
+
+        return sudoku.grid.to_string() if sudoku.solve() else None
+
+def count_solutions(puzzle: Puzzle, max_solutions: int = 2) -> int:
+
+    """
+    Counts the solutions of a puzzle, up to a limit, by recursive backtracking over the most constrained cells with propagated singles.
+
+    Parameters:
+
+        puzzle (Puzzle): The puzzle to be checked, in any format accepted by SudokuGrid.load.
+        max_solutions (int): The number of solutions after which counting stops. Defaults to 2, enough to check uniqueness.
+
+    Raises:
+
+        ValueError: If the puzzle is not a valid puzzle format.
+
+    Returns:
+
+        int: The number of solutions found, which is 0 for an invalid puzzle.
+    
+    """
+
+    with borrow_facade() as (sudoku, _):
+
+        sudoku.grid.load(puzzle)
+
+        return int(sudoku.recursion.get_total_solutions(max_solutions, branching="mrv", propagate=True))
+
+def generate(
+
+    target_removal: int = None,
+    difficulty_level: str = None,
+    seed: int = None,
+    backend: str = "recursion",
+    transform: bool = False
+
+) -> Dict[str, Union[int, str]]:
+
+    """
+    Generates a puzzle with a unique solution.
+
+    Parameters:
+
+        target_removal (int): The target number of cells to remove.
+        difficulty_level (str): The difficulty level of the puzzle ('easy', 'medium', 'hard' or 'expert').
+        seed (int): The seed of the puzzle, for reproducible results. Defaults to None, which selects a random seed.
+        backend (str): The solving engine used to fill and check the puzzle ('recursion', 'exact_cover' or 'stack_search').
+        transform (bool): If True, fills the grid by transforming a stored solution rather than by backtracking, as SudokuFacade.generate_many.
+
+    Raises:
+
+        ValueError: As raised by SudokuGenerator.generate_puzzle, or if the backend is not a valid backend.
+
+    Returns:
+
+        Dict[str, Union[int, str]]: A record of the puzzle, as yielded by SudokuFacade.generate_many.
+    
+    """
+
+    with borrow_facade(backend) as (sudoku, rng):
+
+        # Reseeding gives the same sequence as a new generator seeded with the same seed, and None reseeds from the system.
+        rng.seed(seed)
+
+        return next(sudoku.generate_many(1, target_removal, difficulty_level, transform))
+
+
+
+if __name__ == "__main__":
+
+    print("--------------------")
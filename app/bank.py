@@ -0,0 +1,469 @@
+from typing import Dict, List, Optional, Union
+import hashlib
+import sqlite3
+import threading
+
+from app.canonical import canonical_form
+from app.serialisation import decode_string
+
+# The difficulty levels accepted by SudokuGenerator.generate_puzzle.
+DIFFICULTY_LEVELS = ("easy", "medium", "hard", "expert")
+
+# Every combination of criteria has an index ending in id, so taking the oldest match reads the first entry of one index, with no sort.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS puzzles (
+    id INTEGER PRIMARY KEY,
+    puzzle TEXT NOT NULL,
+    solution TEXT NOT NULL,
+    difficulty TEXT,
+    clues INTEGER NOT NULL,
+    techniques TEXT NOT NULL,
+    hardest_technique TEXT,
+    canonical_hash TEXT NOT NULL UNIQUE
+);
+CREATE INDEX IF NOT EXISTS puzzles_by_difficulty ON puzzles (difficulty, id);
+CREATE INDEX IF NOT EXISTS puzzles_by_clues ON puzzles (clues, id);
+CREATE INDEX IF NOT EXISTS puzzles_by_technique ON puzzles (hardest_technique, id);
+CREATE INDEX IF NOT EXISTS puzzles_by_difficulty_clues ON puzzles (difficulty, clues, id);
+CREATE INDEX IF NOT EXISTS puzzles_by_difficulty_technique ON puzzles (difficulty, hardest_technique, id);
+CREATE INDEX IF NOT EXISTS puzzles_by_clues_technique ON puzzles (clues, hardest_technique, id);
+CREATE INDEX IF NOT EXISTS puzzles_by_all ON puzzles (difficulty, clues, hardest_technique, id);
+"""
+
+# The technique recorded last for a puzzle the registered techniques leave unsolved.
+SEARCH_TECHNIQUE = "backtracking"
+
+# The columns returned for every puzzle, in order.
+COLUMNS = ("id", "puzzle", "solution", "difficulty", "clues", "techniques", "hardest_technique", "canonical_hash")
+
+def get_canonical_hash(puzzle: str) -> str:
+
+    """
+    Returns a hash of the canonical form of a puzzle, identical for every puzzle symmetric to it.
+
+    Parameters:
+
+        puzzle (str): The puzzle as a string of 81 digits.
+
+    Returns:
+
+        str: The hexadecimal hash.
+    
+    """
+
+    canonical, _ = canonical_form(decode_string(puzzle))
+
+    return hashlib.blake2b(canonical, digest_size=16).hexdigest()
+
+class PuzzleBank:
+
+    """
+    A class to store pre-generated puzzles in a sqlite3 database, indexed by difficulty, clue count, hardest technique and canonical hash.
+
+    Serving a puzzle is a single indexed lookup and deletion, so its latency does not depend on generating a puzzle.
+    A bank is safe to share between threads, such as the threads serving puzzles and a BankRefiller.
+    
+    """
+
+    def __init__(self, path: str = ":memory:") -> None:
+
+        """
+        Initialises PuzzleBank by opening, or creating, the database at the path.
+
+        Parameters:
+
+            path (str): The path of the database. Defaults to ':memory:', which holds the bank in memory only.
+
+        Attributes:
+
+            connection (sqlite3.Connection): The connection to the database, used under the lock.
+            lock (threading.Lock): Serialises every use of the connection.
+            taken (threading.Event): Set whenever a puzzle is taken, to wake a BankRefiller.
+        
+        """
+
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.taken = threading.Event()
+
+        with self.lock, self.connection:
+
+            self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+
+        """
+        Closes the database.
+        
+        """
+
+        with self.lock:
+
+            self.connection.close()
+
+    def add(self, puzzle: str, solution: str, difficulty_level: str = None, techniques: List[str] = ()) -> bool:
+
+        """
+        Adds a puzzle, unless a puzzle symmetric to it is already in the bank.
+
+        Parameters:
+
+            puzzle (str): The puzzle as a string of 81 digits.
+            solution (str): Its solution as a string of 81 digits.
+            difficulty_level (str): The difficulty level of the puzzle ('easy', 'medium', 'hard' or 'expert'), if known.
+            techniques (List[str]): The names of the techniques that solve the puzzle, from the simplest to the hardest,
+
+                ending with SEARCH_TECHNIQUE if they leave it unsolved.
+
+        Raises:
+
+            ValueError: If the difficulty level is not a valid difficulty level.
+
+        Returns:
+
+            bool: True if the puzzle was added, otherwise False.
+        
+        """
+
+        if difficulty_level is not None and difficulty_level not in DIFFICULTY_LEVELS:
+
+            raise ValueError("Please provide a valid difficulty level (e.g., easy, medium, hard or expert).")
+
+        row = (
+
+            puzzle,
+            solution,
+            difficulty_level,
+            len(puzzle) - puzzle.count("0"),
+            ",".join(techniques),
+            techniques[-1] if techniques else None,
+            get_canonical_hash(puzzle)
+
+        )
+
+        with self.lock, self.connection:
+
+            cursor = self.connection.execute(
+
+                "INSERT OR IGNORE INTO puzzles (puzzle, solution, difficulty, clues, techniques, hardest_technique, canonical_hash) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                row
+
+            )
+
+            return cursor.rowcount == 1
+
+    def take(self, difficulty_level: str = None, clues: int = None, technique: str = None) -> Optional[Dict[str, Union[int, str]]]:
+
+        """
+        Removes and returns the oldest puzzle matching every given criterion, through a single index lookup.
+
+        Parameters:
+
+            difficulty_level (str): The difficulty level of the puzzle, if required.
+            clues (int): The number of clues of the puzzle, if required.
+            technique (str): The hardest technique needed to solve the puzzle, or SEARCH_TECHNIQUE, if required.
+
+        Returns:
+
+            Optional[Dict[str, Union[int, str]]]: The puzzle, keyed by column name, or None if no puzzle matches.
+        
+        """
+
+        query, parameters = self.get_take_query(difficulty_level, clues, technique)
+
+        with self.lock, self.connection:
+
+            row = self.connection.execute(query, parameters).fetchone()
+
+            if row is None:
+
+                return None
+
+            self.connection.execute("DELETE FROM puzzles WHERE id = ?", (row[0],))
+
+        self.taken.set()
+
+        return dict(zip(COLUMNS, row))
+
+    def count(self, difficulty_level: str = None, clues: int = None, technique: str = None) -> int:
+
+        """
+        Returns the number of puzzles matching every given criterion.
+
+        Parameters:
+
+            difficulty_level (str): The difficulty level of the puzzles, if required.
+            clues (int): The number of clues of the puzzles, if required.
+            technique (str): The hardest technique needed to solve the puzzles, if required.
+
+        Returns:
+
+            int: The number of matching puzzles.
+        
+        """
+
+        where, parameters = self.get_conditions(difficulty_level, clues, technique)
+
+        with self.lock:
+
+            return self.connection.execute(f"SELECT COUNT(*) FROM puzzles{where}", parameters).fetchone()[0]
+
+    def contains(self, puzzle: str) -> bool:
+
+        """
+        Checks if the bank holds a puzzle symmetric to the given puzzle.
+
+        Parameters:
+
+            puzzle (str): The puzzle as a string of 81 digits.
+
+        Returns:
+
+            bool: True if a symmetric puzzle is in the bank, otherwise False.
+        
+        """
+
+        with self.lock:
+
+            return self.connection.execute("SELECT 1 FROM puzzles WHERE canonical_hash = ?", (get_canonical_hash(puzzle),)).fetchone() is not None
+
+    @classmethod
+    def get_take_query(cls, difficulty_level: str = None, clues: int = None, technique: str = None) -> tuple:
+
+        """
+        Returns the query selecting the oldest puzzle that matches every given criterion, and its parameters.
+
+        Returns:
+
+            tuple: The query and its parameters.
+        
+        """
+
+        where, parameters = cls.get_conditions(difficulty_level, clues, technique)
+
+        return f"SELECT {', '.join(COLUMNS)} FROM puzzles{where} ORDER BY id LIMIT 1", parameters
+
+    @staticmethod
+    def get_conditions(difficulty_level: str = None, clues: int = None, technique: str = None) -> tuple:
+
+        """
+        Returns the WHERE clause and parameters selecting the puzzles that match every given criterion.
+
+        Returns:
+
+            tuple: The clause, empty if there are no criteria, and its parameters.
+        
+        """
+
+        conditions = []
+        parameters = []
+
+        for column, value in (("difficulty", difficulty_level), ("clues", clues), ("hardest_technique", technique)):
+
+            if value is not None:
+
+                conditions.append(f"{column} = ?")
+                parameters.append(value)
+
+        return (" WHERE " + " AND ".join(conditions) if conditions else ""), parameters
+
+    def refill(self, facade, difficulty_level: str, count: int) -> int:
+
+        """
+        Generates puzzles with a facade and adds them, with the techniques that solve each one.
+
+        A puzzle the techniques leave unsolved is recorded as needing SEARCH_TECHNIQUE after them.
+
+        Parameters:
+
+            facade (SudokuFacade): The facade that generates the puzzles, used only by the calling thread.
+            difficulty_level (str): The difficulty level of the puzzles ('easy', 'medium', 'hard' or 'expert').
+            count (int): The number of puzzles to generate.
+
+        Returns:
+
+            int: The number of puzzles added, fewer than generated if any were symmetric to a puzzle already in the bank.
+        
+        """
+
+        added = 0
+
+        for record in facade.generate_many(count, difficulty_level=difficulty_level):
+
+            facade.grid.load(record["puzzle"])
+
+            # Every technique registered so far, in the fixed cost ordering, so the last technique used is the hardest.
+            results = facade.iteration.candidate_techniques(facade.iteration.registry.ordered(adaptive=False))
+
+            techniques = [technique_type for technique_type, result in results.items() if result["count"]]
+
+            if facade.grid.count_empty_cells():
+
+                techniques.append(SEARCH_TECHNIQUE)
+
+            added += self.add(record["puzzle"], record["solution"], difficulty_level, techniques)
+
+        return added
+
+class BankRefiller(threading.Thread):
+
+    """
+    A background thread that tops up every difficulty level of a bank whose puzzle count drops below its watermark.
+    
+    """
+
+    def __init__(
+
+        self,
+        bank: PuzzleBank,
+        facade,
+        watermarks: Dict[str, int],
+        capacity: int = None,
+        batch_size: int = 10,
+        interval: float = 1.0,
+        max_backoff: float = 60.0
+
+    ) -> None:
+
+        """
+        Initialises BankRefiller as a daemon thread, which starts refilling when started.
+
+        Parameters:
+
+            bank (PuzzleBank): The bank to be refilled.
+            facade (SudokuFacade): A facade used only by this thread to generate puzzles.
+            watermarks (Dict[str, int]): The puzzle count below which each difficulty level is refilled.
+            capacity (int): The puzzle count a difficulty level is refilled to. Defaults to None, which uses twice its watermark.
+            batch_size (int): The number of puzzles generated before the counts are checked again.
+            interval (float): The longest time between checks, in seconds, when no puzzle is taken.
+            max_backoff (float): The longest time to wait before retrying after failed refills, in seconds.
+
+        Raises:
+
+            ValueError: If a difficulty level is not a valid difficulty level.
+
+        Attributes:
+
+            error (Exception): The error of the last refill, if it failed, otherwise None. Reported through the events of the facade's generator.
+        
+        """
+
+        super().__init__(name="BankRefiller", daemon=True)
+
+        for difficulty_level in watermarks:
+
+            if difficulty_level not in DIFFICULTY_LEVELS:
+
+                raise ValueError("Please provide a valid difficulty level (e.g., easy, medium, hard or expert).")
+
+        self.bank = bank
+        self.facade = facade
+        self.watermarks = dict(watermarks)
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_backoff = max_backoff
+
+        self.stopping = threading.Event()
+        self.error = None
+
+    def run(self) -> None:
+
+        """
+        Refills the bank until stopped, waking when a puzzle is taken or the interval elapses.
+
+        A failed refill is reported rather than ending the thread, and retried after a wait that doubles with every consecutive failure.
+        
+        """
+
+        failures = 0
+
+        while not self.stopping.is_set():
+
+            try:
+
+                refilled = self.refill_once()
+
+            except Exception as error:
+
+                failures += 1
+
+                self.error = error
+
+                self.facade.generator.events.refill_failed(error, failures)
+
+                # Only stopping cuts the wait short, so taking puzzles cannot turn the backoff into a busy loop.
+                self.stopping.wait(min(self.interval * 2 ** (failures - 1), self.max_backoff))
+
+                continue
+
+            failures = 0
+
+            self.error = None
+
+            if not refilled:
+
+                self.bank.taken.wait(self.interval)
+
+                self.bank.taken.clear()
+
+    def refill_once(self) -> bool:
+
+        """
+        Generates a batch of puzzles for every difficulty level below its watermark.
+
+        Returns:
+
+            bool: True if any difficulty level was below its watermark, otherwise False.
+        
+        """
+
+        refilled = False
+
+        for difficulty_level, watermark in self.watermarks.items():
+
+            count = self.bank.count(difficulty_level)
+
+            if count < watermark and not self.stopping.is_set():
+
+                capacity = self.capacity or 2 * watermark
+
+                self.bank.refill(self.facade, difficulty_level, min(self.batch_size, capacity - count))
+
+                refilled = True
+
+        return refilled
+
+    def stop(self, timeout: float = None) -> None:
+
+        """
+        Stops the thread after its current batch, and waits for it to finish.
+
+        Parameters:
+
+            timeout (float): The longest time to wait, in seconds. Defaults to None, which waits until the thread finishes.
+
+        Raises:
+
+            Exception: The error of the last refill, if it failed.
+        
+        """
+
+        self.stopping.set()
+
+        self.bank.taken.set()
+
+        if self.is_alive():
+
+            self.join(timeout)
+
+        if self.error is not None:
+
+            raise self.error
+
+
+
+if __name__ == "__main__":
+
+    print("--------------------")
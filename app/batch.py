@@ -0,0 +1,255 @@
+from typing import Dict, Iterable, Iterator, Tuple, Union
+from multiprocessing import Pool
+import argparse
+import json
+import random
+
+from app.main import SudokuFacade
+from app.api import generate
+from app.canonical import canonical_form
+from app.corpus import CorpusWriter
+from app.grid import CELL_VALUES
+
+# A generation task, consisting of its index, seed, target removal, difficulty level, backend and whether to transform a stored solution.
+GenerationTask = Tuple[int, int, int, str, str, bool]
+
+def derive_seeds(seed: int, count: int) -> Iterator[int]:
+
+    """
+    Derives an independent seed for every task in a batch from a single batch seed.
+
+    Each task seed depends only on the batch seed and the task index, never on how tasks are scheduled.
+
+    Parameters:
+
+        seed (int): The seed of the whole batch.
+        count (int): The number of task seeds to derive.
+
+    Returns:
+
+        Iterator[int]: An iterator of 64-bit task seeds, in task index order.
+    
+    """
+
+    seed_rng = random.Random(seed)
+
+    for _ in range(count):
+
+        yield seed_rng.getrandbits(64)
+
+def generate_puzzle_task(task: GenerationTask) -> Dict[str, Union[int, str]]:
+
+    """
+    Generates a single puzzle with its own random number generator, for use in a worker process.
+
+    Parameters:
+
+        task (GenerationTask): The index, seed, target removal, difficulty level, backend and transformation flag of the task.
+
+    Returns:
+
+        Dict[str, Union[int, str]]: A record of the task index and seed, the puzzle and its solution as 81-character strings, and the number of clues.
+    
+    """
+
+    index, seed, target_removal, difficulty_level, backend, transform = task
+
+    record = generate(target_removal, difficulty_level, seed, backend, transform)
+
+    return {"index": index, "seed": seed, **record}
+
+def generate_puzzles(
+
+    count: int,
+    target_removal: int = None,
+    difficulty_level: str = None,
+    seed: int = None,
+    workers: int = None,
+    backend: str = "recursion",
+    ordered: bool = False,
+    transform: bool = False
+
+) -> Iterator[Dict[str, Union[int, str]]]:
+
+    """
+    Generates a batch of puzzles across a pool of worker processes, yielding each puzzle as soon as it is ready.
+
+    Every puzzle is generated from its own seed, derived from the batch seed and its index,
+    so a batch is reproducible regardless of the number of workers or the order in which puzzles finish.
+
+    Parameters:
+
+        count (int): The number of puzzles to generate.
+        target_removal (int): The target number of cells to remove from each puzzle.
+        difficulty_level (str): The difficulty level of each puzzle ('easy', 'medium', 'hard' or 'expert').
+        seed (int): The seed of the whole batch. Defaults to None, which selects a random batch seed.
+        workers (int): The number of worker processes. Defaults to None, which uses one per CPU core.
+
+            A single worker generates every puzzle in the calling process.
+
+        backend (str): The solving engine used to fill and check each puzzle ('recursion', 'exact_cover' or 'stack_search').
+        ordered (bool): If True, yields the puzzles in index order rather than in order of completion.
+        transform (bool): If True, fills each grid by transforming a stored solution rather than by backtracking, as SudokuFacade.generate_many.
+
+    Raises:
+
+        ValueError: If the number of puzzles is negative, or the backend is not a valid backend.
+
+    Returns:
+
+        Iterator[Dict[str, Union[int, str]]]: An iterator of puzzle records, as returned by generate_puzzle_task.
+    
+    """
+
+    if not isinstance(count, int) or count < 0:
+
+        raise ValueError(f"{count} must be a non-negative integer.")
+
+    if backend not in SudokuFacade.backends:
+
+        raise ValueError(f"Please provide a valid backend (e.g., {' or '.join(SudokuFacade.backends)}).")
+
+    if seed is None:
+
+        seed = random.SystemRandom().getrandbits(64)
+
+    tasks = (
+
+        (index, task_seed, target_removal, difficulty_level, backend, transform)
+        for index, task_seed in enumerate(derive_seeds(seed, count))
+
+    )
+
+    # The arguments are checked above, at the call, and only the generation itself is deferred until iteration.
+    return _run_tasks(tasks, workers, ordered)
+
+def _run_tasks(tasks: Iterable[GenerationTask], workers: int = None, ordered: bool = False) -> Iterator[Dict[str, Union[int, str]]]:
+
+    """
+    Runs generation tasks in the calling process or across a pool of worker processes.
+
+    Parameters:
+
+        tasks (Iterable[GenerationTask]): The tasks to be run.
+        workers (int): The number of worker processes. Defaults to None, which uses one per CPU core.
+        ordered (bool): If True, yields the puzzles in index order rather than in order of completion.
+
+    Returns:
+
+        Iterator[Dict[str, Union[int, str]]]: An iterator of puzzle records, as returned by generate_puzzle_task.
+    
+    """
+
+    if workers == 1:
+
+        yield from map(generate_puzzle_task, tasks)
+
+        return
+
+    with Pool(processes=workers) as pool:
+
+        if ordered:
+
+            yield from pool.imap(generate_puzzle_task, tasks)
+
+        else:
+
+            yield from pool.imap_unordered(generate_puzzle_task, tasks)
+
+def drop_duplicates(records: Iterable[Dict[str, Union[int, str]]]) -> Iterator[Dict[str, Union[int, str]]]:
+
+    """
+    Yields every puzzle record that is not symmetric to one already yielded, comparing the canonical forms of the puzzles.
+
+    Parameters:
+
+        records (Iterable[Dict[str, Union[int, str]]]): The puzzle records, as returned by generate_puzzle_task.
+
+    Returns:
+
+        Iterator[Dict[str, Union[int, str]]]: The records of the first puzzle of every equivalence class, in their original order.
+    
+    """
+
+    seen = set()
+
+    for record in records:
+
+        canonical, _ = canonical_form(record["puzzle"].encode("ascii").translate(CELL_VALUES))
+
+        if canonical not in seen:
+
+            seen.add(canonical)
+
+            yield record
+
+def format_record(record: Dict[str, Union[int, str]], output_format: str) -> str:
+
+    """
+    Formats a puzzle record as a single line of output.
+
+    Parameters:
+
+        record (Dict[str, Union[int, str]]): The puzzle record to be formatted.
+        output_format (str): Either 'string', for the 81-character puzzle only, or 'json', for the whole record.
+
+    Returns:
+
+        str: The formatted record.
+    
+    """
+
+    if output_format == "json":
+
+        return json.dumps(record)
+
+    return record["puzzle"]
+
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Generates a batch of Sudoku puzzles, one per line.")
+
+    parser.add_argument("--count", type=int, required=True, help="The number of puzzles to generate.")
+    parser.add_argument("--target-removal", type=int, help="The target number of cells to remove from each puzzle.")
+    parser.add_argument("--difficulty", choices=["easy", "medium", "hard", "expert"], help="The difficulty level of each puzzle.")
+    parser.add_argument("--seed", type=int, help="The seed of the whole batch.")
+    parser.add_argument("--workers", type=int, help="The number of worker processes.")
+    parser.add_argument("--backend", choices=SudokuFacade.backends, default="recursion", help="The solving engine.")
+    parser.add_argument("--format", choices=["string", "json"], default="string", help="The output format of each puzzle.")
+    parser.add_argument("--ordered", action="store_true", help="Writes the puzzles in index order.")
+    parser.add_argument("--transform", action="store_true", help="Fills each grid by transforming a stored solution, faster but not a uniform sample.")
+    parser.add_argument("--unique", action="store_true", help="Drops any puzzle symmetric to one already written.")
+    parser.add_argument("--corpus", help="Writes the puzzles and their solutions to a corpus file at this path, rather than printing them.")
+
+    args = parser.parse_args()
+
+    records = generate_puzzles(
+
+        args.count,
+        target_removal=args.target_removal,
+        difficulty_level=args.difficulty,
+        seed=args.seed,
+        workers=args.workers,
+        backend=args.backend,
+        ordered=args.ordered,
+        transform=args.transform
+
+    )
+
+    if args.unique:
+
+        records = drop_duplicates(records)
+
+    if args.corpus:
+
+        with CorpusWriter(args.corpus) as writer:
+
+            writer.extend(records, difficulty_level=args.difficulty)
+
+    else:
+
+        for record in records:
+
+            print(format_record(record, args.format), flush=True)
@@ -0,0 +1,300 @@
+from typing import List, Tuple
+
+from app.grid import SudokuGrid, get_set_bits
+from app.tables import CELL_COUNT, ALL_DIGITS_MASK, MASK_VALUES, UNITS, CELL_UNITS, PEERS
+
+class SudokuCandidates:
+
+    """
+    A class to maintain the pencil marks of a Sudoku grid, the values that could still be placed in each empty cell.
+
+    The candidates are stored as a bitmask per cell, built once from the grid and then updated incrementally,
+    so a placement only touches the peers of the placed cell.
+    
+    """
+
+    __slots__ = ("grid", "masks", "known_cells")
+
+    def __init__(self, grid: SudokuGrid) -> None:
+
+        """
+        Initialises SudokuCandidates with an instance of the SudokuGrid class, and builds the candidates from its contents.
+
+        Parameters:
+
+            grid (SudokuGrid): The grid whose candidates are maintained.
+
+        Attributes:
+
+            masks (List[int]): A bitmask of the candidates of every cell, indexed by flat index, where bit n is set if the value n is a candidate.
+
+                Filled cells have no candidates.
+
+            known_cells (bytearray): The cells of the grid as of the last build or placement, to detect changes made directly to the grid.
+        
+        """
+
+        self.grid = grid
+        self.masks = [0] * CELL_COUNT
+        self.known_cells = bytearray(CELL_COUNT)
+
+        self.build()
+
+    def build(self) -> None:
+
+        """
+        Rebuilds the candidates of every cell from the current contents of the grid, discarding any eliminations.
+        
+        """
+
+        cells = self.grid.cells
+        unit_masks = self.grid.unit_masks
+        masks = self.masks
+
+        for index, (row_unit, col_unit, subgrid_unit) in enumerate(CELL_UNITS):
+
+            masks[index] = 0 if cells[index] else ALL_DIGITS_MASK & ~(unit_masks[row_unit] | unit_masks[col_unit] | unit_masks[subgrid_unit])
+
+        self.known_cells[:] = cells
+
+    def sync(self) -> bool:
+
+        """
+        Rebuilds the candidates if the grid has been modified other than through place.
+
+        Returns:
+
+            bool: True if the candidates were rebuilt, otherwise False.
+        
+        """
+
+        if self.known_cells != self.grid.cells:
+
+            self.build()
+
+            return True
+
+        return False
+
+    def get_values(self, index: int) -> Tuple[int, ...]:
+
+        """
+        Returns the candidates of the specified cell, in ascending order.
+
+        Parameters:
+
+            index (int): The flat index of the cell in the grid.
+
+        Returns:
+
+            Tuple[int, ...]: The candidates of the cell.
+        
+        """
+
+        return MASK_VALUES[self.masks[index]]
+
+    def place(self, index: int, num: int) -> None:
+
+        """
+        Places a number in the grid at the specified flat index, without validation, and removes it from the candidates of every peer.
+
+        Parameters:
+
+            index (int): The flat index of the cell in the grid.
+            num (int): The number to be placed, between 1 and 9.
+        
+        """
+
+        self.grid.set_cell_at(index, num)
+
+        self.known_cells[index] = num
+
+        masks = self.masks
+        bit = ~(1 << num)
+
+        masks[index] = 0
+
+        for peer in PEERS[index]:
+
+            masks[peer] &= bit
+
+    def eliminate(self, index: int, mask: int) -> bool:
+
+        """
+        Removes the values in a bitmask from the candidates of the specified cell.
+
+        Parameters:
+
+            index (int): The flat index of the cell in the grid.
+            mask (int): A bitmask of the values to be removed.
+
+        Returns:
+
+            bool: True if any candidate was removed, otherwise False.
+        
+        """
+
+        masks = self.masks
+
+        if masks[index] & mask:
+
+            masks[index] &= ~mask
+
+            return True
+
+        return False
+
+
+    def propagate_singles(self) -> bool:
+
+        """
+        Repeatedly places every naked single and hidden single until no more cells are forced, without recording any steps.
+
+        A tight loop for searching, where the steps taken are not needed.
+
+        Returns:
+
+            bool: False if a contradiction was found, otherwise True.
+        
+        """
+
+        cells = self.grid.cells
+        unit_masks = self.grid.unit_masks
+        masks = self.masks
+
+        placement_made = True
+
+        while placement_made:
+
+            placement_made = False
+
+            # Naked singles
+            for index, mask in enumerate(masks):
+
+                if mask and not mask & (mask - 1):
+
+                    self.place(index, mask.bit_length() - 1)
+
+                    placement_made = True
+
+            # Hidden singles
+            for unit_index, unit in enumerate(UNITS):
+
+                missing_mask = ALL_DIGITS_MASK & ~unit_masks[unit_index]
+
+                if not missing_mask:
+
+                    continue
+
+                # Bitmasks of the values that are candidates of at least one, and of at least two, of the cells in the unit.
+                once_mask = 0
+                twice_mask = 0
+
+                for index in unit:
+
+                    mask = masks[index]
+
+                    twice_mask |= once_mask & mask
+                    once_mask |= mask
+
+                # Contradiction, a missing value is not a candidate of any cell in the unit.
+                if missing_mask & ~once_mask:
+
+                    return False
+
+                hidden_mask = once_mask & ~twice_mask
+
+                if hidden_mask:
+
+                    for index in unit:
+
+                        mask = masks[index] & hidden_mask
+
+                        if mask:
+
+                            self.place(index, mask.bit_length() - 1)
+
+                            placement_made = True
+
+        # Contradiction, an empty cell has no candidates.
+        for mask, num in zip(masks, cells):
+
+            if not (mask or num):
+
+                return False
+
+        return True
+
+    def is_consistent(self) -> bool:
+
+        """
+        Checks that every empty cell has a candidate, and that every value missing from a unit is a candidate of one of its cells.
+
+        Returns:
+
+            bool: True if no contradiction is found, otherwise False.
+        
+        """
+
+        masks = self.masks
+        unit_masks = self.grid.unit_masks
+
+        for mask, num in zip(masks, self.grid.cells):
+
+            if not (mask or num):
+
+                return False
+
+        for unit_index, unit in enumerate(UNITS):
+
+            covered_mask = unit_masks[unit_index]
+
+            for index in unit:
+
+                covered_mask |= masks[index]
+
+            if covered_mask != ALL_DIGITS_MASK:
+
+                return False
+
+        return True
+
+    def snapshot(self) -> Tuple[List[int], int]:
+
+        """
+        Returns the state of the candidates and grid, to be restored after a speculative placement.
+
+        Returns:
+
+            Tuple[List[int], int]: A copy of the candidate bitmasks, and the empty cell bitmask of the grid.
+        
+        """
+
+        return list(self.masks), self.grid.empty_mask
+
+    def restore(self, snapshot: Tuple[List[int], int]) -> None:
+
+        """
+        Restores the candidates, and resets every cell placed since the snapshot was taken.
+
+        Parameters:
+
+            snapshot (Tuple[List[int], int]): The state returned by snapshot.
+        
+        """
+
+        masks, empty_mask = snapshot
+
+        for index in get_set_bits(empty_mask & ~self.grid.empty_mask):
+
+            self.grid.reset_cell_at(index)
+
+            self.known_cells[index] = 0
+
+        self.masks[:] = masks
+
+
+
+if __name__ == "__main__":
+
+    print("--------------------")
@@ -0,0 +1,463 @@
+from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import accumulate
+from operator import itemgetter
+import threading
+
+from app.tables import CELL_COUNT
+from app.transform import LINE_ORDERS
+from config.config import GRID_SIZE, SUBGRID_SIZE
+
+# A transformation of the cells, as the source index of every destination cell, and a translation table relabelling the digits.
+Transformation = Tuple[Tuple[int, ...], bytes]
+
+# Getters that reorder the values of a row, one for each line order.
+ROW_GETTERS: Tuple[itemgetter, ...] = tuple(itemgetter(*order) for order in LINE_ORDERS)
+
+# The value of a digit without a label, and a translation table in which every digit is without a label and empty cells read as 0.
+UNLABELLED_VALUE: int = 255
+UNLABELLED: bytes = bytes([0] + [UNLABELLED_VALUE] * 255)
+
+# The number of tied partial transformations above which those with identical remaining rows are merged.
+MERGE_THRESHOLD: int = 2048
+
+@lru_cache(maxsize=None)
+def get_minimal_orders(filled_mask: int) -> Tuple[int, Tuple[int, ...]]:
+
+    """
+    Returns the column orders that move the filled cells of a row as far right as possible, with empty cells read first.
+
+    As the digits of a row are distinct, and relabelled in order of appearance, these orders give the lexicographically smallest first row.
+
+    Parameters:
+
+        filled_mask (int): A bitmask of the filled cells of the row, where bit n is set if the cell in column n is filled.
+
+    Returns:
+
+        Tuple[int, Tuple[int, ...]]: The reordered bitmask, with column 0 as the most significant bit, and the indices in LINE_ORDERS of every order giving it.
+    
+    """
+
+    patterns = [
+
+        sum(1 << (GRID_SIZE - 1 - col_index) for col_index, source in enumerate(order) if filled_mask >> source & 1)
+        for order in LINE_ORDERS
+
+    ]
+
+    minimal_pattern = min(patterns)
+
+    return minimal_pattern, tuple(order_index for order_index, pattern in enumerate(patterns) if pattern == minimal_pattern)
+
+def canonical_form(cells: bytes) -> Tuple[bytes, Transformation]:
+
+    """
+    Returns the minimum lexicographic form of the cells under the symmetries of Sudoku, and the transformation that produces it.
+
+    The symmetries are transposition, band and row swaps, stack and column swaps, and digit relabelling, with empty cells reading as 0.
+    The rows are chosen one at a time, and only the partial transformations whose rows read smallest so far are kept.
+    Partial transformations that leave identical remaining rows are merged, so highly symmetric grids, like the empty grid, stay tractable.
+    The cells must not repeat a value within a row or column, as the relabelling relies on the digits of a row being distinct.
+
+    Parameters:
+
+        cells (bytes): The cells to be canonicalised, in row-major order.
+
+    Returns:
+
+        Tuple[bytes, Transformation]: The canonical cells, which are identical for every grid in the same equivalence class,
+        and a transformation that maps the cells to them, for apply_transformation.
+    
+    """
+
+    cells = bytes(cells)
+
+    transposed = bytes(cells[col_index * GRID_SIZE + row_index] for row_index in range(GRID_SIZE) for col_index in range(GRID_SIZE))
+
+    # The rows of the grid, and of its transposition.
+    grid_rows = [[sources[start:start + GRID_SIZE] for start in range(0, CELL_COUNT, GRID_SIZE)] for sources in (cells, transposed)]
+
+    filled_masks = [[sum(1 << col_index for col_index, num in enumerate(row) if num) for row in rows] for rows in grid_rows]
+
+    # While every row so far is empty, every column order ties, and as the digits of a row are distinct and labelled in order of appearance,
+    # the next row only depends on which of its cells are filled. Only the column orders giving it the fewest leading clues are kept.
+    canonical_rows = []
+
+    prefixes = [(transposition, ()) for transposition in range(len(grid_rows))]
+
+    while True:
+
+        minimal_pattern = None
+
+        for transposition, row_order in prefixes:
+
+            for row_index in get_next_rows(row_order):
+
+                pattern, order_indices = get_minimal_orders(filled_masks[transposition][row_index])
+
+                if minimal_pattern is None or pattern < minimal_pattern:
+
+                    minimal_pattern = pattern
+                    ties = []
+
+                if pattern == minimal_pattern:
+
+                    ties.append((transposition, row_order + (row_index,), order_indices))
+
+        filled = [minimal_pattern >> (GRID_SIZE - 1 - col_index) & 1 for col_index in range(GRID_SIZE)]
+
+        canonical_rows.append(bytes(is_filled * label for is_filled, label in zip(filled, accumulate(filled))))
+
+        if minimal_pattern or len(canonical_rows) == GRID_SIZE:
+
+            break
+
+        # Every column order is still open, so prefixes that leave identical remaining rows are merged, keeping the empty grid cheap.
+        prefixes = [partial[:2] for partial in merge_partials([(transposition, row_order, 0, UNLABELLED) for transposition, row_order, _ in ties], grid_rows)]
+
+    # Every partial transformation holds its transposition, its row order so far, its column order, its relabelling as a translation table
+    # where unlabelled digits read as 255, above every label, the number of labels, and the rows that can follow.
+    partials = []
+
+    for transposition, row_order, order_indices in ties:
+
+        row = grid_rows[transposition][row_order[-1]]
+
+        for order_index in order_indices:
+
+            relabelling = bytearray(UNLABELLED)
+
+            label_count = 0
+
+            for num in ROW_GETTERS[order_index](row):
+
+                if num:
+
+                    label_count += 1
+
+                    relabelling[num] = label_count
+
+            partials.append((transposition, row_order, order_index, bytes(relabelling), label_count, get_next_rows(row_order)))
+
+
+    while len(canonical_rows) < GRID_SIZE:
+
+        minimal_row = None
+        extensions = []
+
+        for transposition, row_order, order_index, relabelling, label_count, next_rows in partials:
+
+            rows = grid_rows[transposition]
+            getter = ROW_GETTERS[order_index]
+
+            for row_index in next_rows:
+
+                # The digits of a row are distinct, so labelling its new digits in order of appearance preserves the comparison.
+                canonical_row = getter(rows[row_index].translate(relabelling))
+
+                if minimal_row is None or canonical_row < minimal_row:
+
+                    minimal_row = canonical_row
+                    extensions = []
+
+                if canonical_row == minimal_row:
+
+                    extensions.append((transposition, row_order + (row_index,), order_index, relabelling, label_count))
+
+        new_count = minimal_row.count(UNLABELLED_VALUE)
+
+        partials = []
+
+        for transposition, row_order, order_index, relabelling, label_count in extensions:
+
+            if new_count:
+
+                relabelling = bytearray(relabelling)
+
+                for num in ROW_GETTERS[order_index](grid_rows[transposition][row_order[-1]]):
+
+                    if relabelling[num] == UNLABELLED_VALUE:
+
+                        label_count += 1
+
+                        relabelling[num] = label_count
+
+                relabelling = bytes(relabelling)
+
+            partials.append((transposition, row_order, order_index, relabelling, label_count, get_next_rows(row_order)))
+
+        canonical_rows.append(bytes(ROW_GETTERS[partials[0][2]](grid_rows[partials[0][0]][partials[0][1][-1]])).translate(partials[0][3]))
+
+        # Merging is only worthwhile when many partial transformations tie, which a grid with a unique solution rarely causes.
+        if len(partials) > MERGE_THRESHOLD:
+
+            partials = merge_partials(partials, grid_rows)
+
+    transposition, row_order, order_index, relabelling, label_count, _ = partials[0]
+
+    col_order = LINE_ORDERS[order_index]
+
+    if transposition:
+
+        mapping = tuple(col_order[col_index] * GRID_SIZE + row_index for row_index in row_order for col_index in range(GRID_SIZE))
+
+    else:
+
+        mapping = tuple(row_index * GRID_SIZE + col_order[col_index] for row_index in row_order for col_index in range(GRID_SIZE))
+
+    # Digits missing from the grid take the remaining labels in ascending order, so the relabelling is a permutation.
+    labels = list(relabelling[:GRID_SIZE + 1])
+
+    for num in range(1, GRID_SIZE + 1):
+
+        if labels[num] == UNLABELLED_VALUE:
+
+            label_count += 1
+
+            labels[num] = label_count
+
+    return b"".join(canonical_rows), (mapping, bytes.maketrans(bytes(range(GRID_SIZE + 1)), bytes(labels)))
+
+@lru_cache(maxsize=None)
+def get_next_rows(row_order: Tuple[int, ...]) -> Tuple[int, ...]:
+
+    """
+    Returns the rows that can follow a partial row order, keeping every band together.
+
+    Parameters:
+
+        row_order (Tuple[int, ...]): The rows already placed, in order.
+
+    Returns:
+
+        Tuple[int, ...]: The rows of the current band not yet placed, or every row of the bands not yet started once a band is complete.
+    
+    """
+
+    if len(row_order) % SUBGRID_SIZE:
+
+        band_start = row_order[-1] // SUBGRID_SIZE * SUBGRID_SIZE
+
+        return tuple(row_index for row_index in range(band_start, band_start + SUBGRID_SIZE) if row_index not in row_order)
+
+    started_bands = {row_index // SUBGRID_SIZE for row_index in row_order}
+
+    return tuple(row_index for row_index in range(GRID_SIZE) if row_index // SUBGRID_SIZE not in started_bands)
+
+def merge_partials(partials: List[Tuple], grid_rows: List[List[bytes]]) -> List[Tuple]:
+
+    """
+    Keeps one of every group of partial transformations that leave the same remaining rows with the same relabelling.
+
+    Every partial transformation reads the same so far, so any two with the same remaining rows, in the same bands, complete identically.
+
+    Parameters:
+
+        partials (List[Tuple]): The partial transformations, as built by canonical_form.
+        grid_rows (List[List[bytes]]): The rows of the grid, and of its transposition.
+
+    Returns:
+
+        List[Tuple]: The partial transformations with a distinct remainder.
+    
+    """
+
+    merged = {}
+
+    for partial in partials:
+
+        transposition, row_order, order_index, relabelling = partial[:4]
+
+        rows = grid_rows[transposition]
+        getter = ROW_GETTERS[order_index]
+
+        bands = {}
+
+        for row_index in range(GRID_SIZE):
+
+            if row_index not in row_order:
+
+                bands.setdefault(row_index // SUBGRID_SIZE, []).append(getter(rows[row_index]))
+
+        current_band = row_order[-1] // SUBGRID_SIZE if len(row_order) % SUBGRID_SIZE else None
+
+        key = (
+
+            relabelling,
+            tuple(sorted(bands.pop(current_band, ()))),
+            tuple(sorted(tuple(sorted(band)) for band in bands.values()))
+
+        )
+
+        merged.setdefault(key, partial)
+
+    return list(merged.values())
+
+def apply_transformation(cells: bytes, transformation: Transformation) -> bytes:
+
+    """
+    Applies a transformation to the cells.
+
+    Parameters:
+
+        cells (bytes): The cells to be transformed, in row-major order.
+        transformation (Transformation): The transformation, as returned by canonical_form or invert_transformation.
+
+    Returns:
+
+        bytes: The transformed cells.
+    
+    """
+
+    mapping, relabelling = transformation
+
+    return bytes(map(cells.__getitem__, mapping)).translate(relabelling)
+
+def invert_transformation(transformation: Transformation) -> Transformation:
+
+    """
+    Returns the transformation that undoes a transformation, to map a canonical solution back to the original grid.
+
+    Parameters:
+
+        transformation (Transformation): The transformation to be inverted.
+
+    Returns:
+
+        Transformation: The inverse transformation.
+    
+    """
+
+    mapping, relabelling = transformation
+
+    inverse_mapping = [0] * CELL_COUNT
+
+    for destination, source in enumerate(mapping):
+
+        inverse_mapping[source] = destination
+
+    digits = bytes(range(GRID_SIZE + 1))
+
+    return tuple(inverse_mapping), bytes.maketrans(digits.translate(relabelling), digits)
+
+class SolutionCache:
+
+    """
+    A class to hold the solutions of recently solved puzzles, keyed by canonical form, so any symmetric copy of a puzzle is only solved once.
+
+    The cache is bounded, evicting the least recently used solution, and safe to share between threads.
+    
+    """
+
+    def __init__(self, max_size: int = 10000) -> None:
+
+        """
+        Initialises SolutionCache without any solutions.
+
+        Parameters:
+
+            max_size (int): The maximum number of solutions held.
+
+        Raises:
+
+            ValueError: If the maximum size is not a positive integer.
+
+        Attributes:
+
+            solutions (OrderedDict[bytes, bytes]): The canonical solution of every canonical puzzle, from least to most recently used.
+            hits (int): The number of lookups that found a solution.
+            misses (int): The number of lookups that did not.
+        
+        """
+
+        if not isinstance(max_size, int) or max_size < 1:
+
+            raise ValueError(f"{max_size} must be a positive integer.")
+
+        self.max_size = max_size
+
+        self.solutions = OrderedDict()
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+
+        return len(self.solutions)
+
+    def get(self, canonical: bytes) -> Optional[bytes]:
+
+        """
+        Returns the solution of a canonical puzzle, if held, and marks it as the most recently used.
+
+        Parameters:
+
+            canonical (bytes): The canonical form of the puzzle, as returned by canonical_form.
+
+        Returns:
+
+            Optional[bytes]: The canonical solution, or None if no solution is held.
+        
+        """
+
+        with self.lock:
+
+            solution = self.solutions.get(canonical)
+
+            if solution is None:
+
+                self.misses += 1
+
+                return None
+
+            self.hits += 1
+
+            self.solutions.move_to_end(canonical)
+
+            return solution
+
+    def put(self, canonical: bytes, solution: bytes) -> None:
+
+        """
+        Holds the solution of a canonical puzzle, evicting the least recently used solution if the cache is full.
+
+        Parameters:
+
+            canonical (bytes): The canonical form of the puzzle, as returned by canonical_form.
+            solution (bytes): The solution, transformed by the same transformation as the puzzle.
+        
+        """
+
+        with self.lock:
+
+            self.solutions[canonical] = bytes(solution)
+
+            self.solutions.move_to_end(canonical)
+
+            if len(self.solutions) > self.max_size:
+
+                self.solutions.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, int]:
+
+        """
+        Returns the size of the cache and its lookup counts.
+
+        Returns:
+
+            Dict[str, int]: A dictionary containing the "size", "hits" and "misses" of the cache.
+        
+        """
+
+        with self.lock:
+
+            return {"size": len(self.solutions), "hits": self.hits, "misses": self.misses}
+
+
+
+if __name__ == "__main__":
+
+    print("--------------------")
@@ -0,0 +1,489 @@
+from typing import BinaryIO, Dict, Iterable, Iterator, Optional, Union
+import mmap
+import struct
+
+from app.grid import SudokuGrid
+from app.serialisation import PACKED_SIZE, decode_string, pack_many, unpack, unpack_many, validate_cells
+
+# The file signature, followed by the format version, the flags, the record size and the record count.
+HEADER = struct.Struct("<8sHHIQ")
+HEADER_SIZE: int = 32
+MAGIC: bytes = b"SUDOKUC\0"
+VERSION: int = 1
+
+# The flag set when every record holds a solution.
+HAS_SOLUTIONS: int = 1
+
+# The difficulty levels, stored by index, with 0 for an unknown difficulty.
+DIFFICULTY_LEVELS = (None, "easy", "medium", "hard", "expert")
+
+# The number of records read or written at a time by the bulk methods.
+CHUNK_RECORDS: int = 1 << 14
+
+def get_record_size(solutions: bool) -> int:
+
+    """
+    Returns the size of a record, a packed puzzle, an optional packed solution, the clue count and the difficulty index.
+
+    Parameters:
+
+        solutions (bool): True if the records hold solutions.
+
+    Returns:
+
+        int: The size of a record, in bytes.
+    
+    """
+
+    return PACKED_SIZE * (2 if solutions else 1) + 2
+
+class CorpusWriter:
+
+    """
+    A class to write a corpus of fixed-size puzzle records, to be read by SudokuCorpus.
+
+    Records are buffered and packed a chunk at a time, and the header is completed when the writer is closed.
+    
+    """
+
+    def __init__(self, file: Union[str, BinaryIO], solutions: bool = True) -> None:
+
+        """
+        Initialises CorpusWriter, and writes a provisional header.
+
+        Parameters:
+
+            file (Union[str, BinaryIO]): The path of the corpus, or a seekable file opened in binary mode.
+            solutions (bool): If True, every record holds the solution of its puzzle.
+
+        Attributes:
+
+            count (int): The number of records written, including any still buffered.
+        
+        """
+
+        self.owns_file = isinstance(file, str)
+        self.file = open(file, "wb") if self.owns_file else file
+        self.solutions = solutions
+
+        self.start = self.file.tell()
+        self.count = 0
+        self.pending = []
+
+        self.write_header()
+
+    def __enter__(self) -> "CorpusWriter":
+
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+
+        self.close()
+
+    def write_header(self) -> None:
+
+        """
+        Writes the header at the start of the corpus, with the current record count.
+        
+        """
+
+        record_size = get_record_size(self.solutions)
+
+        self.file.write(HEADER.pack(MAGIC, VERSION, HAS_SOLUTIONS if self.solutions else 0, record_size, self.count).ljust(HEADER_SIZE, b"\0"))
+
+    def append(self, puzzle: bytes, solution: bytes = None, difficulty_level: str = None) -> None:
+
+        """
+        Appends a puzzle record.
+
+        Parameters:
+
+            puzzle (bytes): The cells of the puzzle.
+            solution (bytes): The cells of its solution, required if the corpus holds solutions, and otherwise ignored.
+            difficulty_level (str): The difficulty level of the puzzle ('easy', 'medium', 'hard' or 'expert'), if known.
+
+        Raises:
+
+            ValueError: If the puzzle or solution is not valid or the solution is missing, or the difficulty level is not a valid difficulty level.
+        
+        """
+
+        if self.solutions and solution is None:
+
+            raise ValueError("Please provide a valid solution (e.g., the 81 cells of the solved puzzle).")
+
+        # Checked now rather than when the chunk is packed, so a bad record cannot lose the records buffered before it.
+        validate_cells(puzzle)
+
+        if self.solutions:
+
+            validate_cells(solution)
+
+        if difficulty_level not in DIFFICULTY_LEVELS:
+
+            raise ValueError("Please provide a valid difficulty level (e.g., easy, medium, hard or expert).")
+
+        self.pending.append((bytes(puzzle), solution, DIFFICULTY_LEVELS.index(difficulty_level)))
+
+        self.count += 1
+
+        if len(self.pending) == CHUNK_RECORDS:
+
+            self.flush()
+
+    def extend(self, records: Iterable[Dict[str, Union[int, str]]], difficulty_level: str = None) -> int:
+
+        """
+        Appends the puzzle records of a batch, as yielded by SudokuFacade.generate_many or batch.generate_puzzles.
+
+        Parameters:
+
+            records (Iterable[Dict[str, Union[int, str]]]): The records, each holding a "puzzle" and a "solution" as 81-character strings.
+            difficulty_level (str): The difficulty level of every puzzle, for records without a "difficulty" of their own.
+
+        Returns:
+
+            int: The number of records appended.
+        
+        """
+
+        appended = 0
+
+        for record in records:
+
+            self.append(
+
+                decode_string(record["puzzle"]),
+                decode_string(record["solution"]) if self.solutions else None,
+                record.get("difficulty", difficulty_level)
+
+            )
+
+            appended += 1
+
+        return appended
+
+    def flush(self) -> None:
+
+        """
+        Packs and writes every buffered record.
+        
+        """
+
+        if not self.pending:
+
+            return
+
+        puzzles = pack_many(puzzle for puzzle, _, _ in self.pending)
+        solutions = pack_many(solution for _, solution, _ in self.pending) if self.solutions else b""
+
+        chunk = bytearray()
+
+        for index, (puzzle, _, difficulty_index) in enumerate(self.pending):
+
+            start = index * PACKED_SIZE
+
+            chunk += puzzles[start:start + PACKED_SIZE]
+
+            if self.solutions:
+
+                chunk += solutions[start:start + PACKED_SIZE]
+
+            chunk.append(len(puzzle) - puzzle.count(0))
+            chunk.append(difficulty_index)
+
+        self.file.write(chunk)
+
+        self.pending = []
+
+    def close(self) -> None:
+
+        """
+        Writes any buffered records, completes the header and, if the writer opened the file, closes it.
+        
+        """
+
+        try:
+
+            self.flush()
+
+            end = self.file.tell()
+
+            self.file.seek(self.start)
+
+            self.write_header()
+
+            self.file.seek(end)
+
+        finally:
+
+            if self.owns_file:
+
+                self.file.close()
+
+            else:
+
+                self.file.flush()
+
+class SudokuCorpus:
+
+    """
+    A class to read a corpus of fixed-size puzzle records through a read-only memory map.
+
+    Opening a corpus only reads its header, any record is found by its index alone,
+    and every process that opens the same corpus shares its pages through the operating system's page cache.
+    
+    """
+
+    def __init__(self, path: str) -> None:
+
+        """
+        Initialises SudokuCorpus by mapping the corpus at the path.
+
+        Parameters:
+
+            path (str): The path of a corpus written by CorpusWriter.
+
+        Raises:
+
+            ValueError: If the file is not a complete corpus.
+
+        Attributes:
+
+            view (memoryview): A view of the whole file, sliced without copying.
+            count (int): The number of records.
+            record_size (int): The size of every record, in bytes.
+            solutions (bool): True if every record holds a solution.
+        
+        """
+
+        self.path = path
+
+        with open(path, "rb") as file:
+
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.view = memoryview(self.map)
+
+        magic, version, flags, self.record_size, self.count = HEADER.unpack_from(self.map) if len(self.map) >= HEADER_SIZE else (None, 0, 0, 0, 0)
+
+        self.solutions = bool(flags & HAS_SOLUTIONS)
+
+        if (
+
+            magic != MAGIC
+            or version != VERSION
+            or self.record_size != get_record_size(self.solutions)
+            or len(self.map) != HEADER_SIZE + self.count * self.record_size
+
+        ):
+
+            self.close()
+
+            raise ValueError("Please provide a valid corpus file (e.g., a complete file written by CorpusWriter).")
+
+    def __len__(self) -> int:
+
+        return self.count
+
+    def __iter__(self) -> Iterator[bytes]:
+
+        return self.iter_puzzles()
+
+    def __getitem__(self, index: int) -> bytes:
+
+        return self.get_puzzle(index)
+
+    def __reduce__(self):
+
+        # Worker processes map the file again rather than receive a copy of it.
+        return (SudokuCorpus, (self.path,))
+
+    def __enter__(self) -> "SudokuCorpus":
+
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+
+        self.close()
+
+    def close(self) -> None:
+
+        """
+        Releases the memory map. Any views returned by get_record, and any unfinished iterations, must be released first.
+        
+        """
+
+        self.view.release()
+
+        self.map.close()
+
+    def get_record(self, index: int) -> memoryview:
+
+        """
+        Returns a record without copying it.
+
+        Parameters:
+
+            index (int): The index of the record, negative indices counting from the end.
+
+        Raises:
+
+            IndexError: If the index lies outside of the corpus.
+
+        Returns:
+
+            memoryview: The packed puzzle, the packed solution if present, the clue count and the difficulty index.
+        
+        """
+
+        if index < 0:
+
+            index += self.count
+
+        if not 0 <= index < self.count:
+
+            raise IndexError(f"Record {index} must be within range 0 to {self.count - 1}.")
+
+        start = HEADER_SIZE + index * self.record_size
+
+        return self.view[start:start + self.record_size]
+
+    def get_puzzle(self, index: int) -> bytes:
+
+        """
+        Returns the cells of a puzzle, ready for SudokuGrid.load.
+
+        Parameters:
+
+            index (int): The index of the record.
+
+        Returns:
+
+            bytes: The cells of the puzzle.
+        
+        """
+
+        return unpack(bytes(self.get_record(index)[:PACKED_SIZE]))
+
+    def get_solution(self, index: int) -> Optional[bytes]:
+
+        """
+        Returns the cells of the solution of a puzzle.
+
+        Parameters:
+
+            index (int): The index of the record.
+
+        Returns:
+
+            Optional[bytes]: The cells of the solution, or None if the corpus holds no solutions.
+        
+        """
+
+        if not self.solutions:
+
+            return None
+
+        return unpack(bytes(self.get_record(index)[PACKED_SIZE:2 * PACKED_SIZE]))
+
+    def get_metadata(self, index: int) -> Dict[str, Union[int, str]]:
+
+        """
+        Returns the clue count and difficulty level of a puzzle.
+
+        Parameters:
+
+            index (int): The index of the record.
+
+        Returns:
+
+            Dict[str, Union[int, str]]: A dictionary containing the "clues" (int) and the "difficulty" (str, or None if unknown).
+        
+        """
+
+        record = self.get_record(index)
+
+        return {"clues": record[-2], "difficulty": DIFFICULTY_LEVELS[record[-1]]}
+
+    def get_grid(self, index: int) -> SudokuGrid:
+
+        """
+        Returns a new grid holding a puzzle.
+
+        Parameters:
+
+            index (int): The index of the record.
+
+        Returns:
+
+            SudokuGrid: The grid, with the puzzle as its original contents.
+        
+        """
+
+        grid = SudokuGrid()
+
+        grid.load(self.get_puzzle(index))
+
+        return grid
+
+    def iter_puzzles(self, start: int = 0, stop: int = None, solutions: bool = False) -> Iterator[bytes]:
+
+        """
+        Streams the puzzles, or their solutions, of a range of records, unpacking a chunk of records at a time.
+
+        The result can be passed straight to SudokuFacade.solve_many or SudokuFacade.validate_many.
+
+        Parameters:
+
+            start (int): The index of the first record, negative indices counting from the end.
+            stop (int): The index after the last record, negative indices counting from the end. Defaults to None, which streams to the end of the corpus.
+            solutions (bool): If True, streams the solutions rather than the puzzles.
+
+        Raises:
+
+            ValueError: If solutions are requested from a corpus without them.
+
+        Returns:
+
+            Iterator[bytes]: The cells of every puzzle, or solution, in index order.
+        
+        """
+
+        if solutions and not self.solutions:
+
+            raise ValueError("Please provide a corpus with solutions (e.g., one written with solutions=True).")
+
+        # Negative and out-of-range bounds behave as in a slice.
+        start, stop, _ = slice(start, stop).indices(self.count)
+
+        return self._iter_puzzles(start, stop, PACKED_SIZE if solutions else 0)
+
+    def _iter_puzzles(self, start: int, stop: int, offset: int) -> Iterator[bytes]:
+
+        """
+        Streams the records of iter_puzzles, once its arguments have been validated and its bounds normalised.
+
+        Returns:
+
+            Iterator[bytes]: The cells at the given offset of every record, as described in iter_puzzles.
+        
+        """
+
+        record_size = self.record_size
+
+        for chunk_start in range(start, stop, CHUNK_RECORDS):
+
+            chunk_stop = min(chunk_start + CHUNK_RECORDS, stop)
+
+            chunk = self.view[HEADER_SIZE + chunk_start * record_size:HEADER_SIZE + chunk_stop * record_size]
+
+            packed = b"".join(chunk[position:position + PACKED_SIZE] for position in range(offset, len(chunk), record_size))
+
+            yield from unpack_many(packed)
+
+
+
+if __name__ == "__main__":
+
+    print("--------------------")
@@ -0,0 +1,129 @@
+class SudokuEvents:
+
+    """
+    A class to receive progress events from the generator, the iterative solver and the puzzle bank refiller.
+
+    Every method is a no-op, so an instance costs a single method call per event and performs no formatting or I/O.
+    Subclasses override the methods for the events they subscribe to.
+    
+    """
+
+    # CELL REMOVAL
+
+    def removal_started(self, target_removal: int, removable_count: int) -> None:
+
+        """
+        Called once before cells are removed from the grid.
+
+        Parameters:
+
+            target_removal (int): The target number of cells to remove.
+            removable_count (int): The number of filled cells available for removal.
+        
+        """
+
+    def removal_attempted(self, row_index: int, col_index: int) -> None:
+
+        """
+        Called when a cell is emptied, before the uniqueness of the solution is checked.
+
+        Parameters:
+
+            row_index (int): The index position of the row of the emptied cell.
+            col_index (int): The index position of the column of the emptied cell.
+        
+        """
+
+    def removal_restored(self, row_index: int, col_index: int, empty_count: int) -> None:
+
+        """
+        Called when an emptied cell is restored, because its removal left more than one solution.
+
+        Parameters:
+
+            row_index (int): The index position of the row of the restored cell.
+            col_index (int): The index position of the column of the restored cell.
+            empty_count (int): The number of empty cells remaining in the grid.
+        
+        """
+
+    def removal_succeeded(self, removal_count: int, target_removal: int) -> None:
+
+        """
+        Called when a cell is removed and the grid still has a unique solution.
+
+        Parameters:
+
+            removal_count (int): The number of cells removed so far.
+            target_removal (int): The target number of cells to remove.
+        
+        """
+
+    # LOGICAL DEDUCTION
+
+    def placement_finished(self, remaining_cells: int, rotations: int) -> None:
+
+        """
+        Called when the placement techniques can make no further placements.
+
+        Parameters:
+
+            remaining_cells (int): The number of empty cells remaining in the grid.
+            rotations (int): The number of rotations through the placement techniques.
+        
+        """
+
+    # PUZZLE BANK
+
+    def refill_failed(self, error: Exception, failures: int) -> None:
+
+        """
+        Called when a BankRefiller fails to refill its bank, before it backs off and retries.
+
+        Parameters:
+
+            error (Exception): The error raised by the refill.
+            failures (int): The number of consecutive failed refills, including this one.
+        
+        """
+
+class PrintEvents(SudokuEvents):
+
+    """
+    A class to print every progress event, for the command line.
+    
+    """
+
+    def removal_started(self, target_removal: int, removable_count: int) -> None:
+
+        print(f"Target removal: {target_removal}")
+
+        print(f"Number of removable cells: {removable_count}")
+
+    def removal_attempted(self, row_index: int, col_index: int) -> None:
+
+        print(f"Trying to remove cell at: ({row_index, col_index})")
+
+    def removal_restored(self, row_index: int, col_index: int, empty_count: int) -> None:
+
+        print(f"Restoring cell at: ({row_index, col_index})")
+
+        print(f"Empty cells remaining: {empty_count}")
+
+    def removal_succeeded(self, removal_count: int, target_removal: int) -> None:
+
+        print(f"Removal successful: {removal_count}/{target_removal}")
+
+    def placement_finished(self, remaining_cells: int, rotations: int) -> None:
+
+        print(f"There are {remaining_cells} cells remaining after {rotations} placement technique rotations.")
+
+    def refill_failed(self, error: Exception, failures: int) -> None:
+
+        print(f"Refill failed ({failures} in a row): {error!r}")
+
+
+
+if __name__ == "__main__":
+
+    print("--------------------")
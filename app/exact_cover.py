@@ -0,0 +1,371 @@
+from typing import Dict, List, Set, Tuple, Iterator
+import random
+
+from app.grid import SudokuGrid
+from app.validator import SudokuValidator
+from app.tables import CELL_COUNT, ROW_OF, COL_OF, SUBGRID_OF
+from config.config import GRID_SIZE
+
+# The exact cover constraints are numbered in four blocks of CELL_COUNT columns:
+# every cell holds a value, and every row, column and subgrid holds every value once.
+CONSTRAINT_COUNT: int = 4 * CELL_COUNT
+
+# The constraint columns satisfied by placing each value in each cell, keyed by (flat index, value).
+CANDIDATE_CONSTRAINTS: Dict[Tuple[int, int], Tuple[int, int, int, int]] = {
+
+    (index, num): (
+
+        index,
+        CELL_COUNT + ROW_OF[index] * GRID_SIZE + num - 1,
+        2 * CELL_COUNT + COL_OF[index] * GRID_SIZE + num - 1,
+        3 * CELL_COUNT + SUBGRID_OF[index] * GRID_SIZE + num - 1
+
+    )
+    for index in range(CELL_COUNT) for num in range(1, GRID_SIZE + 1)
+
+}
+
+def _build_empty_grid_columns() -> Dict[int, Tuple[Tuple[int, int], ...]]:
+
+    """
+    Returns the candidate placements able to satisfy each constraint column of an empty grid.
+    
+    """
+
+    columns = {column: [] for column in range(CONSTRAINT_COUNT)}
+
+    for candidate, constraints in CANDIDATE_CONSTRAINTS.items():
+
+        for column in constraints:
+
+            columns[column].append(candidate)
+
+    return {column: tuple(candidates) for column, candidates in columns.items()}
+
+# The candidate placements able to satisfy each constraint column of an empty grid.
+EMPTY_GRID_COLUMNS: Dict[int, Tuple[Tuple[int, int], ...]] = _build_empty_grid_columns()
+
+class SudokuExactCover:
+
+    """
+    A class to fill or solve a Sudoku grid by modelling it as an exact cover problem, solved with Algorithm X.
+
+    Each candidate placement is a row covering four constraint columns, and a solution is a set of rows covering every column exactly once.
+    
+    """
+
+    def __init__(self, grid: SudokuGrid, validator: SudokuValidator, rng: random.Random = None):
+
+        """
+        Initialises SudokuExactCover with an instance of the SudokuGrid and SudokuValidator classes.
+
+        Parameters:
+
+            grid (SudokuGrid): The empty grid to be filled or the partially filled grid to be solved.
+            validator (SudokuValidator): Validates the grid before solving.
+            rng (random.Random): An optional random number generator, for reproducible results. Defaults to the global random module.
+
+        Attributes:
+
+            nodes_explored (int): The number of search nodes visited by the most recent search, for benchmarking.
+        
+        """
+
+        self.grid = grid
+        self.validator = validator
+        self.rng = rng or random
+
+        self.nodes_explored = 0
+
+    # ALGORITHM X
+
+    def populate_grid(self) -> bool:
+
+        """
+        Fills an empty or partially filled grid with a randomised number selection.
+
+        Returns:
+
+            bool: True if the grid was successfully filled, otherwise False.
+        
+        """
+
+        if not self.validator.is_grid_valid():
+
+            return False
+
+        for solution in self._search(shuffle=True):
+
+            for index, num in solution:
+
+                self.grid.set_cell_at(index, num)
+
+            return True
+
+        return False
+
+    def is_solution_unique(self) -> bool:
+
+        """
+        Checks if the grid has a single unique solution.
+
+        Terminates when more than one solution is found.
+
+        Returns:
+
+            bool: True if the grid has a single unique solution, otherwise False.
+        
+        """
+
+        if not self.validator.is_grid_valid():
+
+            return False
+
+        return self._count_solutions(2) == 1
+
+    def get_total_solutions(self, max_solutions: int = float("inf")) -> int:
+
+        """
+        Returns the total number of valid solutions to the grid.
+
+        Continues counting until all potential solutions are fully explored.
+
+        Parameters:
+
+            max_solutions (int): Limits the number of solutions considering computational overhead.
+
+        Returns:
+
+            int: The total number of valid solutions to the grid.
+        
+        """
+
+        if not self.validator.is_grid_valid():
+
+            return False
+
+        return self._count_solutions(max_solutions)
+
+    def is_removal_unique(self, row_index: int, col_index: int, removed_num: int) -> bool:
+
+        """
+        Checks that a grid with a known unique solution still has a unique solution after one of its cells is emptied.
+
+        Any other solution must place a different value in the emptied cell, so the removed value is excluded from the search,
+        which terminates as soon as any completion is found.
+
+        Parameters:
+
+            row_index (int): The index position of the row of the emptied cell.
+            col_index (int): The index position of the column of the emptied cell.
+            removed_num (int): The value the emptied cell held in the known solution.
+
+        Returns:
+
+            bool: True if the grid still has a single unique solution, otherwise False.
+        
+        """
+
+        excluded = (row_index * GRID_SIZE + col_index, removed_num)
+
+        for _ in self._search(shuffle=False, excluded=excluded):
+
+            return False
+
+        return True
+
+    def _count_solutions(self, max_solutions: int) -> int:
+
+        """
+        Counts the solutions to the grid, stopping once the maximum number of solutions is reached.
+
+        Parameters:
+
+            max_solutions (int): The number of solutions at which to stop counting.
+
+        Returns:
+
+            int: The number of solutions found.
+        
+        """
+
+        solutions = 0
+
+        if max_solutions < 1:
+
+            return solutions
+
+        for _ in self._search(shuffle=False):
+
+            solutions += 1
+
+            if solutions >= max_solutions:
+
+                break
+
+        return solutions
+
+    def _search(self, shuffle: bool, excluded: Tuple[int, int] = None) -> Iterator[List[Tuple[int, int]]]:
+
+        """
+        Yields every solution to the grid, as the placements required to complete it.
+
+        The grid itself is never modified.
+
+        Parameters:
+
+            shuffle (bool): If True, tries the candidate placements in a random order.
+            excluded (Tuple[int, int]): An optional (flat index, value) placement that solutions must not contain.
+
+        Returns:
+
+            Iterator[List[Tuple[int, int]]]: An iterator of solutions, each a list of (flat index, value) placements.
+        
+        """
+
+        self.nodes_explored = 0
+
+        columns = self.build_columns()
+
+        if columns is None:
+
+            return
+
+        if excluded is not None:
+
+            for column in CANDIDATE_CONSTRAINTS[excluded]:
+
+                if column in columns:
+
+                    columns[column].discard(excluded)
+
+        solution = []
+
+        def solve(columns: Dict[int, Set[Tuple[int, int]]]):
+
+            self.nodes_explored += 1
+
+            # Base case, every constraint is satisfied.
+            if not columns:
+
+                yield list(solution)
+
+                return
+
+            # Branches on the constraint with the fewest candidate placements.
+            column = min(columns, key=lambda column: len(columns[column]))
+
+            candidates = list(columns[column])
+
+            if shuffle:
+
+                self.rng.shuffle(candidates)
+
+            else:
+
+                candidates.sort()
+
+            for candidate in candidates:
+
+                solution.append(candidate)
+
+                removed_columns = self.select(columns, candidate)
+
+                yield from solve(columns)
+
+                # Backtrack
+                self.deselect(columns, candidate, removed_columns)
+
+                solution.pop()
+
+        yield from solve(columns)
+
+    # CONSTRAINT MATRIX
+
+    def build_columns(self) -> Dict[int, Set[Tuple[int, int]]]:
+
+        """
+        Builds the constraint columns for the current grid, with every existing value already selected.
+
+        Returns:
+
+            Dict[int, Set[Tuple[int, int]]]: The candidate placements able to satisfy each unsatisfied constraint, or None if an existing value cannot be selected.
+        
+        """
+
+        columns = {column: set(candidates) for column, candidates in EMPTY_GRID_COLUMNS.items()}
+
+        for index, num in enumerate(self.grid.cells):
+
+            if num:
+
+                if not all(column in columns for column in CANDIDATE_CONSTRAINTS[(index, num)]):
+
+                    return None
+
+                self.select(columns, (index, num))
+
+        return columns
+
+    def select(self, columns: Dict[int, Set[Tuple[int, int]]], candidate: Tuple[int, int]) -> List[Set[Tuple[int, int]]]:
+
+        """
+        Selects a candidate placement, removing its constraint columns and every conflicting candidate placement.
+
+        Parameters:
+
+            columns (Dict[int, Set[Tuple[int, int]]]): The unsatisfied constraint columns.
+            candidate (Tuple[int, int]): The (flat index, value) placement to be selected.
+
+        Returns:
+
+            List[Set[Tuple[int, int]]]: The removed columns, in removal order, required to deselect the candidate.
+        
+        """
+
+        removed_columns = []
+
+        for column in CANDIDATE_CONSTRAINTS[candidate]:
+
+            for conflict in columns[column]:
+
+                for other_column in CANDIDATE_CONSTRAINTS[conflict]:
+
+                    if other_column != column:
+
+                        columns[other_column].remove(conflict)
+
+            removed_columns.append(columns.pop(column))
+
+        return removed_columns
+
+    def deselect(self, columns: Dict[int, Set[Tuple[int, int]]], candidate: Tuple[int, int], removed_columns: List[Set[Tuple[int, int]]]) -> None:
+
+        """
+        Reverses the selection of a candidate placement.
+
+        Parameters:
+
+            columns (Dict[int, Set[Tuple[int, int]]]): The unsatisfied constraint columns.
+            candidate (Tuple[int, int]): The (flat index, value) placement to be deselected.
+            removed_columns (List[Set[Tuple[int, int]]]): The columns returned by select.
+        
+        """
+
+        for column in reversed(CANDIDATE_CONSTRAINTS[candidate]):
+
+            columns[column] = removed_columns.pop()
+
+            for conflict in columns[column]:
+
+                for other_column in CANDIDATE_CONSTRAINTS[conflict]:
+
+                    if other_column != column:
+
+                        columns[other_column].add(conflict)
+
+
+
+if __name__ == "__main__":
+
+    print("--------------------")
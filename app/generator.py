@@ -4,6 +4,7 @@ import random
 from app.grid import SudokuGrid
 from app.validator import SudokuValidator
 from app.recursion import SudokuRecursion
+from app.events import SudokuEvents
 
 class SudokuGenerator:
 
@@ -12,7 +13,7 @@ class SudokuGenerator:
     
     """
 
-    def __init__(self, grid: SudokuGrid, validator: SudokuValidator, recursion: SudokuRecursion):
+    def __init__(self, grid: SudokuGrid, validator: SudokuValidator, recursion: SudokuRecursion, rng: random.Random = None, events: SudokuEvents = None):
 
         """
         Initialises SudokuGenerator with an instance of the SudokuGrid and SudokuValidator classes.
@@ -22,12 +23,16 @@ class SudokuGenerator:
             grid (SudokuGrid): The grid to be transformed into a puzzle.
             validator (SudokuValidator): Validates grid operations to support the transformation process.
             recursion (SudokuRecursion): Ensures the puzzle has a unique solution.
+            rng (random.Random): An optional random number generator, for reproducible results. Defaults to the global random module.
+            events (SudokuEvents): An optional receiver of progress events. Defaults to a SudokuEvents instance, which ignores them.
         
         """
 
         self.grid = grid
         self.validator = validator
         self.recursion = recursion
+        self.rng = rng or random
+        self.events = events or SudokuEvents()
 
     # CELL REMOVAL
 
@@ -79,6 +84,34 @@ class SudokuGenerator:
 
         raise ValueError("Please provide a target number of cells to remove or a valid difficulty level.")
 
+    def validate_arguments(self, target_removal: int = None, difficulty_level: str = None) -> None:
+
+        """
+        Validates the arguments of generate_puzzle without generating anything, so a caller can check them before any work.
+
+        Parameters:
+
+            target_removal (int): The target number of cells to remove.
+            difficulty_level (str): The difficulty level of the puzzle ('easy', 'medium', 'hard' or 'expert').
+
+        Raises:
+
+            ValueError: As raised by generate_puzzle.
+        
+        """
+
+        if (target_removal is None) == (difficulty_level is None):
+
+            raise ValueError("Please provide a target number of cells to remove or a valid difficulty level (e.g., easy, medium, hard or expert).")
+
+        if target_removal is not None:
+
+            self.validate_target_removal(target_removal)
+
+        else:
+
+            self.get_difficulty_range(difficulty_level)
+
     def validate_target_removal(self, target_removal: int) -> None:
 
         """
@@ -116,7 +149,7 @@ class SudokuGenerator:
         min_remove, max_remove = difficulty_range
 
         # Randomly selects a number from within the difficulty level range.
-        return random.randint(min_remove, max_remove)
+        return self.rng.randint(min_remove, max_remove)
         
     def get_difficulty_range(self, difficulty_level: str) -> Tuple[int, int]:
 
@@ -167,13 +200,14 @@ class SudokuGenerator:
         
         """
 
-        print(f"Target removal: {target_removal}")
-
         removable_cells = self.grid.get_removable_cell_indices()
 
-        print(f"Number of removable cells: {len(removable_cells)}")
+        self.events.removal_started(target_removal, len(removable_cells))
 
-        random.shuffle(removable_cells)
+        self.rng.shuffle(removable_cells)
+
+        # A complete or uniquely solvable grid has a known solution, so each removal only needs to rule out a different one.
+        solution_known = self.grid.count_empty_cells() == 0 or self.recursion.is_solution_unique()
 
         removal_count = 0
 
@@ -183,15 +217,15 @@ class SudokuGenerator:
 
                 break
 
-            if self._remove_cell(row_index, col_index):
+            if self._remove_cell(row_index, col_index, solution_known):
 
                 removal_count += 1
 
-                print(f"Removal successful: {removal_count}/{target_removal}")
+                self.events.removal_succeeded(removal_count, target_removal)
         
         return True
     
-    def _remove_cell(self, row_index: int, col_index: int) -> bool:
+    def _remove_cell(self, row_index: int, col_index: int, solution_known: bool = False) -> bool:
 
         """
         Attempts to remove the specified cell and checks that the grid remains valid.
@@ -200,6 +234,9 @@ class SudokuGenerator:
 
             row_index (int): The index position of the row in the grid.
             col_index (int): The index position of the column in the grid.
+            solution_known (bool): If True, the grid is known to have a unique solution before the removal,
+            
+                so only a solution with a different value in the removed cell needs to be ruled out.
 
         Returns:
 
@@ -208,26 +245,32 @@ class SudokuGenerator:
         """
 
         # Stores the value of the removable cell.
-        removable_cell = self.grid.grid[row_index][col_index]
+        removable_cell = self.grid.get_cell(row_index, col_index)
 
-        print(f"Trying to remove cell at: ({row_index, col_index})")
+        self.events.removal_attempted(row_index, col_index)
 
         # Resets the removable cell to zero.
         self.grid.reset_cell(row_index, col_index)
 
+        if solution_known:
+
+            is_unique = self.recursion.is_removal_unique(row_index, col_index, removable_cell)
+
+        else:
+
+            is_unique = self.recursion.is_solution_unique()
+
         # If the grid is valid.
-        if self.recursion.is_solution_unique():
+        if is_unique:
 
             return True
 
         # Otherwise, the removable cell value is restored.
         else:
 
-            print(f"Restoring cell at: ({row_index, col_index})")
-
-            self.grid.grid[row_index][col_index] = removable_cell
+            self.grid.set_cell(row_index, col_index, removable_cell)
 
-            print(f"Empty cells remaining: {self.grid.count_empty_cells()}")
+            self.events.removal_restored(row_index, col_index, self.grid.empty_count)
 
             return False
 
@@ -1,23 +1,239 @@
-from typing import List, Tuple
+from typing import List, Tuple, Iterator, Union
 
-from config.config import GRID_SIZE, SUBGRID_SIZE
+from app.tables import (
+
+    CELL_COUNT,
+    UNIT_COUNT,
+    ALL_CELLS_MASK,
+    ALL_DIGITS_MASK,
+    MASK_VALUES,
+    MASK_COUNTS,
+    CELL_COORDINATES,
+    SUBGRID_OF,
+    SUBGRID_ORIGINS,
+    COL_INDICES,
+    SUBGRID_INDICES,
+    CELL_UNITS
+
+)
+from config.config import GRID_SIZE
+
+# Translation table from cell values to their ASCII digit characters.
+ASCII_DIGITS: bytes = bytes.maketrans(bytes(range(10)), b"0123456789")
+
+# Translation table from ASCII characters to cell values, reading '.' as an empty cell and any other character as 255, an invalid value.
+CELL_VALUES: bytes = bytes(
+
+    b"0123456789".index(char) if char in b"0123456789" else 0 if char == ord(".") else 255 for char in range(256)
+
+)
+
+# A puzzle in any of the formats accepted by SudokuGrid.load.
+Puzzle = Union[List[List[int]], str, bytes, bytearray]
+
+def get_set_bits(mask: int) -> List[int]:
+
+    """
+    Returns the positions of the set bits in a bitmask, in ascending order.
+
+    Parameters:
+
+        mask (int): The bitmask to be decomposed.
+
+    Returns:
+
+        List[int]: A list of the positions of every set bit.
+    
+    """
+
+    positions = []
+
+    while mask:
+
+        lowest_bit = mask & -mask
+
+        positions.append(lowest_bit.bit_length() - 1)
+
+        mask ^= lowest_bit
+
+    return positions
 
 class SudokuGrid:
 
     """
     A class to manage access to a Sudoku grid.
+
+    The cells are stored in a flat bytearray in row-major order.
     
     """
 
+    __slots__ = ("cells", "original", "unit_masks", "empty_mask", "empty_count")
+
     def __init__(self, grid: List[List[int]] = None) -> None:
 
         """
         Initialises SudokuGrid with an optional grid input, or generates an empty grid, if None is provided.
+
+        The grid input is copied, so the provided lists are never modified.
+
+        Raises:
+
+            ValueError: If the grid is not 9 rows of 9 values between 0 and 9, as checked by load.
+        
+        """
+
+        self.cells = bytearray(CELL_COUNT)
+        self.original = bytes(self.cells)
+
+        # Bitmasks of the digits already present in each unit, indexed as in app.tables.UNITS.
+        self.unit_masks = [0] * UNIT_COUNT
+
+        # Bitmask where bit n is set if the cell at flat index n is empty, and the number of set bits.
+        self.empty_mask = 0
+        self.empty_count = 0
+
+        if grid:
+
+            self.load(grid)
+
+        else:
+
+            self.build_masks()
+
+    @property
+    def grid(self) -> "GridRows":
+
+        """
+        Returns a nested list style view of the cells, supporting grid[row_index][col_index] access and assignment.
+
+        Provided for compatibility with code written against the former list of lists representation.
+        
+        """
+
+        return GridRows(self)
+
+    def to_list(self) -> List[List[int]]:
+
+        """
+        Returns a copy of the grid as a list of rows.
+
+        Returns:
+
+            List[List[int]]: A list of lists of integers representing the grid.
+        
+        """
+
+        return [list(self.cells[start:start + GRID_SIZE]) for start in range(0, CELL_COUNT, GRID_SIZE)]
+
+    def to_string(self) -> str:
+
+        """
+        Returns the grid as a string of 81 digits in row-major order, with zero for every empty cell.
+
+        Returns:
+
+            str: The grid as a string of digits.
+        
+        """
+
+        return self.cells.translate(ASCII_DIGITS).decode("ascii")
+
+    def load(self, puzzle: Puzzle) -> None:
+
+        """
+        Replaces the contents of the grid with a puzzle in place, so a single grid and the components built on it can process many puzzles.
+
+        Parameters:
+
+            puzzle (Puzzle): The puzzle to be loaded, either as a list of rows, a string of 81 characters in row-major order
+            with '0' or '.' for every empty cell, or 81 cell values as bytes.
+
+        Raises:
+
+            ValueError: If the puzzle does not hold 81 values between 0 and 9.
+        
+        """
+
+        if isinstance(puzzle, str):
+
+            cells = puzzle.encode("latin-1", "replace").translate(CELL_VALUES)
+
+        elif isinstance(puzzle, (bytes, bytearray)):
+
+            cells = puzzle
+
+        # Every row must be complete, so a short row cannot shift the cells of the rows after it.
+        elif len(puzzle) == GRID_SIZE and all(len(row) == GRID_SIZE for row in puzzle):
+
+            # Values outside a byte are mapped to one above the largest digit, so the check below rejects them.
+            cells = bytes(num if 0 <= num <= GRID_SIZE else GRID_SIZE + 1 for row in puzzle for num in row)
+
+        else:
+
+            cells = b""
+
+        if len(cells) != CELL_COUNT or max(cells) > GRID_SIZE:
+
+            raise ValueError(f"Please provide a valid puzzle (e.g., {CELL_COUNT} values between 0 and {GRID_SIZE}, with 0 for every empty cell).")
+
+        self.cells[:] = cells
+        self.original = bytes(cells)
+
+        self.build_masks()
+
+    def build_masks(self) -> None:
+
+        """
+        Rebuilds the unit and empty cell bitmasks from the current contents of the grid.
+
+        Only required if the cells are modified directly, rather than through set_cell and reset_cell.
         
         """
 
-        self.grid = grid or [[0] * GRID_SIZE for _ in range(GRID_SIZE)]
-        self.original = [row[:] for row in self.grid]
+        unit_masks = self.unit_masks
+
+        for unit_index in range(len(unit_masks)):
+
+            unit_masks[unit_index] = 0
+
+        empty_mask = 0
+
+        for index, num in enumerate(self.cells):
+
+            if num:
+
+                bit = 1 << num
+
+                for unit_index in CELL_UNITS[index]:
+
+                    unit_masks[unit_index] |= bit
+
+            else:
+
+                empty_mask |= 1 << index
+
+        self.empty_mask = empty_mask
+        self.empty_count = self.cells.count(0)
+
+    def _validate_index(self, name: str, index: int) -> None:
+
+        """
+        Validates that a row or column index lies within the grid.
+
+        Parameters:
+
+            name (str): The name of the index, used in the error message.
+            index (int): The index position to be validated.
+
+        Raises:
+
+            ValueError: If the index lies outside of the grid.
+        
+        """
+
+        if not 0 <= index < GRID_SIZE:
+
+            raise ValueError(f"{name} {index} must be within range 0 to {GRID_SIZE - 1}.")
 
     def get_row(self, row_index: int) -> List[int]:
 
@@ -28,14 +244,39 @@ class SudokuGrid:
 
             row_index (int): The index position of the row in the grid.
 
+        Raises:
+
+            ValueError: If the row index lies outside of the grid.
+
         Returns:
 
             List[int]: A list of integers representing the specified row from the grid.
         
         """
 
-        return self.grid[row_index]
-    
+        self._validate_index("row_index", row_index)
+
+        return list(self.get_row_view(row_index))
+
+    def get_row_view(self, row_index: int) -> memoryview:
+
+        """
+        Returns a zero-copy, read-only view of the specified row from the grid.
+
+        Parameters:
+
+            row_index (int): The index position of the row in the grid.
+
+        Returns:
+
+            memoryview: A view of the cells in the specified row.
+        
+        """
+
+        start = row_index * GRID_SIZE
+
+        return memoryview(self.cells)[start:start + GRID_SIZE].toreadonly()
+
     def get_col(self, col_index: int) -> List[int]:
 
         """
@@ -45,14 +286,20 @@ class SudokuGrid:
 
             col_index (int): The index position of the column in the grid.
 
+        Raises:
+
+            ValueError: If the column index lies outside of the grid.
+
         Returns:
 
             List[int]: A list of integers representing the specified column from the grid.
         
         """
 
-        return [row[col_index] for row in self.grid]
-    
+        self._validate_index("col_index", col_index)
+
+        return self.get_values(COL_INDICES[col_index])
+
     def get_subgrid(self, row_index: int, col_index: int) -> List[int]:
 
         """
@@ -63,16 +310,131 @@ class SudokuGrid:
             row_index (int): The index position of the row in the grid.
             col_index (int): The index position of the column in the grid.
 
+        Raises:
+
+            ValueError: If either index lies outside of the grid.
+
         Returns:
 
             List[int]: A list of integers representing the specified subgrid from the grid.
         
         """
 
-        start_row = (row_index // SUBGRID_SIZE) * SUBGRID_SIZE
-        start_col = (col_index // SUBGRID_SIZE) * SUBGRID_SIZE
+        if not (0 <= row_index < GRID_SIZE and 0 <= col_index < GRID_SIZE):
+
+            raise ValueError(f"row_index {row_index} and col_index {col_index} must be within range 0 to {GRID_SIZE - 1}.")
+
+        return self.get_values(SUBGRID_INDICES[self.get_subgrid_index(row_index, col_index)])
+
+    def get_values(self, indices: Tuple[int, ...]) -> List[int]:
+
+        """
+        Returns the values of the cells at the specified flat indices.
+
+        Parameters:
+
+            indices (Tuple[int, ...]): The flat cell indices, such as a unit from app.tables.UNITS.
+
+        Returns:
+
+            List[int]: A list of the values at the specified indices.
+        
+        """
+
+        cells = self.cells
+
+        return [cells[index] for index in indices]
+
+    def get_subgrid_index(self, row_index: int, col_index: int) -> int:
+
+        """
+        Returns the index of the subgrid containing the specified cell, numbered in row-major order.
+
+        Parameters:
+
+            row_index (int): The index position of the row in the grid.
+            col_index (int): The index position of the column in the grid.
+
+        Returns:
+
+            int: The index of the subgrid containing the specified cell.
+        
+        """
+
+        return SUBGRID_OF[row_index * GRID_SIZE + col_index]
+
+    def get_used_mask(self, row_index: int, col_index: int) -> int:
+
+        """
+        Returns a bitmask of the values present in the containing row, column and subgrid of the specified cell.
+
+        Parameters:
+
+            row_index (int): The index position of the row in the grid.
+            col_index (int): The index position of the column in the grid.
+
+        Returns:
+
+            int: A bitmask where bit n is set if the value n is present in any of the containing units.
+        
+        """
+
+        return self.get_used_mask_at(row_index * GRID_SIZE + col_index)
+
+    def get_used_mask_at(self, index: int) -> int:
+
+        """
+        Returns a bitmask of the values present in the containing row, column and subgrid of the cell at the specified flat index.
+
+        Parameters:
+
+            index (int): The flat index of the cell in the grid.
+
+        Returns:
+
+            int: A bitmask where bit n is set if the value n is present in any of the containing units.
+        
+        """
+
+        unit_masks = self.unit_masks
+        row_unit, col_unit, subgrid_unit = CELL_UNITS[index]
 
-        return [self.grid[start_row + x][start_col + y] for x in range(SUBGRID_SIZE) for y in range(SUBGRID_SIZE)]
+        return unit_masks[row_unit] | unit_masks[col_unit] | unit_masks[subgrid_unit]
+
+    def get_candidate_mask(self, row_index: int, col_index: int) -> int:
+
+        """
+        Returns a bitmask of the values that could be placed in the specified cell.
+
+        Parameters:
+
+            row_index (int): The index position of the row in the grid.
+            col_index (int): The index position of the column in the grid.
+
+        Returns:
+
+            int: A bitmask where bit n is set if the value n is absent from all of the containing units.
+        
+        """
+
+        return ALL_DIGITS_MASK & ~self.get_used_mask_at(row_index * GRID_SIZE + col_index)
+
+    def get_candidate_mask_at(self, index: int) -> int:
+
+        """
+        Returns a bitmask of the values that could be placed in the cell at the specified flat index.
+
+        Parameters:
+
+            index (int): The flat index of the cell in the grid.
+
+        Returns:
+
+            int: A bitmask where bit n is set if the value n is absent from all of the containing units.
+        
+        """
+
+        return ALL_DIGITS_MASK & ~self.get_used_mask_at(index)
 
     def get_containing_values(self, row_index: int, col_index: int) -> List[int]:
 
@@ -90,7 +452,7 @@ class SudokuGrid:
         
         """
 
-        return list(set(self.get_row(row_index)) | set(self.get_col(col_index)) | set(self.get_subgrid(row_index, col_index)))
+        return list(MASK_VALUES[self.get_used_mask(row_index, col_index)])
 
     def get_remaining_values(self, containing_values: List[int]) -> List[int]:
 
@@ -107,8 +469,14 @@ class SudokuGrid:
         
         """
 
-        return [num for num in range(1, 10) if num not in containing_values]
-    
+        used_mask = 0
+
+        for num in containing_values:
+
+            used_mask |= 1 << num
+
+        return list(MASK_VALUES[ALL_DIGITS_MASK & ~used_mask])
+
     def possible_values(self, row_index, col_index) -> List[int]:
 
         """
@@ -125,8 +493,8 @@ class SudokuGrid:
         
         """
 
-        return self.get_remaining_values(self.get_containing_values(row_index, col_index))
-    
+        return list(MASK_VALUES[self.get_candidate_mask(row_index, col_index)])
+
     def is_cell_empty(self, row_index: int, col_index: int) -> bool:
 
         """
@@ -143,10 +511,76 @@ class SudokuGrid:
         
         """
 
-        return self.grid[row_index][col_index] == 0
-    
-    def reset_cell(self, row_index: int, col_index: int) -> None:
+        return self.cells[row_index * GRID_SIZE + col_index] == 0
+
+    def get_cell(self, row_index: int, col_index: int) -> int:
+
+        """
+        Returns the value of the cell at the specified indices.
+
+        Parameters:
+
+            row_index (int): The index position of the row in the grid.
+            col_index (int): The index position of the column in the grid.
+
+        Returns:
+
+            int: The value of the cell, or zero if the cell is empty.
         
+        """
+
+        return self.cells[row_index * GRID_SIZE + col_index]
+
+    def set_cell(self, row_index: int, col_index: int, num: int) -> None:
+
+        """
+        Sets the cell at the specified indices to the specified number, without validation, and updates the bitmasks.
+
+        Parameters:
+
+            row_index (int): The index position of the row in the grid.
+            col_index (int): The index position of the column in the grid.
+            num (int): The number to be placed, between 1 and 9, or 0 to empty the cell.
+        
+        """
+
+        self.set_cell_at(row_index * GRID_SIZE + col_index, num)
+
+    def set_cell_at(self, index: int, num: int) -> None:
+
+        """
+        Sets the cell at the specified flat index to the specified number, without validation, and updates the bitmasks.
+
+        Parameters:
+
+            index (int): The flat index of the cell in the grid.
+            num (int): The number to be placed, between 1 and 9, or 0 to empty the cell.
+        
+        """
+
+        if self.cells[index]:
+
+            self.reset_cell_at(index)
+
+        # Zero only empties the cell, which reset_cell_at has already done.
+        if not num:
+
+            return
+
+        bit = 1 << num
+        unit_masks = self.unit_masks
+
+        self.cells[index] = num
+
+        self.empty_mask &= ~(1 << index)
+        self.empty_count -= 1
+
+        for unit_index in CELL_UNITS[index]:
+
+            unit_masks[unit_index] |= bit
+
+    def reset_cell(self, row_index: int, col_index: int) -> None:
+
         """
         Resets the cell to zero at the specified indices.
 
@@ -157,8 +591,35 @@ class SudokuGrid:
         
         """
 
-        self.grid[row_index][col_index] = 0
-    
+        self.reset_cell_at(row_index * GRID_SIZE + col_index)
+
+    def reset_cell_at(self, index: int) -> None:
+
+        """
+        Resets the cell to zero at the specified flat index.
+
+        Parameters:
+
+            index (int): The flat index of the cell in the grid.
+        
+        """
+
+        num = self.cells[index]
+
+        if num:
+
+            bit = ~(1 << num)
+            unit_masks = self.unit_masks
+
+            for unit_index in CELL_UNITS[index]:
+
+                unit_masks[unit_index] &= bit
+
+            self.cells[index] = 0
+
+            self.empty_mask |= 1 << index
+            self.empty_count += 1
+
     def count_empty_cells(self) -> int:
 
         """
@@ -170,18 +631,8 @@ class SudokuGrid:
         
         """
 
-        empty_cells = 0
-            
-        for row_index in range(GRID_SIZE):
-            
-            for col_index in range(GRID_SIZE):
-
-                if self.is_cell_empty(row_index, col_index):
-
-                    empty_cells += 1
+        return self.empty_count
 
-        return empty_cells
-    
     def find_next_empty_cell(self) -> Tuple[int, int]:
 
         """
@@ -193,15 +644,63 @@ class SudokuGrid:
         
         """
 
-        for row_index in range(GRID_SIZE):
+        index = self.find_next_empty_index()
+
+        if index is None:
+
+            return None
+
+        return CELL_COORDINATES[index]
+
+    def find_next_empty_index(self) -> int:
+
+        """
+        Finds the flat index of the next empty cell in the grid.
+
+        Returns:
+
+            int: The flat index of the next empty cell, or None if all cells are full.
+        
+        """
+
+        empty_mask = self.empty_mask
+
+        if not empty_mask:
+
+            return None
+
+        # Isolates the lowest set bit, which represents the first empty cell in row-major order.
+        return (empty_mask & -empty_mask).bit_length() - 1
+
+    def find_most_constrained_index(self) -> int:
+
+        """
+        Finds the flat index of the empty cell with the fewest possible values, preferring the earliest in row-major order.
+
+        Returns:
+
+            int: The flat index of the most constrained empty cell, or None if all cells are full.
+        
+        """
+
+        selected_index = None
+        fewest_values = GRID_SIZE + 1
+
+        for index in get_set_bits(self.empty_mask):
+
+            remaining_values = MASK_COUNTS[self.get_candidate_mask_at(index)]
 
-            for col_index in range(GRID_SIZE):
+            if remaining_values < fewest_values:
 
-                if self.is_cell_empty(row_index, col_index):
+                selected_index = index
+                fewest_values = remaining_values
 
-                    return (row_index, col_index)
-                
-        return None
+                # A cell with one or no possible values cannot be improved upon.
+                if remaining_values <= 1:
+
+                    break
+
+        return selected_index
 
     def get_grid_indices(self) -> List[Tuple[int, int]]:
 
@@ -214,7 +713,7 @@ class SudokuGrid:
         
         """
 
-        return [(row_index, col_index) for row_index in range(GRID_SIZE) for col_index in range(GRID_SIZE)]
+        return list(CELL_COORDINATES)
 
     def get_subgrid_indices(self) -> List[Tuple[int, int]]:
 
@@ -227,8 +726,8 @@ class SudokuGrid:
         
         """
 
-        return [(row_index, col_index) for row_index in (0, 3, 6) for col_index in (0, 3, 6)]
-    
+        return list(SUBGRID_ORIGINS)
+
     def get_empty_cell_indices(self) -> List[Tuple[int, int]]:
 
         """
@@ -240,8 +739,21 @@ class SudokuGrid:
         
         """
 
-        return [(row_index, col_index) for row_index in range(GRID_SIZE) for col_index in range(GRID_SIZE) if self.is_cell_empty(row_index, col_index)]
-    
+        return [CELL_COORDINATES[index] for index in self.get_empty_indices()]
+
+    def get_empty_indices(self) -> List[int]:
+
+        """
+        Returns the flat indices for all remaining empty cells in the grid, in row-major order.
+
+        Returns:
+
+            List[int]: A list of the flat indices of all remaining empty cells in the grid.
+        
+        """
+
+        return get_set_bits(self.empty_mask)
+
     def get_removable_cell_indices(self) -> List[Tuple[int, int]]:
 
         """
@@ -253,7 +765,103 @@ class SudokuGrid:
         
         """
 
-        return [(row_index, col_index) for row_index in range(GRID_SIZE) for col_index in range(GRID_SIZE) if not self.is_cell_empty(row_index, col_index)]
+        return [CELL_COORDINATES[index] for index in get_set_bits(ALL_CELLS_MASK & ~self.empty_mask)]
+
+class GridRows:
+
+    """
+    A nested list style view of a SudokuGrid, supporting grid[row_index][col_index] access and assignment.
+
+    Assignments are written through SudokuGrid.set_cell and SudokuGrid.reset_cell, so the bitmasks remain consistent.
+    
+    """
+
+    __slots__ = ("sudoku_grid",)
+
+    def __init__(self, sudoku_grid: SudokuGrid) -> None:
+
+        self.sudoku_grid = sudoku_grid
+
+    def __getitem__(self, row_index: int) -> "GridRow":
+
+        if not 0 <= row_index < GRID_SIZE:
+
+            raise IndexError(f"row_index {row_index} must be within range 0 to {GRID_SIZE - 1}.")
+
+        return GridRow(self.sudoku_grid, row_index)
+
+    def __len__(self) -> int:
+
+        return GRID_SIZE
+
+    def __iter__(self) -> Iterator["GridRow"]:
+
+        return (GridRow(self.sudoku_grid, row_index) for row_index in range(GRID_SIZE))
+
+    def __eq__(self, other: object) -> bool:
+
+        return self.sudoku_grid.to_list() == [list(row) for row in other]
+
+    def __repr__(self) -> str:
+
+        return repr(self.sudoku_grid.to_list())
+
+class GridRow:
+
+    """
+    A list style view of a single row of a SudokuGrid.
+    
+    """
+
+    __slots__ = ("sudoku_grid", "row_index")
+
+    def __init__(self, sudoku_grid: SudokuGrid, row_index: int) -> None:
+
+        self.sudoku_grid = sudoku_grid
+        self.row_index = row_index
+
+    def __getitem__(self, col_index):
+
+        if isinstance(col_index, slice):
+
+            return list(self)[col_index]
+
+        if not 0 <= col_index < GRID_SIZE:
+
+            raise IndexError(f"col_index {col_index} must be within range 0 to {GRID_SIZE - 1}.")
+
+        return self.sudoku_grid.cells[self.row_index * GRID_SIZE + col_index]
+
+    def __setitem__(self, col_index: int, num: int) -> None:
+
+        # A column outside of the row would otherwise write a cell of a neighbouring row.
+        if not 0 <= col_index < GRID_SIZE:
+
+            raise IndexError(f"col_index {col_index} must be within range 0 to {GRID_SIZE - 1}.")
+
+        if num:
+
+            self.sudoku_grid.set_cell(self.row_index, col_index, num)
+
+        else:
+
+            self.sudoku_grid.reset_cell(self.row_index, col_index)
+
+    def __len__(self) -> int:
+
+        return GRID_SIZE
+
+    def __iter__(self) -> Iterator[int]:
+
+        return iter(self.sudoku_grid.get_row_view(self.row_index))
+
+    def __eq__(self, other: object) -> bool:
+
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+
+        return repr(list(self))
 
 
 
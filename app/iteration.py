@@ -1,8 +1,16 @@
-from typing import List, Tuple, Dict, Callable
+from typing import Any, List, Tuple, Dict, Callable, Optional
 
 from app.grid import SudokuGrid
 from app.validator import SudokuValidator
-from config.config import SUBGRID_SIZE
+from app.events import SudokuEvents
+from app.candidates import SudokuCandidates
+from app.registry import REGISTRY, TechniqueRegistry
+from app.techniques import Step, Technique, apply_techniques, apply_step, describe_step
+from app.tables import CELL_COUNT, ALL_CELLS_MASK, ALL_DIGITS_MASK, MASK_VALUES, CELL_COORDINATES, CELL_UNITS, PEER_MASKS, BAND_STACK_MASKS, CONTAINING_ROWS, CONTAINING_COLS, ADJACENT_ROWS, ADJACENT_COLS
+from config.config import GRID_SIZE
+
+# Bitmasks of every cell, indexed by the flat index of the placed cell.
+ALL_CELL_MASKS: Tuple[int, ...] = (ALL_CELLS_MASK,) * CELL_COUNT
 
 class SudokuIteration:
 
@@ -11,7 +19,17 @@ class SudokuIteration:
     
     """
 
-    def __init__(self, grid: SudokuGrid, validator: SudokuValidator):
+    # The cells whose result each technique depends on, as a bitmask for every placed cell.
+    # A technique is only re-applied to a cell after a placement among them, and techniques without an entry re-check every cell.
+    technique_dependents = {
+
+        "only_containing_option": PEER_MASKS,
+        "naked_single": PEER_MASKS,
+        "placement_by_adjacent_units": BAND_STACK_MASKS
+
+    }
+
+    def __init__(self, grid: SudokuGrid, validator: SudokuValidator, events: SudokuEvents = None, registry: TechniqueRegistry = None):
 
         """
         Initialises SudokuIteration with an instance of the SudokuGrid and SudokuValidator classes.
@@ -20,11 +38,20 @@ class SudokuIteration:
 
             grid (SudokuGrid): The partially filled grid to be solved.
             validator (SudokuValidator): Validates grid operations to support the iterative process.
+            events (SudokuEvents): An optional receiver of progress events. Defaults to a SudokuEvents instance, which ignores them.
+            registry (TechniqueRegistry): The registry that orders the candidate techniques and records their measurements. Defaults to REGISTRY.
+
+        Attributes:
+
+            candidates (SudokuCandidates): The pencil marks of the grid, updated by every placement the techniques make.
         
         """
 
         self.grid = grid
         self.validator = validator
+        self.events = events or SudokuEvents()
+        self.registry = registry or REGISTRY
+        self.candidates = SudokuCandidates(grid)
 
     # LOGICAL DEDUCTION    
 
@@ -44,7 +71,20 @@ class SudokuIteration:
         
         """
 
-        placement_techniques = {technique_type: {"count": 0, "indices": []} for technique_type, _ in self._get_techniques()}
+        techniques = self._get_techniques()
+
+        placement_techniques = {technique_type: {"count": 0, "indices": []} for technique_type, _ in techniques}
+
+        # Synced once per pass; every placement below goes through the candidates, which keeps them in sync.
+        self.candidates.sync()
+
+        cells = self.grid.cells
+
+        # The cells each technique must re-check after a placement, indexed by the flat index of the placed cell.
+        dependents = [self.technique_dependents.get(technique_type, ALL_CELL_MASKS) for technique_type, _ in techniques]
+
+        # Bitmasks of the cells queued for each technique, initially every empty cell.
+        queues = [self.grid.empty_mask] * len(techniques)
 
         rotations = 0
 
@@ -52,18 +92,28 @@ class SudokuIteration:
 
             placement_made = False
 
-            for technique_type, technique_method in self._get_techniques():
+            for position, (technique_type, technique_method) in enumerate(techniques):
 
-                # Refreshes the list of empty cell indices after every technique method.
-                empty_cell_indices = self.grid.get_empty_cell_indices()
+                successful_indices = []
 
-                if not empty_cell_indices:
+                # Visits the queued empty cells in row-major order, including cells queued ahead of the current cell during the visit.
+                index = -1
 
-                    break
+                while True:
 
-                successful_indices = []
+                    pending = queues[position] & self.grid.empty_mask & ~((1 << (index + 1)) - 1)
+
+                    if not pending:
+
+                        break
 
-                for row_index, col_index in empty_cell_indices:
+                    lowest_bit = pending & -pending
+
+                    index = lowest_bit.bit_length() - 1
+
+                    queues[position] &= ~lowest_bit
+
+                    row_index, col_index = CELL_COORDINATES[index]
 
                     if technique_method(row_index, col_index):
 
@@ -71,6 +121,13 @@ class SudokuIteration:
 
                         placement_made = True
 
+                        # Queues the cells whose result the placement can change, for every technique.
+                        if cells[index]:
+
+                            for queue_position, technique_dependents in enumerate(dependents):
+
+                                queues[queue_position] |= technique_dependents[index]
+
                 placement_techniques[technique_type]["count"] += len(successful_indices)
                 placement_techniques[technique_type]["indices"].extend(successful_indices)
 
@@ -80,12 +137,125 @@ class SudokuIteration:
             
             if not placement_made or remaining_cells == 0:
 
-                print(f"There are {remaining_cells} cells remaining after {rotations} placement technique rotations.")
+                self.events.placement_finished(remaining_cells, rotations)
 
                 break
 
         return placement_techniques
     
+    def candidate_techniques(self, techniques: Tuple[Tuple[str, Technique], ...] = None) -> Dict[str, Dict[str, List]]:
+
+        """
+        Applies the candidate techniques, always returning to the simplest technique after any progress, and records every deduction.
+
+        Each technique applies every step it finds in a single search of the candidates.
+        Steps are sound however the candidates have since changed, so a step is only skipped once nothing in it still applies.
+
+        Parameters:
+
+            techniques (Tuple[Tuple[str, Technique], ...]): The names and functions of the techniques, in the order they are tried.
+
+                Defaults to None, which uses the current ordering of the registry.
+
+        Returns:
+
+            Dict[str, Dict[str, List]]:
+
+                A dictionary where the keys are technique names and the values are nested dictionaries containing:
+
+                    "count": The number of steps applied (int).
+                    "indices": A list of the indices for each placement (List[Tuple[int, int]]).
+                    "eliminations": A list of the indices and value of each eliminated candidate (List[Tuple[int, int, int]]).
+        
+        """
+
+        if techniques is None:
+
+            techniques = self.registry.ordered()
+
+        candidate_techniques = {technique_type: {"count": 0, "indices": [], "eliminations": []} for technique_type, _ in techniques}
+
+        self.candidates.sync()
+
+        apply_techniques(self.candidates, techniques, candidate_techniques, self.registry)
+
+        return candidate_techniques
+
+    def next_hint(self, techniques: Tuple[Tuple[str, Technique], ...] = None) -> Optional[Dict[str, Any]]:
+
+        """
+        Finds the next deduction, by the simplest technique that makes one, without applying it.
+
+        The techniques are tried in order and each stops at its first step, so the cost depends on the difficulty of the next deduction.
+
+        Parameters:
+
+            techniques (Tuple[Tuple[str, Technique], ...]): The names and functions of the techniques, in the order they are tried.
+
+                Defaults to None, which uses the current ordering of the registry.
+
+        Returns:
+
+            Optional[Dict[str, Any]]: None if no technique makes a deduction, otherwise a dictionary containing:
+
+                "technique": The name of the technique (str).
+                "cell": The indices of the cell to be filled, or None if the deduction only eliminates candidates (Optional[Tuple[int, int]]).
+                "digit": The value to be placed, or None if the deduction only eliminates candidates (Optional[int]).
+                "eliminations": The indices and value of each candidate eliminated (List[Tuple[int, int, int]]).
+                "cells": The indices of the cells that justify the deduction (List[Tuple[int, int]]).
+                "justification": A sentence explaining the deduction (str).
+                "step": The step itself, which apply_step applies (Step).
+        
+        """
+
+        if techniques is None:
+
+            techniques = self.registry.ordered()
+
+        self.candidates.sync()
+
+        for _, technique_function in techniques:
+
+            step = next(technique_function(self.candidates), None)
+
+            if step is None:
+
+                continue
+
+            placement = step["placements"][0] if step["placements"] else None
+
+            return {
+
+                "technique": step["technique"],
+                "cell": CELL_COORDINATES[placement[0]] if placement else None,
+                "digit": placement[1] if placement else None,
+                "eliminations": [CELL_COORDINATES[index] + (num,) for index, mask in step["eliminations"] for num in MASK_VALUES[mask]],
+                "cells": [CELL_COORDINATES[index] for index in step["cells"]],
+                "justification": describe_step(step),
+                "step": step
+
+            }
+
+        return None
+
+    def apply_step(self, step: Step, record: Dict[str, List] = None) -> bool:
+
+        """
+        Applies the placements and eliminations of a step that still apply to the candidates.
+
+        Parameters:
+
+            step (Step): The step to be applied, as yielded by a technique.
+            record (Dict[str, List]): An optional record of a technique, as returned by candidate_techniques, to be updated.
+
+        Returns:
+
+            bool: True if any placement or elimination was applied, otherwise False.
+        
+        """
+
+        return apply_step(self.candidates, step, record)
+
     def _get_techniques(self) -> List[Tuple[str, Callable]]:
 
         """
@@ -104,9 +274,9 @@ class SudokuIteration:
 
         techniques = [
 
-            ("only_containing_option", self.only_containing_option),
-            ("naked_single", self.naked_single),
-            ("placement_by_adjacent_units", self.placement_by_adjacent_units)
+            ("only_containing_option", self._only_containing_option),
+            ("naked_single", self._naked_single),
+            ("placement_by_adjacent_units", self._placement_by_adjacent_units)
 
         ]
 
@@ -128,17 +298,32 @@ class SudokuIteration:
         
         """
 
-        units = [
-            
-            self.grid.get_subgrid(row_index, col_index), 
-            self.grid.get_row(row_index), 
-            self.grid.get_col(col_index)
-            
-        ]
+        self.candidates.sync()
 
-        for unit in units:
+        return self._only_containing_option(row_index, col_index)
 
-            remaining_values = self.grid.get_remaining_values(unit)
+    def _only_containing_option(self, row_index: int, col_index: int) -> bool:
+
+        """
+        Applies only_containing_option without syncing the candidates, which placement_techniques syncs once per pass.
+
+        Parameters:
+
+            row_index (int): The index position of the row in the grid.
+            col_index (int): The index position of the column in the grid.
+
+        Returns:
+
+            bool: True if the cell was successfully filled, otherwise False.
+        
+        """
+
+        unit_masks = self.grid.unit_masks
+        row_unit, col_unit, subgrid_unit = CELL_UNITS[row_index * GRID_SIZE + col_index]
+
+        for unit_index in (subgrid_unit, row_unit, col_unit):
+
+            remaining_values = MASK_VALUES[ALL_DIGITS_MASK & ~unit_masks[unit_index]]
 
             if self.only_possible_value(row_index, col_index, remaining_values):
 
@@ -165,12 +350,36 @@ class SudokuIteration:
 
         if len(possible_values) == 1:
             
-            self.validator.populate_cell(row_index, col_index, possible_values[0])
+            self.place_value(row_index * GRID_SIZE + col_index, possible_values[0])
 
             return True
         
         return False
 
+    def place_value(self, index: int, num: int) -> bool:
+
+        """
+        Places a number at the specified flat index if it is a candidate of the cell, and updates the candidates of its peers.
+
+        Parameters:
+
+            index (int): The flat index of the cell in the grid.
+            num (int): The number to be placed, between 1 and 9.
+
+        Returns:
+
+            bool: True if the number placement was successful, otherwise False.
+        
+        """
+
+        if self.candidates.masks[index] & (1 << num):
+
+            self.candidates.place(index, num)
+
+            return True
+
+        return False
+
     def naked_single(self, row_index: int, col_index: int) -> bool:
 
         """
@@ -189,11 +398,27 @@ class SudokuIteration:
         
         """
 
-        if not self.grid.is_cell_empty(row_index, col_index):
+        self.candidates.sync()
 
-            return False
+        return self._naked_single(row_index, col_index)
+
+    def _naked_single(self, row_index: int, col_index: int) -> bool:
+
+        """
+        Applies naked_single without syncing the candidates, which placement_techniques syncs once per pass.
+
+        Parameters:
+
+            row_index (int): The index position of the row in the grid.
+            col_index (int): The index position of the column in the grid.
+
+        Returns:
+
+            bool: True if the cell was successfully filled, otherwise False.
+        
+        """
 
-        possible_values = self.grid.possible_values(row_index, col_index)
+        possible_values = self.candidates.get_values(row_index * GRID_SIZE + col_index)
 
         return self.only_possible_value(row_index, col_index, possible_values)
 
@@ -215,15 +440,40 @@ class SudokuIteration:
 
         """
 
-        possible_values = self.grid.possible_values(row_index, col_index)
+        self.candidates.sync()
+
+        return self._placement_by_adjacent_units(row_index, col_index)
+
+    def _placement_by_adjacent_units(self, row_index: int, col_index: int) -> bool:
+
+        """
+        Applies placement_by_adjacent_units without syncing the candidates, which placement_techniques syncs once per pass.
+
+        Parameters:
+
+            row_index (int): The index position of the row in the grid.
+            col_index (int): The index position of the column in the grid.
+
+        Returns:
+
+            bool: True if the cell was successfully filled, otherwise False.
+
+        """
+
+        index = row_index * GRID_SIZE + col_index
+
+        unit_masks = self.grid.unit_masks
+
+        for value in self.candidates.get_values(index):
 
-        adjacent_rows, adjacent_cols = self.get_adjacent_units(row_index, col_index)
+            bit = 1 << value
 
-        for value in possible_values:
+            in_adjacent_rows = all(unit_masks[adjacent_row] & bit for adjacent_row in ADJACENT_ROWS[index])
+            in_adjacent_cols = all(unit_masks[GRID_SIZE + adjacent_col] & bit for adjacent_col in ADJACENT_COLS[index])
 
-            if value in adjacent_rows[0] and value in adjacent_rows[1] and value in adjacent_cols[0] and value in adjacent_cols[1]:
+            if in_adjacent_rows and in_adjacent_cols:
 
-                self.validator.populate_cell(row_index, col_index, value)
+                self.place_value(index, value)
     
                 return True
 
@@ -247,12 +497,11 @@ class SudokuIteration:
         
         """
 
-        start_row = (row_index // SUBGRID_SIZE) * SUBGRID_SIZE
-        start_col = (col_index // SUBGRID_SIZE) * SUBGRID_SIZE
+        index = row_index * GRID_SIZE + col_index
 
-        adjacent_rows = [self.grid.get_row(start_row + index) for index in range(SUBGRID_SIZE) if (start_row + index) != row_index]
+        adjacent_rows = [self.grid.get_row(adjacent_row) for adjacent_row in ADJACENT_ROWS[index]]
 
-        adjacent_cols = [self.grid.get_col(start_col + index) for index in range(SUBGRID_SIZE) if (start_col + index) != col_index]
+        adjacent_cols = [self.grid.get_col(adjacent_col) for adjacent_col in ADJACENT_COLS[index]]
 
         return adjacent_rows, adjacent_cols
 
@@ -272,12 +521,11 @@ class SudokuIteration:
         
         """
 
-        start_row = (row_index // SUBGRID_SIZE) * SUBGRID_SIZE
-        start_col = (col_index // SUBGRID_SIZE) * SUBGRID_SIZE
+        index = row_index * GRID_SIZE + col_index
 
-        containing_rows = [self.grid.get_row(start_row + index) for index in range(SUBGRID_SIZE)]
+        containing_rows = [self.grid.get_row(containing_row) for containing_row in CONTAINING_ROWS[index]]
 
-        containing_cols = [self.grid.get_col(start_col + index) for index in range(SUBGRID_SIZE)]
+        containing_cols = [self.grid.get_col(containing_col) for containing_col in CONTAINING_COLS[index]]
 
         containing_subgrid = self.grid.get_subgrid(row_index, col_index)
 
@@ -1,10 +1,19 @@
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import random
 
-from app.grid import SudokuGrid
+from app.grid import SudokuGrid, Puzzle
 from app.validator import SudokuValidator
 from app.generator import SudokuGenerator
 from app.recursion import SudokuRecursion
+from app.exact_cover import SudokuExactCover
+from app.stack_search import SudokuStackSearch
 from app.iteration import SudokuIteration
+from app.transform import SudokuTransformer
+from app.events import SudokuEvents, PrintEvents
+from app.canonical import SolutionCache, canonical_form, apply_transformation, invert_transformation
+from app.bank import PuzzleBank
+from app.techniques import Technique
+from app.tables import CELL_COUNT
 from app.utils import print_formatted_grid
 
 from app.library.grids import (
@@ -38,7 +47,20 @@ class SudokuFacade:
     
     """
 
-    def __init__(self, test_grid: List[List[int]] = None):
+    # The available solving engines, selectable through the backend parameter.
+    backends = ("recursion", "exact_cover", "stack_search")
+
+    def __init__(
+
+        self,
+        test_grid: List[List[int]] = None,
+        backend: str = "recursion",
+        rng: random.Random = None,
+        events: SudokuEvents = None,
+        cache: SolutionCache = None,
+        bank: PuzzleBank = None
+
+    ):
 
         """
         Initialises SudokuFacade with an optional test grid.
@@ -49,29 +71,308 @@ class SudokuFacade:
 
                 Defaults to None, which initialises an empty grid.
 
+            backend (str): The solving engine used by the solver and the generator ('recursion', 'exact_cover' or 'stack_search').
+            rng (random.Random, optional): A random number generator shared by every component, for reproducible results.
+
+                Defaults to None, which uses the global random module.
+
+            events (SudokuEvents, optional): A receiver of progress events from the generator and the iterative solver.
+
+                Defaults to None, which ignores them.
+
+            cache (SolutionCache, optional): A cache of solutions by canonical form, checked by solve and possibly shared with other facades.
+
+                Defaults to None, which solves every puzzle.
+
+            bank (PuzzleBank, optional): A bank of pre-generated puzzles served by serve_puzzle, possibly shared with other facades.
+
+                Defaults to None, which generates every puzzle served.
+
+        Raises:
+
+            ValueError: If the backend is not a valid backend.
+
         Attributes:
 
             grid (SudokuGrid): Manages access to the grid.
             validator (SudokuValidator): Validates cell placements and the overall integrity of the grid.
             recursion (SuokduRecursion): Creates or solves the grid using a recursive backtracking algorithm.
+            exact_cover (SudokuExactCover): Creates or solves the grid by modelling it as an exact cover problem.
+            stack_search (SudokuStackSearch): Creates or solves the grid using a backtracking search with an explicit stack.
+            solver (SudokuRecursion, SudokuExactCover or SudokuStackSearch): The solving engine selected by the backend parameter.
+            transformer (SudokuTransformer): Fills an empty grid by transforming a stored complete solution, falling back to the solver for a uniform sample.
             generator (SudokuGenerator): Generates a puzzle by removing cells from the grid according to difficulty level.
             iterative (SudokuIterative): Solves a puzzle using iterative logical deduction techniques.
+            cache (SolutionCache): The solution cache checked by solve, if any.
+            bank (PuzzleBank): The puzzle bank served by serve_puzzle, if any.
         
         """
 
+        if backend not in self.backends:
+
+            raise ValueError(f"Please provide a valid backend (e.g., {' or '.join(self.backends)}).")
+
         self.grid = SudokuGrid(grid=test_grid)
         self.validator = SudokuValidator(self.grid)
-        self.recursion = SudokuRecursion(self.grid, self.validator)
-        self.generator = SudokuGenerator(self.grid, self.validator, self.recursion)
-        self.iteration = SudokuIteration(self.grid, self.validator)
+        self.recursion = SudokuRecursion(self.grid, self.validator, rng)
+        self.exact_cover = SudokuExactCover(self.grid, self.validator, rng)
+        self.stack_search = SudokuStackSearch(self.grid, self.validator, rng)
+        self.solver = getattr(self, backend)
+        self.transformer = SudokuTransformer(self.grid, self.validator, self.solver, rng)
+        self.generator = SudokuGenerator(self.grid, self.validator, self.solver, rng, events)
+        self.iteration = SudokuIteration(self.grid, self.validator, events)
+        self.cache = cache
+        self.bank = bank
+
+    def solve(
+
+        self,
+        techniques: Tuple[Tuple[str, Technique], ...] = None,
+        node_techniques: Tuple[Tuple[str, Technique], ...] = ()
+
+    ) -> bool:
+
+        """
+        Solves the grid by logical deduction, then backtracks over any remaining cells, starting from the deduced candidates.
+
+        If the facade has a solution cache, it is checked first, so a puzzle symmetric to one already solved is not solved again.
+        Naked and hidden singles are propagated first, as they are the cheapest deductions, and any techniques only run on what remains.
+        The search propagates singles again at every node, and keeps every elimination already made, including by earlier calls to candidate_techniques.
+
+        Parameters:
+
+            techniques (Tuple[Tuple[str, Technique], ...]): The techniques applied before searching.
+
+                Defaults to None, which uses every registered technique, in the current ordering of the registry.
+
+            node_techniques (Tuple[Tuple[str, Technique], ...]): Further techniques applied at every search node. Defaults to none.
+
+        Returns:
+
+            bool: True if the grid was solved, otherwise False, in which case the grid is restored.
+        
+        """
+
+        if not self.validator.is_grid_valid():
+
+            return False
+
+        if self.cache is not None:
+
+            canonical, transformation = canonical_form(self.grid.cells)
+
+            solution = self.cache.get(canonical)
+
+            if solution is not None:
+
+                self.grid.cells[:] = apply_transformation(solution, invert_transformation(transformation))
+
+                self.grid.build_masks()
+
+                return True
+
+        candidates = self.iteration.candidates
+
+        candidates.sync()
+
+        snapshot = candidates.snapshot()
+
+        if candidates.propagate_singles() and self.grid.count_empty_cells():
+
+            self.iteration.candidate_techniques(techniques)
+
+        if self.grid.count_empty_cells() == 0 or self.recursion.solve_candidates(candidates, node_techniques):
+
+            if self.cache is not None:
+
+                self.cache.put(canonical, apply_transformation(self.grid.cells, transformation))
+
+            return True
+
+        candidates.restore(snapshot)
+
+        return False
+
+    # BATCH PROCESSING
+
+    def validate_many(self, puzzles: Iterable[Puzzle]) -> Iterator[bool]:
+
+        """
+        Lazily checks a stream of puzzles, loading each one into the grid in turn rather than building a facade per puzzle.
+
+        Parameters:
+
+            puzzles (Iterable[Puzzle]): The puzzles to be checked, in any format accepted by SudokuGrid.load.
+
+        Raises:
+
+            ValueError: If a puzzle is not a valid puzzle format.
+
+        Returns:
+
+            Iterator[bool]: True for every puzzle with no repeated value in any row, column or subgrid, otherwise False.
+        
+        """
+
+        for puzzle in puzzles:
+
+            self.grid.load(puzzle)
+
+            yield self.validator.is_grid_valid()
+
+    def solve_many(
+
+        self,
+        puzzles: Iterable[Puzzle],
+        techniques: Tuple[Tuple[str, Technique], ...] = None,
+        node_techniques: Tuple[Tuple[str, Technique], ...] = ()
+
+    ) -> Iterator[Optional[str]]:
+
+        """
+        Lazily solves a stream of puzzles with solve, loading each one into the grid in turn,
+        so the grid, candidates and solving engines are reused across puzzles.
+
+        Parameters:
+
+            puzzles (Iterable[Puzzle]): The puzzles to be solved, in any format accepted by SudokuGrid.load.
+            techniques (Tuple[Tuple[str, Technique], ...]): The techniques applied before searching, as in solve.
+            node_techniques (Tuple[Tuple[str, Technique], ...]): Further techniques applied at every search node, as in solve.
+
+        Raises:
+
+            ValueError: If a puzzle is not a valid puzzle format.
+
+        Returns:
+
+            Iterator[Optional[str]]: The solution of every puzzle as a string of 81 digits, or None if the puzzle is invalid or unsolvable.
+        
+        """
+
+        for puzzle in puzzles:
+
+            self.grid.load(puzzle)
+
+            yield self.grid.to_string() if self.solve(techniques, node_techniques) else None
+
+    def generate_many(
+
+        self,
+        count: int,
+        target_removal: int = None,
+        difficulty_level: str = None,
+        transform: bool = False
+
+    ) -> Iterator[Dict[str, Union[int, str]]]:
+
+        """
+        Lazily generates puzzles in the grid, one after another, reusing the grid and every component.
+
+        Parameters:
+
+            count (int): The number of puzzles to generate.
+            target_removal (int): The target number of cells to remove from each puzzle.
+            difficulty_level (str): The difficulty level of each puzzle ('easy', 'medium', 'hard' or 'expert').
+            transform (bool): If True, fills each grid by transforming a stored solution, which is much faster than backtracking,
+
+                but only samples the grids symmetric to the stored solutions rather than every solved grid uniformly.
+
+        Raises:
+
+            ValueError: If the number of puzzles is negative, or as raised by SudokuGenerator.generate_puzzle, when called rather than when iterated.
+
+        Returns:
+
+            Iterator[Dict[str, Union[int, str]]]: A record of every puzzle, a dictionary containing:
+
+                "puzzle": The puzzle as a string of 81 digits (str).
+                "solution": The solution as a string of 81 digits (str).
+                "clues": The number of filled cells in the puzzle (int).
+        
+        """
+
+        if not isinstance(count, int) or count < 0:
+
+            raise ValueError(f"{count} must be a non-negative integer.")
+
+        self.generator.validate_arguments(target_removal, difficulty_level)
+
+        return self._generate_many(count, target_removal, difficulty_level, transform)
+
+    def _generate_many(self, count: int, target_removal: int, difficulty_level: str, transform: bool) -> Iterator[Dict[str, Union[int, str]]]:
+
+        """
+        Generates the puzzles of generate_many, once its arguments have been validated.
+
+        Returns:
+
+            Iterator[Dict[str, Union[int, str]]]: A record of every puzzle, as described in generate_many.
+        
+        """
+
+        for _ in range(count):
+
+            self.grid.load(bytes(CELL_COUNT))
+
+            self.transformer.populate_grid(uniform=not transform)
+
+            solution = self.grid.to_string()
+
+            self.generator.generate_puzzle(target_removal=target_removal, difficulty_level=difficulty_level)
+
+            yield {
+
+                "puzzle": self.grid.to_string(),
+                "solution": solution,
+                "clues": CELL_COUNT - self.grid.count_empty_cells()
+
+            }
+
+    def serve_puzzle(self, difficulty_level: str = None, clues: int = None, technique: str = None) -> Optional[Dict[str, Union[int, str]]]:
+
+        """
+        Loads a puzzle into the grid, taken from the puzzle bank through an index lookup, or generated if the bank has no match.
+
+        Parameters:
+
+            difficulty_level (str): The difficulty level of the puzzle ('easy', 'medium', 'hard' or 'expert'), if required.
+            clues (int): The number of clues of the puzzle, if required.
+            technique (str): The hardest technique needed to solve the puzzle, if required.
+
+        Returns:
+
+            Optional[Dict[str, Union[int, str]]]:
+
+                The record of the puzzle, containing at least its "puzzle", "solution" and "clues",
+                or None if the bank has no match and the puzzle cannot be generated on demand,
+
+                which needs a difficulty level and no clue count or technique.
+        
+        """
+
+        if self.bank is not None:
+
+            record = self.bank.take(difficulty_level, clues, technique)
+
+            if record is not None:
+
+                self.grid.load(record["puzzle"])
+
+                return record
+
+        # Generation can only honour a difficulty level, and needs one to know how many cells to remove.
+        if difficulty_level is None or clues is not None or technique is not None:
+
+            return None
 
+        return next(self.generate_many(1, difficulty_level=difficulty_level))
 
 
 if __name__ == "__main__":
 
     print("--------------------")
 
-    sudoku = SudokuFacade()
+    sudoku = SudokuFacade(events=PrintEvents())
 
     sudoku.recursion.populate_grid()
 
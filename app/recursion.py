@@ -1,7 +1,12 @@
+from typing import List, Optional, Tuple
 import random
 
 from app.grid import SudokuGrid
 from app.validator import SudokuValidator
+from app.candidates import SudokuCandidates
+from app.techniques import Technique, apply_techniques
+from app.tables import ALL_DIGITS_MASK, MASK_VALUES, MASK_COUNTS, PEERS, UNITS
+from config.config import GRID_SIZE
 
 class SudokuRecursion:
 
@@ -10,7 +15,10 @@ class SudokuRecursion:
     
     """
 
-    def __init__(self, grid: SudokuGrid, validator: SudokuValidator):
+    # The available strategies for selecting the next empty cell to branch on.
+    branching_strategies = ("first", "mrv")
+
+    def __init__(self, grid: SudokuGrid, validator: SudokuValidator, rng: random.Random = None):
 
         """
         Initialises SudokuRecursion with an instance of the SudokuGrid and SudokuValidator classes.
@@ -19,74 +27,139 @@ class SudokuRecursion:
 
             grid (SudokuGrid): The empty grid to be filled or the partially filled grid to be solved.
             validator (SudokuValidator): Validates grid operations to support the recursive process.
+            rng (random.Random): An optional random number generator, for reproducible results. Defaults to the global random module.
+
+        Attributes:
 
+            nodes_explored (int): The number of search nodes visited by the most recent search, for benchmarking.
+        
         """
 
         self.grid = grid
         self.validator = validator
-        
-        self.nums = list(range(1, 10))
+        self.rng = rng or random
+
+        self.nums = list(range(1, GRID_SIZE + 1))
+
+        self.nodes_explored = 0
 
     # RECURSIVE BACKTRACKING ALGORITHM
 
-    def populate_grid(self) -> bool:
+    def populate_grid(self, branching: str = "first", least_constraining: bool = False, propagate: bool = False) -> bool:
 
         """
         Fills an empty or partially filled grid with a randomised number selection.
 
+        Parameters:
+
+            branching (str): The strategy for selecting the next empty cell ('first' or 'mrv').
+            least_constraining (bool): If True, tries the values that eliminate the fewest peer candidates first.
+            propagate (bool): If True, applies all naked and hidden singles after every placement, undoing them on backtrack.
+
+        Raises:
+
+            ValueError: If the branching strategy is not a valid branching strategy.
+
         Returns:
 
             bool: True if the grid was successfully filled, otherwise False.
         
         """
 
+        self.validate_branching(branching)
+
+        self.nodes_explored = 0
+
+        root_trail = self.propagate_singles() if propagate else []
+
+        if root_trail is None:
+
+            return False
+
+        if self._populate_grid(branching, least_constraining, propagate):
+
+            return True
+
+        self.undo_placements(root_trail)
+
+        return False
+
+    def _populate_grid(self, branching: str, least_constraining: bool, propagate: bool) -> bool:
+
+        """
+        Recursively fills the grid, see populate_grid.
+        
+        """
+
+        self.nodes_explored += 1
+
         # Traversal
-        empty_cell = self.grid.find_next_empty_cell()
+        index = self.select_cell(branching)
 
         # Base case, terminates recursion if no empty cells remain.
-        if not empty_cell:
+        if index is None:
 
             return True
-        
 
 
-        row_index, col_index = empty_cell
 
         nums = self.nums[:]
 
-        random.shuffle(nums)
+        self.rng.shuffle(nums)
+
+        for num in self.order_values(index, nums, least_constraining):
 
-        for num in nums:
+            trail = self.place_value(index, num, propagate)
 
-            if self.validator.populate_cell(row_index, col_index, num):
+            if trail is not None:
 
                 # Recursive step, continues to the next empty cell.
-                if self.populate_grid():
+                if self._populate_grid(branching, least_constraining, propagate):
 
                     return True
-                
+
                 # Backtrack
-                self.grid.reset_cell(row_index, col_index)
+                self.undo_placements(trail)
 
         return False
-    
-    def is_solution_unique(self) -> int:
+
+    def is_solution_unique(self, branching: str = "first", least_constraining: bool = False, propagate: bool = False) -> int:
 
         """
         Checks if the grid has a single unique solution.
 
         Terminates when more than one solution is found.
 
+        Parameters:
+
+            branching (str): The strategy for selecting the next empty cell ('first' or 'mrv').
+            least_constraining (bool): If True, tries the values that eliminate the fewest peer candidates first.
+            propagate (bool): If True, applies all naked and hidden singles after every placement, undoing them on backtrack.
+
+        Raises:
+
+            ValueError: If the branching strategy is not a valid branching strategy.
+
         Returns:
 
             bool: True if the grid has a single unique solution, otherwise False.
         
         """
 
+        self.validate_branching(branching)
+
         if not self.validator.is_grid_valid():
 
             return False
 
+        self.nodes_explored = 0
+
+        root_trail = self.propagate_singles() if propagate else []
+
+        if root_trail is None:
+
+            return False
+
         solutions = 0
 
         def solve_sudoku():
@@ -97,39 +170,41 @@ class SudokuRecursion:
 
                 return False
 
+            self.nodes_explored += 1
+
             # Traversal
-            empty_cell = self.grid.find_next_empty_cell()
+            index = self.select_cell(branching)
 
             # Base case, no empty cells remain.
-            if not empty_cell:
+            if index is None:
 
                 solutions += 1
 
                 # Do not return True; continue backtracking.
                 return
-            
 
 
-            row_index, col_index = empty_cell
 
-            nums = self.nums[:]
-            
-            for num in nums:
+            for num in self.order_values(index, self.nums, least_constraining):
 
-                if self.validator.populate_cell(row_index, col_index, num):
+                trail = self.place_value(index, num, propagate)
+
+                if trail is not None:
 
                     # Recursive step, continue until all potential solutions are fully explored.
                     solve_sudoku()
 
                     # Backtracks, whether a solution is found or not.
-                    self.grid.reset_cell(row_index, col_index)
+                    self.undo_placements(trail)
 
         # Starts the recursive process.
         solve_sudoku()
 
+        self.undo_placements(root_trail)
+
         return solutions == 1
-    
-    def get_total_solutions(self, max_solutions: int = float("inf")) -> int:
+
+    def get_total_solutions(self, max_solutions: int = float("inf"), branching: str = "first", least_constraining: bool = False, propagate: bool = False) -> int:
 
         """
         Returns the total number of valid solutions to the grid.
@@ -139,6 +214,13 @@ class SudokuRecursion:
         Parameters:
 
             max_solutions (int): Limits the number of solutions considering computational overhead.
+            branching (str): The strategy for selecting the next empty cell ('first' or 'mrv').
+            least_constraining (bool): If True, tries the values that eliminate the fewest peer candidates first.
+            propagate (bool): If True, applies all naked and hidden singles after every placement, undoing them on backtrack.
+
+        Raises:
+
+            ValueError: If the branching strategy is not a valid branching strategy.
 
         Returns:
 
@@ -146,52 +228,488 @@ class SudokuRecursion:
         
         """
 
+        self.validate_branching(branching)
+
         if not self.validator.is_grid_valid():
 
             return False
 
+        self.nodes_explored = 0
+
+        root_trail = self.propagate_singles() if propagate else []
+
+        if root_trail is None:
+
+            return 0
+
         solutions = 0
 
         def solve_sudoku():
 
             nonlocal solutions
 
+            self.nodes_explored += 1
+
             # Traversal
-            empty_cell = self.grid.find_next_empty_cell()
+            index = self.select_cell(branching)
 
             # Base case, no empty cells remain.
-            if not empty_cell:
+            if index is None:
 
                 solutions += 1
 
                 # Do not return True; continue backtracking.
                 return
-            
 
 
-            row_index, col_index = empty_cell
 
-            nums = self.nums[:]
-            
-            for num in nums:
+            for num in self.order_values(index, self.nums, least_constraining):
+
+                # Checked before placing, so every placement made is undone on the way back.
+                if solutions >= max_solutions:
 
-                if self.validator.populate_cell(row_index, col_index, num):
+                    return
 
-                    if solutions >= max_solutions:
+                trail = self.place_value(index, num, propagate)
 
-                        return
+                if trail is not None:
 
                     # Recursive step, continue until all potential solutions are fully explored.
                     solve_sudoku()
 
                     # Backtracks, whether a solution is found or not.
-                    self.grid.reset_cell(row_index, col_index)
+                    self.undo_placements(trail)
 
         # Starts the recursive process.
         solve_sudoku()
 
+        self.undo_placements(root_trail)
+
         return solutions
 
+    def is_removal_unique(self, row_index: int, col_index: int, removed_num: int, branching: str = "mrv", propagate: bool = True) -> bool:
+
+        """
+        Checks that a grid with a known unique solution still has a unique solution after one of its cells is emptied.
+
+        Any other solution must place a different value in the emptied cell, so only those values are searched,
+        and the search terminates as soon as any completion is found.
+
+        Parameters:
+
+            row_index (int): The index position of the row of the emptied cell.
+            col_index (int): The index position of the column of the emptied cell.
+            removed_num (int): The value the emptied cell held in the known solution.
+            branching (str): The strategy for selecting the next empty cell ('first' or 'mrv').
+            propagate (bool): If True, applies all naked and hidden singles after every placement, undoing them on backtrack.
+
+        Raises:
+
+            ValueError: If the branching strategy is not a valid branching strategy.
+
+        Returns:
+
+            bool: True if the grid still has a single unique solution, otherwise False.
+        
+        """
+
+        self.validate_branching(branching)
+
+        self.nodes_explored = 0
+
+        index = row_index * GRID_SIZE + col_index
+
+        for num in self.order_values(index, self.nums, False):
+
+            if num == removed_num:
+
+                continue
+
+            trail = self.place_value(index, num, propagate)
+
+            if trail is None:
+
+                continue
+
+            # Any completion with a different value in the emptied cell is a second solution.
+            counterexample = self._find_solution(branching, propagate)
+
+            self.undo_placements(trail)
+
+            if counterexample:
+
+                return False
+
+        return True
+
+    def _find_solution(self, branching: str, propagate: bool) -> bool:
+
+        """
+        Recursively checks if the grid has any solution, restoring the grid before returning.
+
+        Parameters:
+
+            branching (str): The strategy for selecting the next empty cell ('first' or 'mrv').
+            propagate (bool): If True, applies all naked and hidden singles after every placement.
+
+        Returns:
+
+            bool: True if a solution was found, otherwise False.
+        
+        """
+
+        self.nodes_explored += 1
+
+        index = self.select_cell(branching)
+
+        if index is None:
+
+            return True
+
+        for num in self.order_values(index, self.nums, False):
+
+            trail = self.place_value(index, num, propagate)
+
+            if trail is not None:
+
+                found = self._find_solution(branching, propagate)
+
+                self.undo_placements(trail)
+
+                if found:
+
+                    return True
+
+        return False
+
+    # CANDIDATE SEARCH
+
+    def solve_candidates(self, candidates: SudokuCandidates, techniques: Tuple[Tuple[str, Technique], ...] = ()) -> bool:
+
+        """
+        Solves the grid by backtracking over a candidate state, keeping every elimination already made by logical deduction.
+
+        Naked and hidden singles are propagated at every search node, followed by any further techniques,
+        and each branch restores the candidates and grid on failure.
+
+        Parameters:
+
+            candidates (SudokuCandidates): The candidates of the grid, possibly reduced by logical deduction.
+            techniques (Tuple[Tuple[str, Technique], ...]): Further techniques applied at every search node. Defaults to none.
+
+        Returns:
+
+            bool: True if the grid was solved, otherwise False, in which case the candidates and grid are restored.
+        
+        """
+
+        self.nodes_explored = 0
+
+        candidates.sync()
+
+        snapshot = candidates.snapshot()
+
+        if self._solve_candidates(candidates, techniques):
+
+            return True
+
+        candidates.restore(snapshot)
+
+        return False
+
+    def _solve_candidates(self, candidates: SudokuCandidates, techniques: Tuple[Tuple[str, Technique], ...]) -> bool:
+
+        """
+        Recursively solves the grid from a candidate state, leaving the grid solved or the candidates partially reduced.
+
+        Parameters:
+
+            candidates (SudokuCandidates): The candidates of the grid.
+            techniques (Tuple[Tuple[str, Technique], ...]): Further techniques applied at every search node.
+
+        Returns:
+
+            bool: True if the grid was solved, otherwise False.
+        
+        """
+
+        self.nodes_explored += 1
+
+        if not candidates.propagate_singles():
+
+            return False
+
+        if techniques and self.grid.empty_count:
+
+            apply_techniques(candidates, techniques)
+
+            if not candidates.is_consistent():
+
+                return False
+
+        # Base case, no empty cells remain.
+        if not self.grid.empty_count:
+
+            return True
+
+        masks = candidates.masks
+
+        # Branches on the empty cell with the fewest candidates.
+        index = min((index for index, num in enumerate(self.grid.cells) if not num), key=lambda empty_index: MASK_COUNTS[masks[empty_index]])
+
+        for num in MASK_VALUES[masks[index]]:
+
+            snapshot = candidates.snapshot()
+
+            candidates.place(index, num)
+
+            # Recursive step
+            if self._solve_candidates(candidates, techniques):
+
+                return True
+
+            # Backtrack
+            candidates.restore(snapshot)
+
+        return False
+
+    # CONSTRAINT PROPAGATION
+
+    def place_value(self, index: int, num: int, propagate: bool) -> Optional[List[int]]:
+
+        """
+        Attempts to place a number at the specified flat index, optionally followed by all of the singles it forces.
+
+        Parameters:
+
+            index (int): The flat index of the cell in the grid.
+            num (int): The number to be placed, between 1 and 9.
+            propagate (bool): If True, applies all naked and hidden singles after the placement.
+
+        Returns:
+
+            Optional[List[int]]: The flat indices of every cell filled, in placement order, or None if the placement was invalid or led to a contradiction.
+        
+        """
+
+        if not self.validator.populate_cell_at(index, num):
+
+            return None
+
+        if not propagate:
+
+            return [index]
+
+        trail = self.propagate_singles()
+
+        if trail is None:
+
+            self.grid.reset_cell_at(index)
+
+            return None
+
+        trail.insert(0, index)
+
+        return trail
+
+    def undo_placements(self, trail: List[int]) -> None:
+
+        """
+        Resets every cell filled by a placement, in reverse placement order.
+
+        Parameters:
+
+            trail (List[int]): The flat indices of the cells to be reset.
+        
+        """
+
+        for index in reversed(trail):
+
+            self.grid.reset_cell_at(index)
+
+    def propagate_singles(self) -> Optional[List[int]]:
+
+        """
+        Repeatedly fills every naked single and hidden single until no more cells are forced.
+
+        A naked single is an empty cell with only one possible value.
+        A hidden single is a value that has only one possible cell within a row, column or subgrid.
+
+        Returns:
+
+            Optional[List[int]]: The flat indices of every cell filled, in placement order, or None if a contradiction was found.
+
+                On a contradiction, every cell filled during propagation is reset before returning.
+        
+        """
+
+        grid = self.grid
+        cells = grid.cells
+        unit_masks = grid.unit_masks
+
+        trail = []
+
+        placement_made = True
+
+        while placement_made:
+
+            placement_made = False
+
+            # Naked singles
+            for index in grid.get_empty_indices():
+
+                candidate_mask = grid.get_candidate_mask_at(index)
+
+                # Contradiction, the cell has no possible values.
+                if not candidate_mask:
+
+                    self.undo_placements(trail)
+
+                    return None
+
+                if not candidate_mask & (candidate_mask - 1):
+
+                    grid.set_cell_at(index, candidate_mask.bit_length() - 1)
+
+                    trail.append(index)
+
+                    placement_made = True
+
+            # Hidden singles
+            for unit_index, unit in enumerate(UNITS):
+
+                missing_mask = ALL_DIGITS_MASK & ~unit_masks[unit_index]
+
+                if not missing_mask:
+
+                    continue
+
+                # Bitmasks of the values possible in at least one, and in at least two, of the empty cells in the unit.
+                once_mask = 0
+                twice_mask = 0
+
+                for index in unit:
+
+                    if cells[index] == 0:
+
+                        candidate_mask = grid.get_candidate_mask_at(index)
+
+                        twice_mask |= once_mask & candidate_mask
+                        once_mask |= candidate_mask
+
+                # Contradiction, a missing value has no possible cell in the unit.
+                if missing_mask & ~once_mask:
+
+                    self.undo_placements(trail)
+
+                    return None
+
+                hidden_mask = once_mask & ~twice_mask
+
+                while hidden_mask:
+
+                    bit = hidden_mask & -hidden_mask
+
+                    hidden_mask ^= bit
+
+                    for index in unit:
+
+                        if cells[index] == 0 and grid.get_candidate_mask_at(index) & bit:
+
+                            grid.set_cell_at(index, bit.bit_length() - 1)
+
+                            trail.append(index)
+
+                            placement_made = True
+
+                            break
+
+                    # Contradiction, an earlier hidden single in the unit removed the only possible cell for this value.
+                    else:
+
+                        self.undo_placements(trail)
+
+                        return None
+
+        return trail
+
+    # BRANCHING HEURISTICS
+
+    def validate_branching(self, branching: str) -> None:
+
+        """
+        Validates that the branching strategy is a valid branching strategy.
+
+        Parameters:
+
+            branching (str): The strategy for selecting the next empty cell.
+
+        Raises:
+
+            ValueError: If the branching strategy is not a valid branching strategy.
+        
+        """
+
+        if branching not in self.branching_strategies:
+
+            raise ValueError(f"Please provide a valid branching strategy (e.g., {' or '.join(self.branching_strategies)}).")
+
+    def select_cell(self, branching: str) -> int:
+
+        """
+        Selects the next empty cell to branch on.
+
+        The 'first' strategy selects the first empty cell in row-major order.
+        The 'mrv' (minimum remaining values) strategy selects the empty cell with the fewest possible values.
+
+        Parameters:
+
+            branching (str): The strategy for selecting the next empty cell ('first' or 'mrv').
+
+        Returns:
+
+            int: The flat index of the selected empty cell, or None if all cells are full.
+        
+        """
+
+        if branching == "first":
+
+            return self.grid.find_next_empty_index()
+
+        return self.grid.find_most_constrained_index()
+
+    def order_values(self, index: int, nums: List[int], least_constraining: bool) -> List[int]:
+
+        """
+        Returns the possible values for the specified cell, in the order they should be tried.
+
+        Parameters:
+
+            index (int): The flat index of the cell in the grid.
+            nums (List[int]): The values in their default order.
+            least_constraining (bool): If True, orders the values by the number of empty peers that could also hold them, fewest first.
+
+        Returns:
+
+            List[int]: The possible values for the specified cell.
+        
+        """
+
+        candidate_mask = self.grid.get_candidate_mask_at(index)
+
+        values = [num for num in nums if candidate_mask & (1 << num)]
+
+        if not least_constraining or len(values) < 2:
+
+            return values
+
+        peer_masks = [self.grid.get_candidate_mask_at(peer) for peer in PEERS[index] if self.grid.cells[peer] == 0]
+
+        # The sort is stable, so values that are equally constraining keep their default order.
+        return sorted(values, key=lambda num: sum(1 for peer_mask in peer_masks if peer_mask & (1 << num)))
+
+
+
 if __name__ == "__main__":
 
     print("--------------------")
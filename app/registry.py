@@ -0,0 +1,282 @@
+from typing import Callable, Dict, Iterator, Tuple, Union
+import threading
+
+from app.candidates import SudokuCandidates
+
+# A technique searches the candidates, and yields every step it finds without applying any of them.
+Technique = Callable[[SudokuCandidates], Iterator[Dict]]
+
+class TechniqueRegistry:
+
+    """
+    A class to hold the candidate techniques, each with a relative cost, and to order them for the scheduler.
+
+    By default the techniques are ordered by their declared cost, cheapest first.
+    An adaptive registry also records the calls, productive calls and time of every technique,
+    so it can instead order them by their measured time per productive call.
+    A registry with a fixed ordering records nothing, keeping the timer and the lock off the solver's hot path.
+    
+    """
+
+    def __init__(self, adaptive: bool = False, min_samples: int = 20) -> None:
+
+        """
+        Initialises TechniqueRegistry without any techniques.
+
+        Parameters:
+
+            adaptive (bool): If True, records every call and orders the techniques by their measured time per productive call, once sampled.
+            min_samples (int): The number of calls after which a technique's measurements replace its declared cost.
+
+        Attributes:
+
+            techniques (Dict[str, Dict[str, Union[Technique, float, int]]]): The registered techniques, keyed by name, each a dictionary containing:
+
+                "function": The technique itself (Technique).
+                "cost": The declared relative cost of a call (float).
+                "calls": The number of recorded calls (int).
+                "hits": The number of recorded calls that made progress (int).
+                "time": The total time of the recorded calls, in seconds (float).
+
+            lock (threading.Lock): Serialises every change to the techniques, as a registry is shared by every thread.
+        
+        """
+
+        self.adaptive = adaptive
+        self.min_samples = min_samples
+
+        self.techniques = {}
+        self.lock = threading.Lock()
+
+    def register(self, name: str, function: Technique, cost: float) -> None:
+
+        """
+        Registers a technique, replacing any technique already registered under the same name.
+
+        Parameters:
+
+            name (str): The name of the technique, recorded in every step it yields.
+            function (Technique): The technique itself.
+            cost (float): The relative cost of a call, compared to the other registered techniques.
+
+        Raises:
+
+            ValueError: If the cost is not a positive number.
+        
+        """
+
+        if not isinstance(cost, (int, float)) or cost <= 0:
+
+            raise ValueError(f"Please provide a valid cost (e.g., a positive number, not {cost}).")
+
+        with self.lock:
+
+            self.techniques[name] = {"function": function, "cost": cost, "calls": 0, "hits": 0, "time": 0.0}
+
+    def unregister(self, name: str) -> None:
+
+        """
+        Removes a registered technique.
+
+        Raises:
+
+            ValueError: If no technique is registered under the name.
+        
+        """
+
+        with self.lock:
+
+            if name not in self.techniques:
+
+                raise ValueError(f"Please provide a registered technique (e.g., {', '.join(self.techniques)}).")
+
+            del self.techniques[name]
+
+    def ordered(self, adaptive: bool = None) -> Tuple[Tuple[str, Technique], ...]:
+
+        """
+        Returns the registered techniques in the order the scheduler should try them, cheapest first.
+
+        Parameters:
+
+            adaptive (bool): If True, orders by measured time per productive call, and if False, by declared cost.
+
+                Defaults to None, which uses the adaptive attribute.
+
+        Returns:
+
+            Tuple[Tuple[str, Technique], ...]: The names and functions of the techniques.
+        
+        """
+
+        if adaptive is None:
+
+            adaptive = self.adaptive
+
+        with self.lock:
+
+            techniques = self.techniques
+
+            if adaptive:
+
+                unit_time = self.get_unit_time()
+
+                names = sorted(techniques, key=lambda name: (self.get_expected_time(name, unit_time), techniques[name]["cost"]))
+
+            else:
+
+                names = sorted(techniques, key=lambda name: techniques[name]["cost"])
+
+            return tuple((name, techniques[name]["function"]) for name in names)
+
+    def get_unit_time(self) -> float:
+
+        """
+        Returns the measured time per unit of declared cost, across the techniques with enough recorded calls.
+
+        Returns:
+
+            float: The time per unit of cost, in seconds, or 0.0 if no technique has enough recorded calls.
+        
+        """
+
+        sampled = [entry for entry in self.techniques.values() if entry["calls"] >= self.min_samples]
+
+        total_cost = sum(entry["cost"] * entry["calls"] for entry in sampled)
+
+        return sum(entry["time"] for entry in sampled) / total_cost if total_cost else 0.0
+
+    def get_expected_time(self, name: str, unit_time: float) -> float:
+
+        """
+        Returns the expected time a technique takes to make progress, its time per call divided by its hit rate.
+
+        A technique with too few recorded calls is estimated from its declared cost, and assumed to be productive.
+
+        Parameters:
+
+            name (str): The name of the technique.
+            unit_time (float): The time per unit of declared cost, as returned by get_unit_time.
+
+        Returns:
+
+            float: The expected time per productive call, in seconds, or the declared cost if nothing has been measured.
+        
+        """
+
+        entry = self.techniques[name]
+
+        if entry["calls"] < self.min_samples or not unit_time:
+
+            return entry["cost"] * (unit_time or 1.0)
+
+        # Laplace smoothing keeps a technique that has never made progress finite, but late.
+        hit_rate = (entry["hits"] + 1) / (entry["calls"] + 2)
+
+        return entry["time"] / entry["calls"] / hit_rate
+
+    def record(self, name: str, hit: bool, elapsed: float) -> None:
+
+        """
+        Records a call of a technique.
+
+        Parameters:
+
+            name (str): The name of the technique.
+            hit (bool): True if the call made progress.
+            elapsed (float): The time taken by the call, in seconds.
+        
+        """
+
+        entry = self.techniques.get(name)
+
+        if entry is not None:
+
+            with self.lock:
+
+                entry["calls"] += 1
+                entry["hits"] += hit
+                entry["time"] += elapsed
+
+    def get_stats(self) -> Dict[str, Dict[str, Union[float, int]]]:
+
+        """
+        Returns the recorded measurements of every technique.
+
+        Returns:
+
+            Dict[str, Dict[str, Union[float, int]]]: A dictionary where the keys are technique names and the values are nested dictionaries containing:
+
+                "cost": The declared relative cost (float).
+                "calls": The number of recorded calls (int).
+                "hits": The number of recorded calls that made progress (int).
+                "hit_rate": The proportion of recorded calls that made progress (float).
+                "time": The total time of the recorded calls, in seconds (float).
+        
+        """
+
+        with self.lock:
+
+            return {
+
+                name: {
+
+                    "cost": entry["cost"],
+                    "calls": entry["calls"],
+                    "hits": entry["hits"],
+                    "hit_rate": entry["hits"] / entry["calls"] if entry["calls"] else 0.0,
+                    "time": entry["time"]
+
+                }
+                for name, entry in self.techniques.items()
+
+            }
+
+    def reset_stats(self) -> None:
+
+        """
+        Discards the recorded measurements of every technique.
+        
+        """
+
+        with self.lock:
+
+            for entry in self.techniques.values():
+
+                entry["calls"] = 0
+                entry["hits"] = 0
+                entry["time"] = 0.0
+
+# The registry used by default, holding the built-in techniques of app.techniques and any registered by other modules.
+REGISTRY: TechniqueRegistry = TechniqueRegistry()
+
+def register_technique(name: str = None, cost: float = 1.0, registry: TechniqueRegistry = None) -> Callable[[Technique], Technique]:
+
+    """
+    Returns a decorator that registers a technique, so techniques can be added without editing the solver.
+
+    Parameters:
+
+        name (str): The name of the technique. Defaults to None, which uses the name of the function.
+        cost (float): The relative cost of a call. The built-in techniques range from 1, for naked singles, to 20, for Swordfish.
+        registry (TechniqueRegistry): The registry to register with. Defaults to REGISTRY.
+
+    Returns:
+
+        Callable[[Technique], Technique]: A decorator that registers the technique and returns it unchanged.
+    
+    """
+
+    def decorator(function: Technique) -> Technique:
+
+        (registry or REGISTRY).register(name or function.__name__, function, cost)
+
+        return function
+
+    return decorator
+
+
+
+if __name__ == "__main__":
+
+    print("--------------------")
@@ -0,0 +1,499 @@
+from typing import BinaryIO, Iterable, Iterator, List, Union
+
+from app.grid import ASCII_DIGITS, CELL_VALUES
+from app.tables import CELL_COUNT
+from config.config import GRID_SIZE
+
+# The size of a packed record, two cells per byte with the last low nibble unused.
+PACKED_SIZE: int = (CELL_COUNT + 1) // 2
+
+# Translation tables moving a cell value into the high nibble, and extracting the high and low nibbles of a packed byte.
+SHIFT_HIGH: bytes = bytes((value << 4) & 0xFF for value in range(256))
+HIGH_NIBBLES: bytes = bytes(value >> 4 for value in range(256))
+LOW_NIBBLES: bytes = bytes(value & 0x0F for value in range(256))
+
+# Every valid cell value, deleted from a batch of cells to find any invalid value without iterating over it in Python.
+CELL_BYTES: bytes = bytes(range(GRID_SIZE + 1))
+
+# The characters that may be written for an empty cell.
+BLANKS = (b"0", b".")
+
+# The number of bytes read or written at a time by the bulk readers and writers.
+CHUNK_SIZE: int = 1 << 20
+
+def validate_cells(cells: bytes) -> None:
+
+    """
+    Validates that the cells hold 81 values between 0 and 9.
+
+    Parameters:
+
+        cells (bytes): The cells to be validated, in row-major order.
+
+    Raises:
+
+        ValueError: If the cells are not a valid puzzle.
+    
+    """
+
+    if len(cells) != CELL_COUNT or max(cells) > GRID_SIZE:
+
+        raise ValueError(f"Please provide a valid puzzle (e.g., {CELL_COUNT} values between 0 and {GRID_SIZE}, with 0 for every empty cell).")
+
+def validate_blank(blank: bytes) -> None:
+
+    """
+    Validates that the character written for an empty cell is '0' or '.'.
+
+    Parameters:
+
+        blank (bytes): The character to be validated.
+
+    Raises:
+
+        ValueError: If the character is not '0' or '.'.
+    
+    """
+
+    if blank not in BLANKS:
+
+        raise ValueError("Please provide a valid blank character (e.g., '0' or '.').")
+
+# STRING FORMAT
+
+def encode_string(cells: bytes, blank: str = "0") -> str:
+
+    """
+    Encodes the cells as a string of 81 characters in row-major order.
+
+    Parameters:
+
+        cells (bytes): The cells to be encoded.
+        blank (str): The character written for every empty cell, '0' or '.'.
+
+    Raises:
+
+        ValueError: If the cells are not a valid puzzle, or the blank character is not '0' or '.'.
+
+    Returns:
+
+        str: The encoded cells.
+    
+    """
+
+    return encode_line(cells, blank.encode("ascii", "replace")).decode("ascii")
+
+def decode_string(text: Union[str, bytes]) -> bytes:
+
+    """
+    Decodes a string of 81 characters in row-major order, with '0' or '.' for every empty cell.
+
+    Parameters:
+
+        text (Union[str, bytes]): The string to be decoded, surrounding whitespace aside.
+
+    Raises:
+
+        ValueError: If the string is not a valid puzzle.
+
+    Returns:
+
+        bytes: The decoded cells.
+    
+    """
+
+    if isinstance(text, str):
+
+        text = text.encode("latin-1", "replace")
+
+    cells = text.strip().translate(CELL_VALUES)
+
+    validate_cells(cells)
+
+    return cells
+
+def encode_line(cells: bytes, blank: bytes = b"0") -> bytes:
+
+    """
+    Encodes the cells as a line of 81 ASCII characters, without a line ending.
+
+    Parameters:
+
+        cells (bytes): The cells to be encoded.
+        blank (bytes): The character written for every empty cell, b'0' or b'.'.
+
+    Raises:
+
+        ValueError: If the cells are not a valid puzzle, or the blank character is not '0' or '.'.
+
+    Returns:
+
+        bytes: The encoded cells.
+    
+    """
+
+    validate_blank(blank)
+
+    validate_cells(cells)
+
+    line = bytes(cells).translate(ASCII_DIGITS)
+
+    return line if blank == b"0" else line.replace(b"0", blank)
+
+def encode_lines(puzzles: List[bytes], blank: bytes = b"0") -> bytes:
+
+    """
+    Encodes puzzles as consecutive 81-character lines, each ending with '\n', translating and validating them all at once.
+
+    Parameters:
+
+        puzzles (List[bytes]): The cells of every puzzle.
+        blank (bytes): The character written for every empty cell, b'0' or b'.'.
+
+    Raises:
+
+        ValueError: If any puzzle is not a valid puzzle.
+
+    Returns:
+
+        bytes: The encoded lines.
+    
+    """
+
+    if not puzzles:
+
+        return b""
+
+    cells = b"".join(puzzles)
+
+    # Any other value would be written as a control character, possibly a line ending splitting the record.
+    if set(map(len, puzzles)) != {CELL_COUNT} or cells.translate(None, CELL_BYTES):
+
+        raise ValueError(f"Please provide valid puzzles (e.g., {CELL_COUNT} values between 0 and {GRID_SIZE} each).")
+
+    text = cells.translate(ASCII_DIGITS)
+
+    if blank != b"0":
+
+        text = text.replace(b"0", blank)
+
+    # Each position of every line is copied for the whole batch at once, followed by the line endings.
+    lines = bytearray(len(puzzles) * (CELL_COUNT + 1))
+
+    for position in range(CELL_COUNT):
+
+        lines[position::CELL_COUNT + 1] = text[position::CELL_COUNT]
+
+    lines[CELL_COUNT::CELL_COUNT + 1] = b"\n" * len(puzzles)
+
+    return bytes(lines)
+
+def read_strings(file: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+
+    """
+    Streams the puzzles of a file of 81-character lines, reading a chunk of the file at a time.
+
+    Blank lines are skipped. A line may end with '\n' or '\r\n'.
+
+    Parameters:
+
+        file (BinaryIO): The file to be read, opened in binary mode.
+        chunk_size (int): The number of bytes read at a time.
+
+    Raises:
+
+        ValueError: If a line is not a valid puzzle.
+
+    Returns:
+
+        Iterator[bytes]: The cells of every puzzle, ready for SudokuGrid.load.
+    
+    """
+
+    remainder = b""
+
+    while True:
+
+        chunk = file.read(chunk_size)
+
+        if not chunk:
+
+            break
+
+        lines = (remainder + chunk).split(b"\n")
+
+        # The last line may continue in the next chunk.
+        remainder = lines.pop()
+
+        for line in lines:
+
+            if line.strip():
+
+                yield decode_string(line)
+
+    if remainder.strip():
+
+        yield decode_string(remainder)
+
+def write_strings(file: BinaryIO, puzzles: Iterable[bytes], blank: bytes = b"0", chunk_size: int = CHUNK_SIZE) -> int:
+
+    """
+    Writes puzzles as 81-character lines, joining them into chunks to limit the number of writes.
+
+    Parameters:
+
+        file (BinaryIO): The file to be written, opened in binary mode.
+        puzzles (Iterable[bytes]): The cells of every puzzle.
+        blank (bytes): The character written for every empty cell, b'0' or b'.'.
+        chunk_size (int): The approximate number of bytes written at a time.
+
+    Raises:
+
+        ValueError: If any puzzle is not a valid puzzle, or the blank character is not '0' or '.'.
+
+    Returns:
+
+        int: The number of puzzles written.
+    
+    """
+
+    validate_blank(blank)
+
+    lines_per_chunk = max(1, chunk_size // (CELL_COUNT + 1))
+
+    batch = []
+    count = 0
+
+    for cells in puzzles:
+
+        batch.append(cells)
+
+        if len(batch) == lines_per_chunk:
+
+            file.write(encode_lines(batch, blank))
+
+            count += len(batch)
+            batch = []
+
+    if batch:
+
+        file.write(encode_lines(batch, blank))
+
+        count += len(batch)
+
+    return count
+
+# PACKED FORMAT
+
+def pack(cells: bytes) -> bytes:
+
+    """
+    Packs the cells into a 41-byte record, two cells per byte, the first in the high nibble.
+
+    Parameters:
+
+        cells (bytes): The cells to be packed.
+
+    Returns:
+
+        bytes: The packed record.
+    
+    """
+
+    return pack_many([cells])
+
+def unpack(record: bytes) -> bytes:
+
+    """
+    Unpacks a 41-byte record into cells.
+
+    Parameters:
+
+        record (bytes): The record to be unpacked, as returned by pack.
+
+    Raises:
+
+        ValueError: If the record is not a valid packed puzzle.
+
+    Returns:
+
+        bytes: The unpacked cells.
+    
+    """
+
+    if len(record) != PACKED_SIZE:
+
+        raise ValueError(f"Please provide a valid packed puzzle (e.g., {PACKED_SIZE} bytes).")
+
+    return next(unpack_many(record))
+
+def pack_many(puzzles: Iterable[bytes]) -> bytes:
+
+    """
+    Packs many puzzles into consecutive records at once, shifting and combining the nibbles of the whole batch in a few operations.
+
+    Parameters:
+
+        puzzles (Iterable[bytes]): The cells of every puzzle.
+
+    Raises:
+
+        ValueError: If any puzzle is not a valid puzzle.
+
+    Returns:
+
+        bytes: The packed records.
+    
+    """
+
+    puzzles = list(puzzles)
+
+    if not puzzles:
+
+        return b""
+
+    # A padding cell after every puzzle gives each one an even number of nibbles.
+    cells = b"\0".join(puzzles) + b"\0"
+
+    if any(len(puzzle) != CELL_COUNT for puzzle in puzzles) or max(cells) > GRID_SIZE:
+
+        raise ValueError(f"Please provide valid puzzles (e.g., {CELL_COUNT} values between 0 and {GRID_SIZE} each).")
+
+    high = int.from_bytes(cells[0::2].translate(SHIFT_HIGH), "big")
+    low = int.from_bytes(cells[1::2], "big")
+
+    return (high | low).to_bytes(len(cells) // 2, "big")
+
+def unpack_many(records: bytes) -> Iterator[bytes]:
+
+    """
+    Unpacks consecutive records, splitting the nibbles of the whole batch in a few operations.
+
+    Parameters:
+
+        records (bytes): The packed records, a multiple of 41 bytes.
+
+    Raises:
+
+        ValueError: If the records are not valid packed puzzles.
+
+    Returns:
+
+        Iterator[bytes]: The cells of every puzzle.
+    
+    """
+
+    if len(records) % PACKED_SIZE:
+
+        raise ValueError(f"Please provide valid packed puzzles (e.g., a multiple of {PACKED_SIZE} bytes).")
+
+    nibbles = bytearray(len(records) * 2)
+
+    nibbles[0::2] = records.translate(HIGH_NIBBLES)
+    nibbles[1::2] = records.translate(LOW_NIBBLES)
+
+    if nibbles and max(nibbles) > GRID_SIZE:
+
+        raise ValueError(f"Please provide valid packed puzzles (e.g., {CELL_COUNT} values between 0 and {GRID_SIZE} each).")
+
+    view = memoryview(nibbles)
+
+    for start in range(0, len(nibbles), PACKED_SIZE * 2):
+
+        yield bytes(view[start:start + CELL_COUNT])
+
+def read_packed(file: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+
+    """
+    Streams the puzzles of a file of packed records, reading a whole number of records at a time.
+
+    Parameters:
+
+        file (BinaryIO): The file to be read, opened in binary mode.
+        chunk_size (int): The approximate number of bytes read at a time.
+
+    Raises:
+
+        ValueError: If the file does not hold a whole number of valid records.
+
+    Returns:
+
+        Iterator[bytes]: The cells of every puzzle, ready for SudokuGrid.load.
+    
+    """
+
+    chunk_size = max(1, chunk_size // PACKED_SIZE) * PACKED_SIZE
+
+    remainder = b""
+
+    while True:
+
+        chunk = file.read(chunk_size)
+
+        if not chunk:
+
+            break
+
+        records = remainder + chunk
+
+        # A short read may end partway through a record, which continues in the next chunk.
+        whole = len(records) - len(records) % PACKED_SIZE
+
+        remainder = records[whole:]
+
+        yield from unpack_many(records[:whole])
+
+    if remainder:
+
+        raise ValueError(f"Please provide valid packed puzzles (e.g., a multiple of {PACKED_SIZE} bytes).")
+
+def write_packed(file: BinaryIO, puzzles: Iterable[bytes], chunk_size: int = CHUNK_SIZE) -> int:
+
+    """
+    Writes puzzles as packed records, packing and writing them a chunk at a time.
+
+    Parameters:
+
+        file (BinaryIO): The file to be written, opened in binary mode.
+        puzzles (Iterable[bytes]): The cells of every puzzle.
+        chunk_size (int): The approximate number of bytes written at a time.
+
+    Raises:
+
+        ValueError: If any puzzle is not a valid puzzle.
+
+    Returns:
+
+        int: The number of puzzles written.
+    
+    """
+
+    records_per_chunk = max(1, chunk_size // PACKED_SIZE)
+
+    batch = []
+    count = 0
+
+    for cells in puzzles:
+
+        batch.append(cells)
+
+        if len(batch) == records_per_chunk:
+
+            file.write(pack_many(batch))
+
+            count += len(batch)
+            batch = []
+
+    if batch:
+
+        file.write(pack_many(batch))
+
+        count += len(batch)
+
+    return count
+
+
+
+if __name__ == "__main__":
+
+    print("--------------------")
@@ -0,0 +1,404 @@
+from typing import Iterator
+import random
+
+from app.grid import SudokuGrid
+from app.validator import SudokuValidator
+from app.tables import MASK_VALUES
+from config.config import GRID_SIZE
+
+class SearchState:
+
+    """
+    A class to hold the progress of a SudokuStackSearch, so the search can be inspected, paused and resumed.
+
+    The partial assignment itself lives in the grid, which must not be modified while the search is paused.
+
+    Attributes:
+
+        stack (List[Tuple[int, Iterator[int]]]): A frame for every cell currently filled by the search, each the flat index of the cell and an iterator of the values still to be tried.
+        max_solutions (int): The number of solutions at which the search stops.
+        solutions (int): The number of solutions found so far.
+        solution (bytes): The cells of the first solution found, or None if no solution has been found.
+        nodes_explored (int): The number of search nodes visited so far.
+        finished (bool): True once the search space is exhausted or the maximum number of solutions is reached.
+    
+    """
+
+    __slots__ = ("stack", "branching", "shuffle", "max_solutions", "solutions", "solution", "nodes_explored", "finished")
+
+    def __init__(self, branching: str, shuffle: bool, max_solutions: int) -> None:
+
+        self.stack = []
+        self.branching = branching
+        self.shuffle = shuffle
+        self.max_solutions = max_solutions
+        self.solutions = 0
+        self.solution = None
+        self.nodes_explored = 0
+        self.finished = False
+
+    @property
+    def depth(self) -> int:
+
+        """
+        Returns the number of cells currently filled by the search.
+        
+        """
+
+        return len(self.stack)
+
+class SudokuStackSearch:
+
+    """
+    A class to fill or solve a Sudoku grid using a backtracking search driven by an explicit stack, rather than recursion.
+    
+    """
+
+    # The available strategies for selecting the next empty cell to branch on.
+    branching_strategies = ("first", "mrv")
+
+    def __init__(self, grid: SudokuGrid, validator: SudokuValidator, rng: random.Random = None):
+
+        """
+        Initialises SudokuStackSearch with an instance of the SudokuGrid and SudokuValidator classes.
+
+        Parameters:
+
+            grid (SudokuGrid): The empty grid to be filled or the partially filled grid to be solved.
+            validator (SudokuValidator): Validates the grid before searching.
+            rng (random.Random): An optional random number generator, for reproducible results. Defaults to the global random module.
+
+        Attributes:
+
+            nodes_explored (int): The number of search nodes visited by the most recent search, for benchmarking.
+        
+        """
+
+        self.grid = grid
+        self.validator = validator
+        self.rng = rng or random
+
+        self.nodes_explored = 0
+
+    # EXPLICIT STACK BACKTRACKING ALGORITHM
+
+    def populate_grid(self, branching: str = "mrv") -> bool:
+
+        """
+        Fills an empty or partially filled grid with a randomised number selection.
+
+        Parameters:
+
+            branching (str): The strategy for selecting the next empty cell ('first' or 'mrv').
+
+        Returns:
+
+            bool: True if the grid was successfully filled, otherwise False.
+        
+        """
+
+        if not self.validator.is_grid_valid():
+
+            return False
+
+        state = self.run(self.start(max_solutions=1, branching=branching, shuffle=True))
+
+        # The grid is left filled with the solution that ended the search.
+        return state.solutions == 1
+
+    def is_solution_unique(self, branching: str = "mrv") -> bool:
+
+        """
+        Checks if the grid has a single unique solution.
+
+        Terminates when more than one solution is found.
+
+        Parameters:
+
+            branching (str): The strategy for selecting the next empty cell ('first' or 'mrv').
+
+        Returns:
+
+            bool: True if the grid has a single unique solution, otherwise False.
+        
+        """
+
+        if not self.validator.is_grid_valid():
+
+            return False
+
+        state = self.run(self.start(max_solutions=2, branching=branching))
+
+        self.abandon(state)
+
+        return state.solutions == 1
+
+    def get_total_solutions(self, max_solutions: int = float("inf"), branching: str = "mrv") -> int:
+
+        """
+        Returns the total number of valid solutions to the grid.
+
+        Continues counting until all potential solutions are fully explored.
+
+        Parameters:
+
+            max_solutions (int): Limits the number of solutions considering computational overhead.
+            branching (str): The strategy for selecting the next empty cell ('first' or 'mrv').
+
+        Returns:
+
+            int: The total number of valid solutions to the grid.
+        
+        """
+
+        if not self.validator.is_grid_valid():
+
+            return False
+
+        state = self.run(self.start(max_solutions=max_solutions, branching=branching))
+
+        self.abandon(state)
+
+        return state.solutions
+
+    def is_removal_unique(self, row_index: int, col_index: int, removed_num: int, branching: str = "mrv") -> bool:
+
+        """
+        Checks that a grid with a known unique solution still has a unique solution after one of its cells is emptied.
+
+        Any other solution must place a different value in the emptied cell, so only those values are searched,
+        and the search terminates as soon as any completion is found.
+
+        Parameters:
+
+            row_index (int): The index position of the row of the emptied cell.
+            col_index (int): The index position of the column of the emptied cell.
+            removed_num (int): The value the emptied cell held in the known solution.
+            branching (str): The strategy for selecting the next empty cell ('first' or 'mrv').
+
+        Returns:
+
+            bool: True if the grid still has a single unique solution, otherwise False.
+        
+        """
+
+        index = row_index * GRID_SIZE + col_index
+
+        for num in MASK_VALUES[self.grid.get_candidate_mask_at(index)]:
+
+            if num == removed_num:
+
+                continue
+
+            self.grid.set_cell_at(index, num)
+
+            state = self.run(self.start(max_solutions=1, branching=branching))
+
+            self.abandon(state)
+
+            self.grid.reset_cell_at(index)
+
+            # Any completion with a different value in the emptied cell is a second solution.
+            if state.solutions:
+
+                return False
+
+        return True
+
+    # SEARCH STATE
+
+    def start(self, max_solutions: int = float("inf"), branching: str = "mrv", shuffle: bool = False) -> SearchState:
+
+        """
+        Creates the state for a new search of the current grid, without exploring any nodes.
+
+        Parameters:
+
+            max_solutions (int): The number of solutions at which the search stops.
+            branching (str): The strategy for selecting the next empty cell ('first' or 'mrv').
+            shuffle (bool): If True, tries the values for each cell in a random order.
+
+        Raises:
+
+            ValueError: If the branching strategy is not a valid branching strategy.
+
+        Returns:
+
+            SearchState: The state of the new search, to be advanced with run.
+        
+        """
+
+        if branching not in self.branching_strategies:
+
+            raise ValueError(f"Please provide a valid branching strategy (e.g., {' or '.join(self.branching_strategies)}).")
+
+        state = SearchState(branching, shuffle, max_solutions)
+
+        if max_solutions < 1:
+
+            state.finished = True
+
+            return state
+
+        index = self.select_cell(branching)
+
+        # The grid is already complete, and is its own single solution.
+        if index is None:
+
+            state.solutions = 1
+            state.solution = bytes(self.grid.cells)
+            state.finished = True
+
+        else:
+
+            state.stack.append((index, self.get_values(index, shuffle)))
+
+        return state
+
+    def run(self, state: SearchState, max_nodes: int = None) -> SearchState:
+
+        """
+        Advances a search until it is finished, or until the maximum number of nodes has been explored.
+
+        A paused search resumes from the same point when run is called again.
+
+        Parameters:
+
+            state (SearchState): The state returned by start, or by a previous call to run.
+            max_nodes (int): The number of nodes to explore before pausing, or None to run until finished.
+
+        Returns:
+
+            SearchState: The advanced state of the search.
+        
+        """
+
+        grid = self.grid
+        cells = grid.cells
+        stack = state.stack
+
+        nodes_budget = float("inf") if max_nodes is None else max_nodes
+
+        while stack and not state.finished and nodes_budget > 0:
+
+            index, values = stack[-1]
+
+            # Backtracks the value tried on the previous visit to this frame.
+            if cells[index]:
+
+                grid.reset_cell_at(index)
+
+            # The values were possible when the frame was pushed, and the preceding frames are unchanged since.
+            num = next(values, None)
+
+            if num is None:
+
+                stack.pop()
+
+                continue
+
+            grid.set_cell_at(index, num)
+
+            state.nodes_explored += 1
+            nodes_budget -= 1
+
+            next_index = self.select_cell(state.branching)
+
+            # Base case, no empty cells remain.
+            if next_index is None:
+
+                state.solutions += 1
+
+                if state.solution is None:
+
+                    state.solution = bytes(cells)
+
+                if state.solutions >= state.max_solutions:
+
+                    state.finished = True
+
+                continue
+
+            stack.append((next_index, self.get_values(next_index, state.shuffle)))
+
+        if not stack:
+
+            state.finished = True
+
+        self.nodes_explored = state.nodes_explored
+
+        return state
+
+    def abandon(self, state: SearchState) -> None:
+
+        """
+        Ends a search, resetting every cell filled by it so the grid is restored to its state before the search.
+
+        Parameters:
+
+            state (SearchState): The state of the search to be abandoned.
+        
+        """
+
+        while state.stack:
+
+            index, _ = state.stack.pop()
+
+            self.grid.reset_cell_at(index)
+
+        state.finished = True
+
+    # BRANCHING
+
+    def select_cell(self, branching: str) -> int:
+
+        """
+        Selects the next empty cell to branch on.
+
+        Parameters:
+
+            branching (str): The strategy for selecting the next empty cell ('first' or 'mrv').
+
+        Returns:
+
+            int: The flat index of the selected empty cell, or None if all cells are full.
+        
+        """
+
+        if branching == "first":
+
+            return self.grid.find_next_empty_index()
+
+        return self.grid.find_most_constrained_index()
+
+    def get_values(self, index: int, shuffle: bool) -> Iterator[int]:
+
+        """
+        Returns an iterator of the possible values for the specified cell.
+
+        Parameters:
+
+            index (int): The flat index of the cell in the grid.
+            shuffle (bool): If True, the values are returned in a random order.
+
+        Returns:
+
+            Iterator[int]: An iterator of the possible values for the specified cell.
+        
+        """
+
+        values = MASK_VALUES[self.grid.get_candidate_mask_at(index)]
+
+        if shuffle:
+
+            values = list(values)
+
+            self.rng.shuffle(values)
+
+        return iter(values)
+
+
+
+if __name__ == "__main__":
+
+    print("--------------------")
@@ -0,0 +1,125 @@
+from typing import Tuple
+
+from config.config import GRID_SIZE, SUBGRID_SIZE
+
+# Lookup tables shared by all components, built once at import from the configured grid dimensions.
+
+# Cells are identified by their flat index in row-major order, (row_index * GRID_SIZE) + col_index.
+# Units are identified by their unit index, with rows first, then columns, then subgrids in row-major order.
+
+# The total number of cells in the grid.
+CELL_COUNT: int = GRID_SIZE * GRID_SIZE
+
+# The total number of units in the grid.
+UNIT_COUNT: int = 3 * GRID_SIZE
+
+# Bitmask with a set bit for every cell, where bit n represents the cell at flat index n.
+ALL_CELLS_MASK: int = (1 << CELL_COUNT) - 1
+
+# Bitmask with a set bit for every valid digit, where bit n represents the digit n.
+ALL_DIGITS_MASK: int = ((1 << GRID_SIZE) - 1) << 1
+
+# The digits represented by every possible bitmask, indexed by the bitmask itself.
+MASK_VALUES: Tuple[Tuple[int, ...], ...] = tuple(
+
+    tuple(num for num in range(1, GRID_SIZE + 1) if mask & (1 << num)) for mask in range(1 << (GRID_SIZE + 1))
+
+)
+
+# The number of digits represented by every possible bitmask, indexed by the bitmask itself.
+MASK_COUNTS: Tuple[int, ...] = tuple(len(values) for values in MASK_VALUES)
+
+# The row and column indices of every cell.
+CELL_COORDINATES: Tuple[Tuple[int, int], ...] = tuple(divmod(index, GRID_SIZE) for index in range(CELL_COUNT))
+
+# The row, column and subgrid containing every cell.
+ROW_OF: Tuple[int, ...] = tuple(row_index for row_index, _ in CELL_COORDINATES)
+
+COL_OF: Tuple[int, ...] = tuple(col_index for _, col_index in CELL_COORDINATES)
+
+SUBGRID_OF: Tuple[int, ...] = tuple(
+
+    (row_index // SUBGRID_SIZE) * SUBGRID_SIZE + col_index // SUBGRID_SIZE for row_index, col_index in CELL_COORDINATES
+
+)
+
+# The row and column indices of the top-left cell of every subgrid.
+SUBGRID_ORIGINS: Tuple[Tuple[int, int], ...] = tuple(
+
+    (row_index, col_index) for row_index in range(0, GRID_SIZE, SUBGRID_SIZE) for col_index in range(0, GRID_SIZE, SUBGRID_SIZE)
+
+)
+
+# The cell indices of every row, column and subgrid.
+ROW_INDICES: Tuple[Tuple[int, ...], ...] = tuple(
+
+    tuple(index for index in range(CELL_COUNT) if ROW_OF[index] == row_index) for row_index in range(GRID_SIZE)
+
+)
+
+COL_INDICES: Tuple[Tuple[int, ...], ...] = tuple(
+
+    tuple(index for index in range(CELL_COUNT) if COL_OF[index] == col_index) for col_index in range(GRID_SIZE)
+
+)
+
+SUBGRID_INDICES: Tuple[Tuple[int, ...], ...] = tuple(
+
+    tuple(index for index in range(CELL_COUNT) if SUBGRID_OF[index] == subgrid_index) for subgrid_index in range(GRID_SIZE)
+
+)
+
+# The cell indices of all 27 units.
+UNITS: Tuple[Tuple[int, ...], ...] = ROW_INDICES + COL_INDICES + SUBGRID_INDICES
+
+# The unit indices of the row, column and subgrid containing every cell.
+CELL_UNITS: Tuple[Tuple[int, int, int], ...] = tuple(
+
+    (ROW_OF[index], GRID_SIZE + COL_OF[index], 2 * GRID_SIZE + SUBGRID_OF[index]) for index in range(CELL_COUNT)
+
+)
+
+# The cell indices of the 20 peers of every cell, the cells sharing a row, column or subgrid, excluding the cell itself.
+PEERS: Tuple[Tuple[int, ...], ...] = tuple(
+
+    tuple(sorted((set(UNITS[unit_a]) | set(UNITS[unit_b]) | set(UNITS[unit_c])) - {index}))
+    for index, (unit_a, unit_b, unit_c) in enumerate(CELL_UNITS)
+
+)
+
+# The row indices of the band, and the column indices of the stack, containing every cell.
+CONTAINING_ROWS: Tuple[Tuple[int, ...], ...] = tuple(
+
+    tuple(range((row_index // SUBGRID_SIZE) * SUBGRID_SIZE, (row_index // SUBGRID_SIZE + 1) * SUBGRID_SIZE)) for row_index in ROW_OF
+
+)
+
+CONTAINING_COLS: Tuple[Tuple[int, ...], ...] = tuple(
+
+    tuple(range((col_index // SUBGRID_SIZE) * SUBGRID_SIZE, (col_index // SUBGRID_SIZE + 1) * SUBGRID_SIZE)) for col_index in COL_OF
+
+)
+
+# The other rows of the band, and the other columns of the stack, containing every cell.
+ADJACENT_ROWS: Tuple[Tuple[int, ...], ...] = tuple(
+
+    tuple(row_index for row_index in CONTAINING_ROWS[index] if row_index != ROW_OF[index]) for index in range(CELL_COUNT)
+
+)
+
+ADJACENT_COLS: Tuple[Tuple[int, ...], ...] = tuple(
+
+    tuple(col_index for col_index in CONTAINING_COLS[index] if col_index != COL_OF[index]) for index in range(CELL_COUNT)
+
+)
+
+# Bitmasks of the peers of every cell, where bit n represents the cell at flat index n.
+PEER_MASKS: Tuple[int, ...] = tuple(sum(1 << peer for peer in PEERS[index]) for index in range(CELL_COUNT))
+
+# Bitmasks of the cells in the band and the stack containing every cell, including the cell itself.
+BAND_STACK_MASKS: Tuple[int, ...] = tuple(
+
+    sum(1 << other for other in range(CELL_COUNT) if ROW_OF[other] in CONTAINING_ROWS[index] or COL_OF[other] in CONTAINING_COLS[index])
+    for index in range(CELL_COUNT)
+
+)
@@ -0,0 +1,696 @@
+from typing import Dict, Iterator, List, Tuple, Union
+from itertools import combinations
+from time import perf_counter
+
+from app.candidates import SudokuCandidates
+from app.registry import REGISTRY, TechniqueRegistry, Technique, register_technique
+from app.tables import ALL_DIGITS_MASK, MASK_VALUES, MASK_COUNTS, UNITS, ROW_INDICES, COL_INDICES, SUBGRID_INDICES, CELL_COORDINATES, ROW_OF, COL_OF, SUBGRID_OF
+from config.config import GRID_SIZE, SUBGRID_SIZE
+
+# A single deduction made by a technique, as a dictionary containing:
+#
+#     "technique": The name of the technique (str).
+#     "placements": The (flat index, value) placements it proves (List[Tuple[int, int]]).
+#     "eliminations": The (flat index, bitmask) candidates it removes (List[Tuple[int, int]]).
+#     "units": The unit indices of the pattern, indexed as in app.tables.UNITS (Tuple[int, ...]).
+#     "cells": The flat indices of the cells forming the pattern (Tuple[int, ...]).
+#     "digits": A bitmask of the values forming the pattern (int).
+#
+# Steps hold no formatted text, so bulk solving does no string formatting. describe_step formats a step on request.
+Step = Dict[str, Union[str, int, Tuple[int, ...], List[Tuple[int, int]]]]
+
+def make_step(
+
+    technique: str,
+    placements: List[Tuple[int, int]] = None,
+    eliminations: List[Tuple[int, int]] = None,
+    units: Tuple[int, ...] = (),
+    cells: Tuple[int, ...] = (),
+    digits: int = 0
+
+) -> Step:
+
+    """
+    Returns a step, the record of a single deduction made by a technique.
+    
+    """
+
+    return {
+
+        "technique": technique,
+        "placements": placements or [],
+        "eliminations": eliminations or [],
+        "units": units,
+        "cells": cells,
+        "digits": digits
+
+    }
+
+def get_positions(masks: List[int], unit: Tuple[int, ...]) -> List[int]:
+
+    """
+    Returns the positions within a unit at which each value is a candidate.
+
+    Parameters:
+
+        masks (List[int]): The candidate bitmasks of every cell.
+        unit (Tuple[int, ...]): The flat indices of the cells of the unit.
+
+    Returns:
+
+        List[int]: A bitmask for every value, indexed by the value, where bit n is set if the value is a candidate of the cell at position n - 1.
+
+            The offset matches the digit bitmasks, so MASK_VALUES and MASK_COUNTS also decompose position bitmasks.
+    
+    """
+
+    positions = [0] * (GRID_SIZE + 1)
+
+    for position, index in enumerate(unit):
+
+        for num in MASK_VALUES[masks[index]]:
+
+            positions[num] |= 2 << position
+
+    return positions
+
+def get_union_mask(masks: List[int], indices: Tuple[int, ...]) -> int:
+
+    """
+    Returns the bitmask of the values that are candidates of any of the specified cells.
+    
+    """
+
+    union_mask = 0
+
+    for index in indices:
+
+        union_mask |= masks[index]
+
+    return union_mask
+
+def get_digit_mask(nums: Tuple[int, ...]) -> int:
+
+    """
+    Returns the bitmask of a collection of values.
+    
+    """
+
+    mask = 0
+
+    for num in nums:
+
+        mask |= 1 << num
+
+    return mask
+
+# SINGLES
+
+@register_technique(cost=1)
+def naked_single(candidates: SudokuCandidates) -> Iterator[Step]:
+
+    """
+    Finds every empty cell with a single candidate.
+    
+    """
+
+    for index, mask in enumerate(candidates.masks):
+
+        if MASK_COUNTS[mask] == 1:
+
+            yield make_step("naked_single", placements=[(index, MASK_VALUES[mask][0])], cells=(index,), digits=mask)
+
+@register_technique(cost=2)
+def hidden_single(candidates: SudokuCandidates) -> Iterator[Step]:
+
+    """
+    Finds every value that is a candidate of a single cell within a row, column or subgrid.
+    
+    """
+
+    masks = candidates.masks
+    unit_masks = candidates.grid.unit_masks
+
+    for unit_index, unit in enumerate(UNITS):
+
+        # Skips complete units.
+        if unit_masks[unit_index] == ALL_DIGITS_MASK:
+
+            continue
+
+        # Bitmasks of the values that are candidates of at least one, and of at least two, of the cells in the unit.
+        once_mask = 0
+        twice_mask = 0
+
+        for index in unit:
+
+            mask = masks[index]
+
+            twice_mask |= once_mask & mask
+            once_mask |= mask
+
+        hidden_mask = once_mask & ~twice_mask
+
+        if not hidden_mask:
+
+            continue
+
+        for index in unit:
+
+            mask = masks[index] & hidden_mask
+
+            if mask:
+
+                yield make_step("hidden_single", placements=[(index, MASK_VALUES[mask][0])], units=(unit_index,), cells=(index,), digits=mask & -mask)
+
+# INTERSECTIONS
+
+@register_technique(cost=4)
+def pointing(candidates: SudokuCandidates) -> Iterator[Step]:
+
+    """
+    Finds every value whose candidates within a subgrid lie in a single row or column, a pointing pair or triple.
+
+    The value is eliminated from the rest of that row or column, outside the subgrid.
+    
+    """
+
+    masks = candidates.masks
+
+    for subgrid_index, subgrid in enumerate(SUBGRID_INDICES):
+
+        # The subgrid cells are in row-major order, so each row is a run of cells and each column a stride.
+        lines = (
+
+            [subgrid[offset * SUBGRID_SIZE:(offset + 1) * SUBGRID_SIZE] for offset in range(SUBGRID_SIZE)],
+            [subgrid[offset::SUBGRID_SIZE] for offset in range(SUBGRID_SIZE)]
+
+        )
+
+        for line_cells, line_of, line_indices, unit_offset in zip(lines, (ROW_OF, COL_OF), (ROW_INDICES, COL_INDICES), (0, GRID_SIZE)):
+
+            line_masks = [get_union_mask(masks, cells) for cells in line_cells]
+
+            for offset, line_mask in enumerate(line_masks):
+
+                other_mask = 0
+
+                for other_offset, other_line_mask in enumerate(line_masks):
+
+                    if other_offset != offset:
+
+                        other_mask |= other_line_mask
+
+                line_index = line_of[line_cells[offset][0]]
+
+                for num in MASK_VALUES[line_mask & ~other_mask]:
+
+                    bit = 1 << num
+
+                    eliminations = [(index, bit) for index in line_indices[line_index] if index not in subgrid and masks[index] & bit]
+
+                    if eliminations:
+
+                        cells = tuple(index for index in line_cells[offset] if masks[index] & bit)
+
+                        yield make_step("pointing", eliminations=eliminations, units=(2 * GRID_SIZE + subgrid_index, unit_offset + line_index), cells=cells, digits=bit)
+
+@register_technique(cost=5)
+def box_line_reduction(candidates: SudokuCandidates) -> Iterator[Step]:
+
+    """
+    Finds every value whose candidates within a row or column lie in a single subgrid.
+
+    The value is eliminated from the rest of that subgrid, outside the row or column.
+    
+    """
+
+    masks = candidates.masks
+
+    for unit_offset, line_indices in ((0, ROW_INDICES), (GRID_SIZE, COL_INDICES)):
+
+        for line_index, line in enumerate(line_indices):
+
+            segments = [line[offset * SUBGRID_SIZE:(offset + 1) * SUBGRID_SIZE] for offset in range(SUBGRID_SIZE)]
+
+            segment_masks = [get_union_mask(masks, segment) for segment in segments]
+
+            for offset, segment_mask in enumerate(segment_masks):
+
+                other_mask = 0
+
+                for other_offset, other_segment_mask in enumerate(segment_masks):
+
+                    if other_offset != offset:
+
+                        other_mask |= other_segment_mask
+
+                subgrid_index = SUBGRID_OF[segments[offset][0]]
+
+                for num in MASK_VALUES[segment_mask & ~other_mask]:
+
+                    bit = 1 << num
+
+                    eliminations = [(index, bit) for index in SUBGRID_INDICES[subgrid_index] if index not in line and masks[index] & bit]
+
+                    if eliminations:
+
+                        cells = tuple(index for index in segments[offset] if masks[index] & bit)
+
+                        yield make_step("box_line_reduction", eliminations=eliminations, units=(unit_offset + line_index, 2 * GRID_SIZE + subgrid_index), cells=cells, digits=bit)
+
+# SUBSETS
+
+def naked_subset(candidates: SudokuCandidates, size: int, technique: str) -> Iterator[Step]:
+
+    """
+    Finds every set of cells within a unit whose candidates are confined to the same number of values.
+
+    Those values are eliminated from the other cells of the unit.
+
+    Parameters:
+
+        candidates (SudokuCandidates): The candidates to be searched.
+        size (int): The number of cells, and of values, in the subset.
+        technique (str): The name recorded in each step.
+    
+    """
+
+    masks = candidates.masks
+
+    for unit_index, unit in enumerate(UNITS):
+
+        subset_cells = [index for index in unit if 2 <= MASK_COUNTS[masks[index]] <= size]
+
+        if len(subset_cells) < size:
+
+            continue
+
+        for subset in combinations(subset_cells, size):
+
+            union_mask = get_union_mask(masks, subset)
+
+            if MASK_COUNTS[union_mask] != size:
+
+                continue
+
+            eliminations = [(index, masks[index] & union_mask) for index in unit if index not in subset and masks[index] & union_mask]
+
+            if eliminations:
+
+                yield make_step(technique, eliminations=eliminations, units=(unit_index,), cells=subset, digits=union_mask)
+
+def hidden_subset(candidates: SudokuCandidates, size: int, technique: str) -> Iterator[Step]:
+
+    """
+    Finds every set of values within a unit whose candidates are confined to the same number of cells.
+
+    The other values are eliminated from those cells.
+
+    Parameters:
+
+        candidates (SudokuCandidates): The candidates to be searched.
+        size (int): The number of values, and of cells, in the subset.
+        technique (str): The name recorded in each step.
+    
+    """
+
+    masks = candidates.masks
+
+    for unit_index, unit in enumerate(UNITS):
+
+        positions = get_positions(masks, unit)
+
+        subset_nums = [num for num in range(1, GRID_SIZE + 1) if 2 <= MASK_COUNTS[positions[num]] <= size]
+
+        if len(subset_nums) < size:
+
+            continue
+
+        for subset in combinations(subset_nums, size):
+
+            union_positions = 0
+
+            for num in subset:
+
+                union_positions |= positions[num]
+
+            if MASK_COUNTS[union_positions] != size:
+
+                continue
+
+            digit_mask = get_digit_mask(subset)
+
+            cells = tuple(unit[position - 1] for position in MASK_VALUES[union_positions])
+
+            eliminations = [(index, masks[index] & ~digit_mask) for index in cells if masks[index] & ~digit_mask]
+
+            if eliminations:
+
+                yield make_step(technique, eliminations=eliminations, units=(unit_index,), cells=cells, digits=digit_mask)
+
+@register_technique(cost=6)
+def naked_pair(candidates: SudokuCandidates) -> Iterator[Step]:
+
+    """
+    Finds every naked pair, two cells of a unit with the same two candidates.
+    
+    """
+
+    return naked_subset(candidates, 2, "naked_pair")
+
+@register_technique(cost=10)
+def naked_triple(candidates: SudokuCandidates) -> Iterator[Step]:
+
+    """
+    Finds every naked triple, three cells of a unit with candidates among the same three values.
+    
+    """
+
+    return naked_subset(candidates, 3, "naked_triple")
+
+@register_technique(cost=16)
+def naked_quad(candidates: SudokuCandidates) -> Iterator[Step]:
+
+    """
+    Finds every naked quad, four cells of a unit with candidates among the same four values.
+    
+    """
+
+    return naked_subset(candidates, 4, "naked_quad")
+
+@register_technique(cost=8)
+def hidden_pair(candidates: SudokuCandidates) -> Iterator[Step]:
+
+    """
+    Finds every hidden pair, two values of a unit that are candidates of the same two cells only.
+    
+    """
+
+    return hidden_subset(candidates, 2, "hidden_pair")
+
+@register_technique(cost=12)
+def hidden_triple(candidates: SudokuCandidates) -> Iterator[Step]:
+
+    """
+    Finds every hidden triple, three values of a unit that are candidates of the same three cells only.
+    
+    """
+
+    return hidden_subset(candidates, 3, "hidden_triple")
+
+@register_technique(cost=18)
+def hidden_quad(candidates: SudokuCandidates) -> Iterator[Step]:
+
+    """
+    Finds every hidden quad, four values of a unit that are candidates of the same four cells only.
+    
+    """
+
+    return hidden_subset(candidates, 4, "hidden_quad")
+
+# FISH
+
+def fish(candidates: SudokuCandidates, size: int, technique: str) -> Iterator[Step]:
+
+    """
+    Finds every set of rows, or columns, whose candidates for a value are confined to the same number of columns, or rows.
+
+    The value is eliminated from the rest of those columns, or rows.
+
+    Parameters:
+
+        candidates (SudokuCandidates): The candidates to be searched.
+        size (int): The number of base lines, and of cover lines, in the pattern.
+        technique (str): The name recorded in each step.
+    
+    """
+
+    masks = candidates.masks
+
+    for num in range(1, GRID_SIZE + 1):
+
+        bit = 1 << num
+
+        # Rows as base lines with columns as cover lines, then the transpose.
+        for base_offset, cover_offset, base_indices, cover_indices in ((0, GRID_SIZE, ROW_INDICES, COL_INDICES), (GRID_SIZE, 0, COL_INDICES, ROW_INDICES)):
+
+            base_lines = []
+
+            for base_index, line in enumerate(base_indices):
+
+                positions = 0
+
+                for position, index in enumerate(line):
+
+                    if masks[index] & bit:
+
+                        positions |= 2 << position
+
+                if 2 <= MASK_COUNTS[positions] <= size:
+
+                    base_lines.append((base_index, positions))
+
+            if len(base_lines) < size:
+
+                continue
+
+            for subset in combinations(base_lines, size):
+
+                union_positions = 0
+
+                for _, positions in subset:
+
+                    union_positions |= positions
+
+                if MASK_COUNTS[union_positions] != size:
+
+                    continue
+
+                base_set = {base_index for base_index, _ in subset}
+                cover_lines = tuple(position - 1 for position in MASK_VALUES[union_positions])
+
+                eliminations = [
+
+                    (index, bit)
+                    for cover_index in cover_lines
+                    for position, index in enumerate(cover_indices[cover_index])
+                    if position not in base_set and masks[index] & bit
+
+                ]
+
+                if eliminations:
+
+                    cells = tuple(index for base_index in sorted(base_set) for index in base_indices[base_index] if masks[index] & bit)
+
+                    units = tuple(base_offset + base_index for base_index in sorted(base_set)) + tuple(cover_offset + cover_index for cover_index in cover_lines)
+
+                    yield make_step(technique, eliminations=eliminations, units=units, cells=cells, digits=bit)
+
+@register_technique(cost=14)
+def x_wing(candidates: SudokuCandidates) -> Iterator[Step]:
+
+    """
+    Finds every X-Wing, a fish of two rows and two columns.
+    
+    """
+
+    return fish(candidates, 2, "x_wing")
+
+@register_technique(cost=20)
+def swordfish(candidates: SudokuCandidates) -> Iterator[Step]:
+
+    """
+    Finds every Swordfish, a fish of three rows and three columns.
+    
+    """
+
+    return fish(candidates, 3, "swordfish")
+
+def apply_step(candidates: SudokuCandidates, step: Step, record: Dict[str, List] = None) -> bool:
+
+    """
+    Applies the placements and eliminations of a step that still apply to the candidates.
+
+    Steps are sound however the candidates have since changed, so a step is only skipped once nothing in it still applies.
+
+    Parameters:
+
+        candidates (SudokuCandidates): The candidates, and grid, to be updated.
+        step (Step): The step to be applied, as yielded by a technique.
+        record (Dict[str, List]): An optional record of the technique to be updated, containing:
+
+            "count": The number of steps applied (int).
+            "indices": A list of the indices for each placement (List[Tuple[int, int]]).
+            "eliminations": A list of the indices and value of each eliminated candidate (List[Tuple[int, int, int]]).
+
+    Returns:
+
+        bool: True if any placement or elimination was applied, otherwise False.
+    
+    """
+
+    masks = candidates.masks
+
+    applied = False
+
+    for index, num in step["placements"]:
+
+        if masks[index] & (1 << num):
+
+            candidates.place(index, num)
+
+            applied = True
+
+            if record is not None:
+
+                record["indices"].append(CELL_COORDINATES[index])
+
+    for index, mask in step["eliminations"]:
+
+        eliminated_mask = masks[index] & mask
+
+        if eliminated_mask:
+
+            candidates.eliminate(index, eliminated_mask)
+
+            applied = True
+
+            if record is not None:
+
+                row_index, col_index = CELL_COORDINATES[index]
+
+                record["eliminations"].extend((row_index, col_index, num) for num in MASK_VALUES[eliminated_mask])
+
+    if applied and record is not None:
+
+        record["count"] += 1
+
+    return applied
+
+def apply_techniques(
+
+    candidates: SudokuCandidates,
+    techniques: Tuple[Tuple[str, Technique], ...] = None,
+    records: Dict[str, Dict[str, List]] = None,
+    registry: TechniqueRegistry = None
+
+) -> bool:
+
+    """
+    Applies the techniques until none makes progress or the grid is full, always returning to the simplest technique after any progress.
+
+    Each technique applies every step it finds in a single search of the candidates.
+
+    Parameters:
+
+        candidates (SudokuCandidates): The candidates, and grid, to be updated.
+        techniques (Tuple[Tuple[str, Technique], ...]): The names and functions of the techniques, in the order they are tried.
+
+            Defaults to None, which uses the current ordering of the registry.
+
+        records (Dict[str, Dict[str, List]]): Optional records of each technique to be updated, keyed by technique name, as described in apply_step.
+        registry (TechniqueRegistry): The registry that orders the techniques, and records every call if it is adaptive. Defaults to REGISTRY.
+
+    Returns:
+
+        bool: True if any step was applied, otherwise False.
+    
+    """
+
+    grid = candidates.grid
+
+    registry = registry or REGISTRY
+
+    if techniques is None:
+
+        techniques = registry.ordered()
+
+    # Only an adaptive registry uses the measurements, so a fixed ordering skips the timer and the shared lock.
+    measure = registry.adaptive
+
+    progress = False
+
+    while grid.empty_count:
+
+        for technique_type, technique_function in techniques:
+
+            record = records[technique_type] if records is not None else None
+
+            progress_made = False
+
+            if measure:
+
+                start_time = perf_counter()
+
+            for step in technique_function(candidates):
+
+                if apply_step(candidates, step, record):
+
+                    progress_made = True
+
+            if measure:
+
+                registry.record(technique_type, progress_made, perf_counter() - start_time)
+
+            # Returns to the simplest technique.
+            if progress_made:
+
+                progress = True
+
+                break
+
+        else:
+
+            break
+
+    return progress
+
+def describe_unit(unit_index: int) -> str:
+
+    """
+    Returns the name of a unit, such as 'row 3', 'column 0' or 'subgrid 8'.
+    
+    """
+
+    unit_type, index = divmod(unit_index, GRID_SIZE)
+
+    return f"{('row', 'column', 'subgrid')[unit_type]} {index}"
+
+def describe_step(step: Step) -> str:
+
+    """
+    Returns a sentence justifying a step, for hints and explanations.
+
+    Parameters:
+
+        step (Step): The step to be described.
+
+    Returns:
+
+        str: The justification of the step.
+    
+    """
+
+    technique = step["technique"].replace("_", " ")
+    digits = ", ".join(str(num) for num in MASK_VALUES[step["digits"]])
+    cells = ", ".join(str(CELL_COORDINATES[index]) for index in step["cells"])
+    units = " and ".join(describe_unit(unit_index) for unit_index in step["units"])
+
+    if step["technique"] == "naked_single":
+
+        return f"Naked single: cell {cells} has only one candidate, {digits}."
+
+    if step["technique"] == "hidden_single":
+
+        return f"Hidden single: {digits} can only go in cell {cells} within {units}."
+
+    eliminated = ", ".join(f"{num} from {CELL_COORDINATES[index]}" for index, mask in step["eliminations"] for num in MASK_VALUES[mask])
+
+    return f"{technique.capitalize()}: {digits} in cells {cells} of {units}, which eliminates {eliminated}."
+
+
+
+if __name__ == "__main__":
+
+    print("--------------------")
@@ -0,0 +1,204 @@
+from typing import List, Tuple, Iterator, Sequence
+from itertools import permutations, product
+from operator import itemgetter
+import random
+
+from app.grid import SudokuGrid
+from app.validator import SudokuValidator
+from app.tables import CELL_COUNT, UNITS
+from app.library.grids import valid_grid, full_grid
+from config.config import GRID_SIZE, SUBGRID_SIZE
+
+# The complete grids transformed by default, flattened to their cells in row-major order.
+SEED_SOLUTIONS: List[bytes] = [bytes(num for row in grid for num in row) for grid in (valid_grid, full_grid)]
+
+# Every order of the rows, or columns, that keeps each band, or stack, together, as the source index for each destination index.
+LINE_ORDERS: Tuple[Tuple[int, ...], ...] = tuple(
+
+    tuple(band_index * SUBGRID_SIZE + offset for band_index, offsets in zip(band_order, offset_orders) for offset in offsets)
+    for band_order in permutations(range(SUBGRID_SIZE))
+    for offset_orders in product(permutations(range(SUBGRID_SIZE)), repeat=SUBGRID_SIZE)
+
+)
+
+# Getters that reorder the columns of a grid in row-major order, one for each line order.
+COLUMN_GETTERS: Tuple[itemgetter, ...] = tuple(
+
+    itemgetter(*(row_index * GRID_SIZE + col_index for row_index in range(GRID_SIZE) for col_index in order)) for order in LINE_ORDERS
+
+)
+
+class SudokuTransformer:
+
+    """
+    A class to fill an empty Sudoku grid by applying random validity-preserving transformations to a complete seed solution.
+
+    The transformations are digit relabelling, row swaps within bands, column swaps within stacks, band swaps, stack swaps and transposition.
+    Rotations and reflections are compositions of these, so every grid reached is a valid solution.
+    
+    """
+
+    def __init__(self, grid: SudokuGrid, validator: SudokuValidator, solver, rng: random.Random = None, seeds: Sequence[bytes] = None):
+
+        """
+        Initialises SudokuTransformer with an instance of the SudokuGrid and SudokuValidator classes, and a solving engine.
+
+        Parameters:
+
+            grid (SudokuGrid): The grid to be filled.
+            validator (SudokuValidator): Validates the grid before filling it with the solving engine.
+            solver (SudokuRecursion, SudokuExactCover or SudokuStackSearch): Fills the grid by backtracking when a uniform sample is required.
+            rng (random.Random): An optional random number generator, for reproducible results. Defaults to the global random module.
+            seeds (Sequence[bytes]): Optional complete solutions to be transformed, each 81 cells in row-major order. Defaults to SEED_SOLUTIONS.
+
+        Raises:
+
+            ValueError: If a seed is not a complete and valid solution.
+        
+        """
+
+        self.grid = grid
+        self.validator = validator
+        self.solver = solver
+        self.rng = rng or random
+
+        self.seeds = [bytes(seed) for seed in (seeds or SEED_SOLUTIONS)]
+
+        for seed in self.seeds:
+
+            if not self.is_complete_solution(seed):
+
+                raise ValueError(f"Please provide a valid seed solution (e.g., {CELL_COUNT} cells with every row, column and subgrid containing 1 to {GRID_SIZE}).")
+
+        # The rows of every seed and of its transposition, so transposition and row reordering are a selection and a join.
+        self.seed_rows = []
+
+        for seed in self.seeds:
+
+            transposed = bytes(seed[col_index * GRID_SIZE + row_index] for row_index in range(GRID_SIZE) for col_index in range(GRID_SIZE))
+
+            for cells in (seed, transposed):
+
+                self.seed_rows.append([cells[start:start + GRID_SIZE] for start in range(0, CELL_COUNT, GRID_SIZE)])
+
+    # FULL GRID GENERATION
+
+    def populate_grid(self, uniform: bool = False) -> bool:
+
+        """
+        Fills the grid with a random complete solution.
+
+        A transformed seed solution is only drawn from the orbits of the seed solutions,
+        so a partially filled grid, or a request for a uniform sample, falls back to the backtracking solving engine.
+
+        Parameters:
+
+            uniform (bool): If True, fills the grid by randomised backtracking rather than by transformation.
+
+        Returns:
+
+            bool: True if the grid was successfully filled, otherwise False.
+        
+        """
+
+        if uniform or self.grid.count_empty_cells() != CELL_COUNT:
+
+            return self.solver.populate_grid()
+
+        self.grid.cells[:] = self.random_solution()
+
+        self.grid.build_masks()
+
+        return True
+
+    def iter_solutions(self, count: int = None) -> Iterator[bytes]:
+
+        """
+        Yields random complete solutions, without modifying the grid.
+
+        Parameters:
+
+            count (int): The number of solutions to yield. Defaults to None, which yields solutions indefinitely.
+
+        Returns:
+
+            Iterator[bytes]: An iterator of solutions, each 81 cells in row-major order.
+        
+        """
+
+        generated = 0
+
+        while count is None or generated < count:
+
+            yield self.random_solution()
+
+            generated += 1
+
+    def random_solution(self) -> bytes:
+
+        """
+        Returns a random transformation of a randomly chosen seed solution.
+
+        Returns:
+
+            bytes: The transformed solution, as 81 cells in row-major order.
+        
+        """
+
+        rng = self.rng
+
+        # Selects a seed, transposed or not, then reorders its rows and its columns.
+        rows = self.seed_rows[rng.randrange(len(self.seed_rows))]
+
+        row_order = LINE_ORDERS[rng.randrange(len(LINE_ORDERS))]
+
+        cells = COLUMN_GETTERS[rng.randrange(len(COLUMN_GETTERS))](b"".join(map(rows.__getitem__, row_order)))
+
+        return bytes(cells).translate(self.random_relabelling())
+
+    # TRANSFORMATIONS
+
+    def random_relabelling(self) -> bytes:
+
+        """
+        Returns a translation table mapping every digit to a random distinct digit, and empty cells to themselves.
+
+        Returns:
+
+            bytes: A translation table for bytes.translate.
+        
+        """
+
+        digits = self.rng.sample(range(1, GRID_SIZE + 1), GRID_SIZE)
+
+        return bytes.maketrans(bytes(range(GRID_SIZE + 1)), bytes([0] + digits))
+
+    @staticmethod
+    def is_complete_solution(cells: bytes) -> bool:
+
+        """
+        Checks if the cells form a complete and valid solution.
+
+        Parameters:
+
+            cells (bytes): The cells to be checked, in row-major order.
+
+        Returns:
+
+            bool: True if every row, column and subgrid contains every digit once, otherwise False.
+        
+        """
+
+        if len(cells) != CELL_COUNT:
+
+            return False
+
+        digits = set(range(1, GRID_SIZE + 1))
+
+        return all({cells[index] for index in unit} == digits for unit in UNITS)
+
+
+
+if __name__ == "__main__":
+
+    print("--------------------")
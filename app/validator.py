@@ -1,6 +1,7 @@
-from typing import List, Tuple, Iterable, Callable
+from typing import List, Tuple, Hashable
 
 from app.grid import SudokuGrid
+from app.tables import CELL_COUNT, ALL_DIGITS_MASK, MASK_COUNTS, ROW_INDICES, COL_INDICES, SUBGRID_INDICES, SUBGRID_ORIGINS, CELL_UNITS
 from config.config import GRID_SIZE
 
 class SudokuValidator:
@@ -40,9 +41,27 @@ class SudokuValidator:
 
         """
 
-        if self.grid.is_cell_empty(row_index, col_index) and self.is_valid(row_index, col_index, num):
+        return self.populate_cell_at(row_index * GRID_SIZE + col_index, num)
 
-            self.grid.grid[row_index][col_index] = num
+    def populate_cell_at(self, index: int, num: int) -> bool:
+
+        """
+        Attempts to place a number at the specified flat index if the cell is empty and the placement is valid.
+
+        Parameters:
+
+            index (int): The flat index of the cell in the grid.
+            num (int): The number to be placed, between 1 and 9.
+        
+        Returns:
+
+            bool: True if the number placement was successful, otherwise False.
+
+        """
+
+        if self.grid.cells[index] == 0 and self.is_valid_at(index, num):
+
+            self.grid.set_cell_at(index, num)
 
             return True
         
@@ -65,9 +84,28 @@ class SudokuValidator:
             
         """
 
-        containing_values = self.grid.get_containing_values(row_index, col_index)
-                
-        return num not in containing_values
+        return self.is_valid_at(row_index * GRID_SIZE + col_index, num)
+
+    def is_valid_at(self, index: int, num: int) -> bool:
+
+        """
+        Checks if a number placement at the specified flat index is valid within the rules of Sudoku.
+
+        Parameters:
+
+            index (int): The flat index of the cell in the grid.
+            num (int): The number to be checked, between 1 and 9.
+
+        Returns:
+
+            bool: True if the number placement is valid, otherwise False.
+            
+        """
+
+        unit_masks = self.grid.unit_masks
+        row_unit, col_unit, subgrid_unit = CELL_UNITS[index]
+
+        return not (unit_masks[row_unit] | unit_masks[col_unit] | unit_masks[subgrid_unit]) & (1 << num)
     
     def is_grid_valid(self, debug: bool = False) -> bool:
 
@@ -84,25 +122,22 @@ class SudokuValidator:
         
         """
 
-        invalid_units = {unit_type: {} for unit_type, _, _ in self._get_all_units()}
-
-        for unit_type, get_unit, indices in self._get_all_units():
+        # Every filled cell sets its value in three unit bitmasks, so the bits only fall short of three per cell when a unit repeats a value.
+        if not debug and self.is_grid_consistent():
 
-            for index in indices:
+            return True
 
-                if isinstance(index, tuple):
+        invalid_units = {unit_type: {} for unit_type, _, _ in self._get_all_units()}
 
-                    row_index, col_index = index
+        for unit_type, unit_indices, keys in self._get_all_units():
 
-                    unit = get_unit(row_index, col_index)
-                
-                else:
+            for indices, key in zip(unit_indices, keys):
 
-                    unit = get_unit(index)
+                unit = self.grid.get_values(indices)
 
                 if not self.is_unit_valid(unit):
                         
-                    invalid_units[unit_type][index] = unit
+                    invalid_units[unit_type][key] = unit
 
         has_invalid_units = any(invalid_units[unit_type] for unit_type in invalid_units)
 
@@ -118,22 +153,49 @@ class SudokuValidator:
             
         return True
     
-    def _get_all_units(self) -> List[Tuple[str, Callable, Iterable[int]]]:
+    def is_grid_consistent(self) -> bool:
+
+        """
+        Checks that no row, column or subgrid repeats a value, using the unit bitmasks of the grid.
+
+        Returns:
+
+            bool: True if every filled cell holds a value between 1 and 9 that is unique within its units, otherwise False.
+        
+        """
+
+        unit_masks = self.grid.unit_masks
+
+        set_bits = 0
+
+        for unit_mask in unit_masks:
+
+            if unit_mask & ~ALL_DIGITS_MASK:
+
+                return False
+
+            set_bits += MASK_COUNTS[unit_mask]
+
+        return set_bits == 3 * (CELL_COUNT - self.grid.empty_count)
+    
+    def _get_all_units(self) -> List[Tuple[str, Tuple[Tuple[int, ...], ...], List[Hashable]]]:
 
         """
         Returns the information required to access all rows, columns and subgrids.
 
         Returns:
 
-            List[Tuple[str, Callable, Iterable[int]]]: A list of unit descriptors, consisting of their types, access methods and indices.
+            List[Tuple[str, Tuple[Tuple[int, ...], ...], List[Hashable]]]: 
+            
+                A list of unit descriptors, consisting of their types, the cell indices of each unit and the keys used to report each unit.
         
         """
 
         units = [
 
-            ("rows", self.grid.get_row, range(GRID_SIZE)),
-            ("cols", self.grid.get_col, range(GRID_SIZE)),
-            ("subgrids", self.grid.get_subgrid, self.grid.get_subgrid_indices())
+            ("rows", ROW_INDICES, list(range(GRID_SIZE))),
+            ("cols", COL_INDICES, list(range(GRID_SIZE))),
+            ("subgrids", SUBGRID_INDICES, list(SUBGRID_ORIGINS))
 
         ]
 
@@ -0,0 +1,142 @@
+from typing import Tuple, Union
+
+from app.tables import ALL_DIGITS_MASK, CELL_COUNT, UNITS
+from config.config import GRID_SIZE, SUBGRID_SIZE
+
+try:
+
+    import numpy as np
+
+except ImportError:
+
+    np = None
+
+# The number of grids checked at a time, bounding the memory of the intermediate arrays.
+CHUNK_GRIDS: int = 1 << 16
+
+def require_numpy() -> None:
+
+    """
+    Checks that NumPy, an optional dependency needed only by this module, is installed.
+
+    Raises:
+
+        ImportError: If NumPy is not installed.
+    
+    """
+
+    if np is None:
+
+        raise ImportError("Please install numpy to validate grids in bulk (e.g., pip install numpy).")
+
+def get_unit_totals(bits: "np.ndarray", operation: "np.ufunc") -> "np.ndarray":
+
+    """
+    Combines the cell bits of every unit, for every grid at once.
+
+    Parameters:
+
+        bits (np.ndarray): The digit bit of every cell, an (81, N) array with one grid per column.
+        operation (np.ufunc): The operation combining the bits of a unit, np.bitwise_or or np.add.
+
+    Returns:
+
+        np.ndarray: A (27, N) array of the combined bits, the units ordered as in tables.UNITS.
+    
+    """
+
+    cells = bits.reshape(GRID_SIZE, GRID_SIZE, -1)
+
+    # The subgrid of a cell is set by the first and third of these axes, and its position within the subgrid by the others.
+    subgrids = bits.reshape(SUBGRID_SIZE, SUBGRID_SIZE, SUBGRID_SIZE, SUBGRID_SIZE, -1)
+
+    return np.concatenate((
+
+        operation.reduce(cells, axis=1, dtype=np.uint16),
+        operation.reduce(cells, axis=0, dtype=np.uint16),
+        operation.reduce(subgrids, axis=(1, 3), dtype=np.uint16).reshape(GRID_SIZE, -1)
+
+    ))
+
+def validate_grids(grids, conflicts: bool = False, complete: bool = False) -> Union["np.ndarray", Tuple["np.ndarray", "np.ndarray"]]:
+
+    """
+    Checks many grids at once, with the same rules as SudokuValidator.is_grid_valid, using whole-array operations over every grid.
+
+    Every cell value becomes its digit bit, and a unit repeats a value exactly when the sum of its bits differs from their bitwise or.
+
+    Parameters:
+
+        grids (np.ndarray): The grids, as an (N, 9, 9) or (N, 81) array of integers between 0 and 9, with 0 for every empty cell.
+        conflicts (bool): If True, also returns which units of every grid repeat a value.
+        complete (bool): If True, a grid is only valid if it is also full, as for a submitted solution.
+
+    Raises:
+
+        ImportError: If NumPy is not installed.
+        ValueError: If the grids are not an array of valid grids.
+
+    Returns:
+
+        np.ndarray: A boolean vector, True for every valid grid.
+
+        Tuple[np.ndarray, np.ndarray]:
+
+            If conflicts is True, the vector and an (N, 27) boolean array, True for every unit repeating a value.
+            The units are ordered as in tables.UNITS, rows, then columns, then subgrids.
+    
+    """
+
+    require_numpy()
+
+    grids = np.asarray(grids)
+
+    if (
+
+        grids.ndim not in (2, 3)
+        or grids.shape[1:] not in ((CELL_COUNT,), (GRID_SIZE, GRID_SIZE))
+        or grids.dtype.kind not in "iu"
+        or (grids.size and (grids.min() < 0 or grids.max() > GRID_SIZE))
+
+    ):
+
+        raise ValueError(f"Please provide valid grids (e.g., an (N, {CELL_COUNT}) array of integers between 0 and {GRID_SIZE}).")
+
+    cells = grids.reshape(len(grids), CELL_COUNT).astype(np.uint8, copy=False)
+
+    valid = np.empty(len(cells), dtype=bool)
+
+    unit_conflicts = np.empty((len(cells), len(UNITS)), dtype=bool) if conflicts else None
+
+    for start in range(0, len(cells), CHUNK_GRIDS):
+
+        chunk = cells[start:start + CHUNK_GRIDS]
+
+        # The grids along the last axis, so every reduction below combines whole rows of the chunk at once.
+        bits = np.left_shift(np.uint16(1), np.ascontiguousarray(chunk.T), dtype=np.uint16)
+
+        # Empty cells would otherwise set bit 0.
+        bits &= np.uint16(ALL_DIGITS_MASK)
+
+        masks = get_unit_totals(bits, np.bitwise_or)
+
+        # Nine bits of at most 1 << 9 each cannot overflow 16 bits.
+        repeated = get_unit_totals(bits, np.add) != masks
+
+        valid[start:start + len(chunk)] = ~repeated.any(axis=0)
+
+        if complete:
+
+            valid[start:start + len(chunk)] &= (masks == ALL_DIGITS_MASK).all(axis=0)
+
+        if conflicts:
+
+            unit_conflicts[start:start + len(chunk)] = repeated.T
+
+    return (valid, unit_conflicts) if conflicts else valid
+
+
+
+if __name__ == "__main__":
+
+    print("--------------------")
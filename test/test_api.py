@@ -0,0 +1,24 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from app.api import is_valid, solve, count_solutions, generate
+from app.library.grids import extreme_grid, invalid_row, empty_grid
+
+def test_functions_in_thread_pool():
+
+    records = [generate(target_removal=50, seed=seed) for seed in range(8)]
+
+    puzzles = [record["puzzle"] for record in records]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+
+        assert list(executor.map(solve, puzzles)) == [record["solution"] for record in records]
+        assert list(executor.map(count_solutions, puzzles)) == [1] * 8
+        assert list(executor.map(lambda seed: generate(target_removal=50, seed=seed), range(8))) == records
+
+def test_functions_results():
+
+    assert is_valid(extreme_grid)
+    assert not is_valid(invalid_row)
+    assert solve(invalid_row) is None
+    assert count_solutions(invalid_row) == 0
+    assert count_solutions(empty_grid, max_solutions=3) == 3
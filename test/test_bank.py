@@ -0,0 +1,208 @@
+import itertools
+import random
+import time
+import pytest
+from app.main import SudokuFacade
+from app.events import SudokuEvents
+from app.bank import PuzzleBank, BankRefiller, SEARCH_TECHNIQUE
+from app.registry import REGISTRY
+
+def test_bank_take_by_difficulty(tmp_path):
+
+    bank = PuzzleBank(str(tmp_path / "puzzles.db"))
+
+    sudoku = SudokuFacade(rng=random.Random(0))
+
+    assert bank.refill(sudoku, "easy", 3) == 3
+    assert bank.count("easy") == 3 and bank.count("hard") == 0
+
+    record = bank.take("easy")
+
+    assert record["difficulty"] == "easy"
+    assert record["techniques"].split(",")[-1] == record["hardest_technique"]
+    assert bank.take("hard") is None
+    assert bank.count() == 2
+
+    # A puzzle symmetric to one in the bank is rejected.
+    remaining = bank.take()
+
+    assert bank.add(remaining["puzzle"], remaining["solution"], "easy")
+    assert not bank.add(remaining["puzzle"][::-1], remaining["solution"][::-1], "easy")
+
+    with pytest.raises(ValueError):
+
+        bank.add(remaining["puzzle"], remaining["solution"], "trivial")
+
+    bank.close()
+
+def test_take_uses_index_order():
+
+    bank = PuzzleBank()
+
+    criteria = {"difficulty_level": "hard", "clues": 30, "technique": "x_wing"}
+
+    for size in range(len(criteria) + 1):
+
+        for names in itertools.combinations(criteria, size):
+
+            query, parameters = bank.get_take_query(**{name: criteria[name] for name in names})
+
+            plan = " ".join(row[3] for row in bank.connection.execute("EXPLAIN QUERY PLAN " + query, parameters))
+
+            assert "TEMP B-TREE" not in plan
+
+    bank.close()
+
+def test_refill_records_search():
+
+    bank = PuzzleBank()
+
+    sudoku = SudokuFacade(rng=random.Random(0))
+
+    bank.refill(sudoku, "expert", 10)
+
+    assert 0 < bank.count(technique=SEARCH_TECHNIQUE) < 10
+
+    while bank.count():
+
+        record = bank.take()
+
+        sudoku.grid.load(record["puzzle"])
+
+        sudoku.iteration.candidate_techniques(REGISTRY.ordered(adaptive=False))
+
+        assert (sudoku.grid.count_empty_cells() > 0) == (record["hardest_technique"] == SEARCH_TECHNIQUE)
+
+def test_refill_uses_techniques_registered_later():
+
+    searched = []
+
+    def late_technique(candidates):
+
+        searched.append(candidates.grid.empty_count)
+
+        return iter(())
+
+    REGISTRY.register("late_technique", late_technique, 50)
+
+    try:
+
+        PuzzleBank().refill(SudokuFacade(rng=random.Random(4)), "expert", 2)
+
+    finally:
+
+        REGISTRY.unregister("late_technique")
+
+    assert searched
+
+def test_serve_puzzle():
+
+    bank = PuzzleBank()
+
+    sudoku = SudokuFacade(rng=random.Random(1), bank=bank)
+
+    bank.refill(sudoku, "medium", 1)
+
+    record = sudoku.serve_puzzle("medium")
+
+    assert "id" in record and sudoku.grid.to_string() == record["puzzle"]
+
+    # An empty bank falls back to generating the puzzle.
+    record = sudoku.serve_puzzle("medium")
+
+    assert "id" not in record and sudoku.grid.to_string() == record["puzzle"]
+    assert sudoku.serve_puzzle(clues=17) is None
+    assert sudoku.serve_puzzle() is None
+    assert SudokuFacade().serve_puzzle() is None
+
+def test_refiller_tops_up():
+
+    bank = PuzzleBank()
+
+    refiller = BankRefiller(bank, SudokuFacade(rng=random.Random(2)), {"easy": 2}, capacity=3, interval=0.01)
+
+    refiller.refill_once()
+
+    assert bank.count("easy") == 3
+    assert not refiller.refill_once()
+
+    bank.take("easy")
+    bank.take("easy")
+
+    refiller.start()
+
+    deadline = time.monotonic() + 30
+
+    while bank.count("easy") < 2 and time.monotonic() < deadline:
+
+        time.sleep(0.01)
+
+    refiller.stop(timeout=30)
+
+    assert bank.count("easy") >= 2 and not refiller.is_alive()
+
+def test_refiller_survives_failed_refill():
+
+    class RecordingEvents(SudokuEvents):
+
+        def __init__(self):
+
+            self.failures = []
+
+        def refill_failed(self, error, failures):
+
+            self.failures.append((str(error), failures))
+
+    bank = PuzzleBank()
+
+    refill = bank.refill
+
+    calls = []
+
+    def flaky_refill(facade, difficulty_level, count):
+
+        calls.append(difficulty_level)
+
+        if len(calls) == 1:
+
+            raise RuntimeError("database is locked")
+
+        return refill(facade, difficulty_level, count)
+
+    bank.refill = flaky_refill
+
+    events = RecordingEvents()
+
+    refiller = BankRefiller(bank, SudokuFacade(rng=random.Random(3), events=events), {"easy": 1}, interval=0.01)
+
+    refiller.start()
+
+    deadline = time.monotonic() + 30
+
+    while bank.count("easy") < 1 and time.monotonic() < deadline:
+
+        time.sleep(0.01)
+
+    refiller.stop(timeout=30)
+
+    assert events.failures == [("database is locked", 1)]
+    assert bank.count("easy") >= 1 and refiller.error is None
+
+    # A refill still failing when the thread stops is raised by stop.
+    bank.refill = lambda *args: 1 / 0
+
+    while bank.take("easy"):
+
+        pass
+
+    refiller = BankRefiller(bank, SudokuFacade(events=events), {"easy": 1}, interval=0.01)
+
+    refiller.start()
+
+    while len(events.failures) < 2 and time.monotonic() < deadline:
+
+        time.sleep(0.01)
+
+    with pytest.raises(ZeroDivisionError):
+
+        refiller.stop(timeout=30)
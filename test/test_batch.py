@@ -0,0 +1,22 @@
+import pytest
+from app.batch import generate_puzzles
+
+def test_generate_puzzles_is_reproducible_across_workers():
+
+    serial = {record["index"]: record["puzzle"] for record in generate_puzzles(4, target_removal=40, seed=7, workers=1)}
+
+    parallel = {record["index"]: record["puzzle"] for record in generate_puzzles(4, target_removal=40, seed=7, workers=2)}
+
+    assert serial == parallel
+    assert sorted(serial) == [0, 1, 2, 3]
+    assert all(puzzle.count("0") == 40 for puzzle in serial.values())
+
+def test_generate_puzzles_validates_at_call():
+
+    with pytest.raises(ValueError):
+
+        generate_puzzles(-1)
+
+    with pytest.raises(ValueError):
+
+        generate_puzzles(1, backend="dancing_links")
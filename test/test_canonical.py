@@ -0,0 +1,72 @@
+import pytest
+from app.main import SudokuFacade
+from app.batch import drop_duplicates
+from app.canonical import SolutionCache, canonical_form, apply_transformation, invert_transformation
+from app.grid import SudokuGrid
+from app.library.grids import extreme_grid
+
+def transform(cells):
+
+    # Transposes the grid, swaps its first two bands, reverses the columns of its first stack, and swaps the digits 1 and 2.
+    transposed = bytes(cells[col_index * 9 + row_index] for row_index in range(9) for col_index in range(9))
+
+    rows = [transposed[start:start + 9] for start in range(0, 81, 9)]
+    rows = rows[3:6] + rows[0:3] + rows[6:9]
+
+    return b"".join(bytes(row[2::-1]) + row[3:] for row in rows).translate(bytes.maketrans(b"\x01\x02", b"\x02\x01"))
+
+def test_canonical_form():
+
+    cells = bytes(SudokuGrid(extreme_grid).cells)
+
+    canonical, transformation = canonical_form(cells)
+
+    assert canonical_form(transform(cells))[0] == canonical
+    assert apply_transformation(cells, transformation) == canonical
+    assert apply_transformation(canonical, invert_transformation(transformation)) == cells
+    assert canonical_form(bytes(81))[0] == bytes(81)
+
+def test_solution_cache():
+
+    cache = SolutionCache(max_size=2)
+
+    for key in (b"a", b"b", b"a", b"c"):
+
+        cache.put(key, key)
+
+    assert cache.get(b"b") is None
+    assert cache.get(b"a") == b"a"
+    assert cache.get_stats() == {"size": 2, "hits": 1, "misses": 1}
+
+    with pytest.raises(ValueError):
+
+        SolutionCache(max_size=0)
+
+def test_solve_with_cache():
+
+    cache = SolutionCache()
+
+    sudoku = SudokuFacade(extreme_grid, cache=cache)
+
+    assert sudoku.solve()
+
+    puzzle = transform(bytes(SudokuGrid(extreme_grid).cells))
+
+    sudoku.grid.load(puzzle)
+
+    assert sudoku.solve()
+    assert cache.get_stats()["hits"] == 1
+    assert sudoku.validator.is_grid_valid()
+    assert all(num in (0, solved) for num, solved in zip(puzzle, sudoku.grid.cells))
+
+def test_drop_duplicates():
+
+    puzzle = SudokuGrid(extreme_grid).to_string()
+
+    symmetric = SudokuGrid()
+
+    symmetric.load(transform(bytes(SudokuGrid(extreme_grid).cells)))
+
+    records = [{"puzzle": puzzle}, {"puzzle": symmetric.to_string()}, {"puzzle": "0" * 81}]
+
+    assert list(drop_duplicates(records)) == [records[0], records[2]]
@@ -0,0 +1,84 @@
+import pytest
+from app.main import SudokuFacade
+from app.corpus import CorpusWriter, SudokuCorpus
+from app.serialisation import decode_string
+
+def test_corpus_round_trip(tmp_path):
+
+    path = str(tmp_path / "puzzles.corpus")
+
+    sudoku = SudokuFacade()
+
+    records = list(sudoku.generate_many(5, target_removal=50))
+
+    with CorpusWriter(path) as writer:
+
+        writer.extend(records, difficulty_level="medium")
+
+    with SudokuCorpus(path) as corpus:
+
+        assert len(corpus) == 5
+        assert corpus[-1] == decode_string(records[4]["puzzle"])
+        assert corpus.get_solution(2) == decode_string(records[2]["solution"])
+        assert corpus.get_metadata(0) == {"clues": 31, "difficulty": "medium"}
+        assert corpus.get_grid(1).to_string() == records[1]["puzzle"]
+        assert list(sudoku.solve_many(corpus)) == [record["solution"] for record in records]
+        assert list(corpus.iter_puzzles(start=-2)) == [decode_string(record["puzzle"]) for record in records[-2:]]
+        assert list(corpus.iter_puzzles(start=-9, stop=-4)) == [decode_string(records[0]["puzzle"])]
+
+        with pytest.raises(IndexError):
+
+            corpus.get_record(5)
+
+def test_corpus_rejects_incomplete_file(tmp_path):
+
+    path = tmp_path / "puzzles.corpus"
+
+    with CorpusWriter(str(path), solutions=False) as writer:
+
+        writer.append(bytes(81))
+
+    path.write_bytes(path.read_bytes()[:-1])
+
+    with pytest.raises(ValueError):
+
+        SudokuCorpus(str(path))
+
+def test_corpus_writer_rejects_invalid_record(tmp_path):
+
+    path = str(tmp_path / "puzzles.corpus")
+
+    with CorpusWriter(path) as writer:
+
+        writer.append(bytes(81), bytes(range(1, 10)) * 9)
+
+        with pytest.raises(ValueError):
+
+            writer.append(bytes([10]) + bytes(80), bytes(81))
+
+        with pytest.raises(ValueError):
+
+            writer.append(bytes(81), bytes(80))
+
+    assert writer.file.closed
+
+    with SudokuCorpus(path) as corpus:
+
+        assert len(corpus) == 1
+
+def test_corpus_without_solutions(tmp_path):
+
+    path = str(tmp_path / "puzzles.corpus")
+
+    with CorpusWriter(path, solutions=False) as writer:
+
+        writer.append(bytes(81))
+
+    with SudokuCorpus(path) as corpus:
+
+        assert list(corpus.iter_puzzles()) == [bytes(81)]
+
+        # The error is raised at the call, before any iteration.
+        with pytest.raises(ValueError):
+
+            corpus.iter_puzzles(solutions=True)
@@ -0,0 +1,25 @@
+import random
+from app.main import SudokuFacade
+from app.events import SudokuEvents
+from app.library.grids import full_grid
+
+def test_generator_events(capsys):
+
+    class RecordingEvents(SudokuEvents):
+
+        def __init__(self):
+
+            self.succeeded = []
+
+        def removal_succeeded(self, removal_count, target_removal):
+
+            self.succeeded.append((removal_count, target_removal))
+
+    events = RecordingEvents()
+
+    sudoku = SudokuFacade(full_grid, rng=random.Random(5), events=events)
+
+    sudoku.generator.generate_puzzle(target_removal=30)
+
+    assert events.succeeded == [(count, 30) for count in range(1, 31)]
+    assert capsys.readouterr().out == ""
@@ -1,5 +1,6 @@
 import pytest
 from app.grid import SudokuGrid
+from app.candidates import SudokuCandidates
 from app.library.grids import (
     
     empty_grid, 
@@ -35,6 +36,23 @@ def test_full_grid_initialisation():
 
     assert all(sudoku.grid[index][index] == grid_diagonal[index] for index in range(9))
 
+def test_invalid_grid_initialisation():
+
+    short_row = [row[:] for row in full_grid]
+    short_row[0] = short_row[0][:8]
+
+    large_value = [row[:] for row in full_grid]
+    large_value[0][0] = 12
+
+    negative_value = [row[:] for row in full_grid]
+    negative_value[0][0] = -1
+
+    for grid in (short_row, large_value, negative_value, full_grid[:8]):
+
+        with pytest.raises(ValueError):
+
+            SudokuGrid(grid)
+
 def test_get_row():
 
     sudoku = SudokuGrid(full_grid)
@@ -94,3 +112,132 @@ def test_get_subgrid_out_of_range():
     with pytest.raises(ValueError, match="row_index 9 and col_index 9 must be within range 0 to 8."):
 
         sudoku.get_subgrid(9, 9)
+
+
+
+def test_possible_values():
+
+    sudoku = SudokuGrid(easy_grid)
+
+    assert sudoku.possible_values(0, 0) == [num for num in range(1, 10) if num not in sudoku.get_containing_values(0, 0)]
+
+def test_set_and_reset_cell_update_masks():
+
+    sudoku = SudokuGrid()
+
+    sudoku.set_cell(0, 0, 5)
+
+    assert 5 not in sudoku.possible_values(0, 8)
+    assert 5 not in sudoku.possible_values(8, 0)
+    assert 5 not in sudoku.possible_values(2, 2)
+    assert 5 in sudoku.possible_values(4, 4)
+
+    sudoku.reset_cell(0, 0)
+
+    assert sudoku.possible_values(0, 8) == list(range(1, 10))
+
+def test_compatibility_view_assignment():
+
+    sudoku = SudokuGrid(easy_grid)
+
+    row_index, col_index = sudoku.find_next_empty_cell()
+
+    num = sudoku.possible_values(row_index, col_index)[0]
+
+    sudoku.grid[row_index][col_index] = num
+
+    assert sudoku.get_row(row_index)[col_index] == num
+    assert num not in sudoku.possible_values(row_index, (col_index + 1) % 9)
+    assert easy_grid[row_index][col_index] == 0
+
+    cells = bytes(sudoku.cells)
+
+    for col_index in (-1, 9):
+
+        with pytest.raises(IndexError):
+
+            sudoku.grid[1][col_index] = 5
+
+    assert bytes(sudoku.cells) == cells
+
+def test_to_list():
+
+    sudoku = SudokuGrid(full_grid)
+
+    assert sudoku.to_list() == full_grid
+    assert sudoku.grid == full_grid
+
+def test_empty_cell_tracking():
+
+    sudoku = SudokuGrid(easy_grid)
+
+    empty_cells = sum(cell == 0 for row in easy_grid for cell in row)
+
+    assert sudoku.count_empty_cells() == empty_cells
+
+    row_index, col_index = sudoku.find_next_empty_cell()
+
+    sudoku.set_cell(row_index, col_index, sudoku.possible_values(row_index, col_index)[0])
+
+    assert sudoku.count_empty_cells() == empty_cells - 1
+    assert (row_index, col_index) not in sudoku.get_empty_cell_indices()
+    assert sudoku.find_next_empty_cell() > (row_index, col_index)
+
+    sudoku.reset_cell(row_index, col_index)
+
+    assert sudoku.count_empty_cells() == empty_cells
+    assert sudoku.find_next_empty_cell() == (row_index, col_index)
+    assert len(sudoku.get_removable_cell_indices()) == 81 - empty_cells
+
+    # Setting zero on a filled cell empties it like reset_cell_at.
+    row_index, col_index = sudoku.get_removable_cell_indices()[0]
+
+    index = row_index * 9 + col_index
+
+    masks = list(sudoku.unit_masks)
+
+    sudoku.set_cell_at(index, 0)
+
+    assert sudoku.cells[index] == 0
+    assert sudoku.count_empty_cells() == empty_cells + 1
+    assert index in sudoku.get_empty_indices()
+    assert sudoku.unit_masks != masks
+    assert sudoku.unit_masks == SudokuGrid(sudoku.to_list()).unit_masks
+
+def test_candidates_place_and_sync():
+
+    grid = SudokuGrid(easy_grid)
+    candidates = SudokuCandidates(grid)
+
+    index = grid.find_next_empty_index()
+    num = candidates.get_values(index)[0]
+
+    candidates.place(index, num)
+
+    assert grid.cells[index] == num
+    assert candidates.masks == [0 if grid.cells[i] else grid.get_candidate_mask_at(i) for i in range(81)]
+
+    grid.reset_cell_at(index)
+
+    assert candidates.sync()
+    assert candidates.masks[index] == grid.get_candidate_mask_at(index)
+
+def test_load():
+
+    sudoku = SudokuGrid(full_grid)
+
+    puzzle = SudokuGrid(easy_grid).to_string()
+
+    sudoku.load(puzzle.replace("0", "."))
+
+    assert sudoku.to_list() == easy_grid
+    assert sudoku.unit_masks == SudokuGrid(easy_grid).unit_masks
+    assert sudoku.count_empty_cells() == puzzle.count("0")
+
+    sudoku.load(bytes(81))
+
+    assert sudoku.to_list() == empty_grid
+
+    with pytest.raises(ValueError):
+
+        sudoku.load(puzzle[:80] + "x")
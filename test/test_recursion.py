@@ -0,0 +1,194 @@
+import random
+import pytest
+from app.main import SudokuFacade
+from app.library.grids import (
+
+    empty_grid,
+    easy_grid,
+    master_grid,
+    extreme_grid,
+    mit,
+    full_grid,
+
+)
+
+@pytest.mark.parametrize("branching", ["first", "mrv"])
+def test_is_solution_unique(branching):
+
+    sudoku = SudokuFacade(master_grid)
+
+    assert sudoku.recursion.is_solution_unique(branching=branching)
+
+@pytest.mark.parametrize("least_constraining", [False, True])
+def test_mrv_get_total_solutions(least_constraining):
+
+    sudoku = SudokuFacade(mit)
+
+    assert sudoku.recursion.get_total_solutions(max_solutions=2, branching="mrv", least_constraining=least_constraining) == 2
+
+def test_mrv_populate_grid():
+
+    sudoku = SudokuFacade(empty_grid)
+
+    assert sudoku.recursion.populate_grid(branching="mrv", least_constraining=True)
+    assert sudoku.grid.count_empty_cells() == 0
+    assert sudoku.validator.is_grid_valid()
+
+def test_mrv_explores_fewer_nodes():
+
+    sudoku = SudokuFacade(extreme_grid)
+
+    sudoku.recursion.is_solution_unique(branching="first")
+
+    first_nodes = sudoku.recursion.nodes_explored
+
+    sudoku.recursion.is_solution_unique(branching="mrv")
+
+    assert sudoku.recursion.nodes_explored < first_nodes
+
+def test_invalid_branching_strategy():
+
+    sudoku = SudokuFacade(easy_grid)
+
+    with pytest.raises(ValueError, match="valid branching strategy"):
+
+        sudoku.recursion.is_solution_unique(branching="random")
+
+@pytest.mark.parametrize("branching", ["first", "mrv"])
+def test_propagating_search(branching):
+
+    sudoku = SudokuFacade(extreme_grid)
+
+    original_cells = bytes(sudoku.grid.cells)
+
+    assert sudoku.recursion.is_solution_unique(branching=branching, propagate=True)
+    assert bytes(sudoku.grid.cells) == original_cells
+
+    sudoku.recursion.is_solution_unique(branching=branching)
+
+    unpropagated_nodes = sudoku.recursion.nodes_explored
+
+    sudoku.recursion.is_solution_unique(branching=branching, propagate=True)
+
+    assert sudoku.recursion.nodes_explored < unpropagated_nodes
+
+@pytest.mark.parametrize("propagate", [False, True])
+def test_get_total_solutions_top_band_removed(propagate):
+
+    top_band_removed = [[0] * 9 for _ in range(3)] + [row[:] for row in full_grid[3:]]
+
+    sudoku = SudokuFacade(top_band_removed)
+
+    assert sudoku.recursion.get_total_solutions(branching="mrv", propagate=propagate) == 288
+
+@pytest.mark.parametrize("branching, propagate", [("first", True), ("mrv", False), ("mrv", True)])
+def test_capped_get_total_solutions_restores_grid(branching, propagate):
+
+    sudoku = SudokuFacade(mit)
+
+    original_cells = bytes(sudoku.grid.cells)
+    original_masks = list(sudoku.grid.unit_masks)
+
+    assert sudoku.recursion.get_total_solutions(max_solutions=2, branching=branching, propagate=propagate) == 2
+    assert bytes(sudoku.grid.cells) == original_cells
+    assert sudoku.grid.unit_masks == original_masks
+    assert sudoku.grid.count_empty_cells() == original_cells.count(0)
+
+def test_exact_cover_backend():
+
+    sudoku = SudokuFacade(extreme_grid, backend="exact_cover")
+
+    assert sudoku.solver is sudoku.exact_cover
+    assert sudoku.solver.is_solution_unique()
+
+def test_exact_cover_get_total_solutions():
+
+    top_band_removed = [[0] * 9 for _ in range(3)] + [row[:] for row in full_grid[3:]]
+
+    sudoku = SudokuFacade(top_band_removed, backend="exact_cover")
+
+    assert sudoku.solver.get_total_solutions() == 288
+    assert sudoku.solver.get_total_solutions(max_solutions=10) == 10
+
+def test_exact_cover_populate_grid():
+
+    sudoku = SudokuFacade(backend="exact_cover")
+
+    assert sudoku.solver.populate_grid()
+    assert sudoku.grid.count_empty_cells() == 0
+    assert sudoku.validator.is_grid_valid()
+
+def test_invalid_backend():
+
+    with pytest.raises(ValueError, match="valid backend"):
+
+        SudokuFacade(backend="quantum")
+
+def test_stack_search_backend():
+
+    sudoku = SudokuFacade(extreme_grid, backend="stack_search")
+
+    original_cells = bytes(sudoku.grid.cells)
+
+    assert sudoku.solver is sudoku.stack_search
+    assert sudoku.solver.is_solution_unique()
+    assert bytes(sudoku.grid.cells) == original_cells
+
+def test_stack_search_pause_and_resume():
+
+    top_band_removed = [[0] * 9 for _ in range(3)] + [row[:] for row in full_grid[3:]]
+
+    sudoku = SudokuFacade(top_band_removed, backend="stack_search")
+
+    state = sudoku.stack_search.start()
+
+    while not state.finished:
+
+        sudoku.stack_search.run(state, max_nodes=25)
+
+        assert state.depth <= 27
+
+    assert state.solutions == 288
+    assert sudoku.grid.count_empty_cells() == 27
+
+@pytest.mark.parametrize("backend", ["recursion", "exact_cover", "stack_search"])
+def test_is_removal_unique(backend):
+
+    sudoku = SudokuFacade(full_grid, backend=backend)
+
+    removable_cells = sudoku.grid.get_removable_cell_indices()
+
+    random.Random(0).shuffle(removable_cells)
+
+    # Every removal keeps the solution unique or is restored, so the known solution check must agree with a full search.
+    for row_index, col_index in removable_cells:
+
+        removed_num = sudoku.grid.get_cell(row_index, col_index)
+
+        sudoku.grid.reset_cell(row_index, col_index)
+
+        original_cells = bytes(sudoku.grid.cells)
+
+        is_unique = sudoku.solver.is_removal_unique(row_index, col_index, removed_num)
+
+        assert bytes(sudoku.grid.cells) == original_cells
+        assert is_unique == sudoku.recursion.is_solution_unique(branching="mrv", propagate=True)
+
+        if not is_unique:
+
+            sudoku.grid.set_cell(row_index, col_index, removed_num)
+
+    assert sudoku.grid.count_empty_cells() > 50
+
+def test_transformer_populate_grid():
+
+    sudoku = SudokuFacade(rng=random.Random(3))
+
+    assert sudoku.transformer.populate_grid()
+    assert sudoku.grid.count_empty_cells() == 0
+    assert sudoku.validator.is_grid_valid()
+
+    solutions = set(sudoku.transformer.iter_solutions(200))
+
+    assert len(solutions) == 200
+    assert all(sudoku.transformer.is_complete_solution(solution) for solution in solutions)
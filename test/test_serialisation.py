@@ -0,0 +1,74 @@
+import io
+import pytest
+from app.grid import SudokuGrid
+from app.serialisation import encode_string, decode_string, pack, unpack, read_strings, write_strings, read_packed, write_packed
+from app.library.grids import easy_grid, extreme_grid, full_grid
+
+PUZZLES = [bytes(SudokuGrid(grid).cells) for grid in (easy_grid, extreme_grid, full_grid)]
+
+def test_string_codec():
+
+    text = encode_string(PUZZLES[1], blank=".")
+
+    assert len(text) == 81
+    assert decode_string(text) == PUZZLES[1]
+    assert decode_string(text.replace(".", "0") + "\n") == PUZZLES[1]
+
+    with pytest.raises(ValueError):
+
+        decode_string(text[:80] + "x")
+
+    with pytest.raises(ValueError):
+
+        encode_string(PUZZLES[1], blank="x")
+
+    with pytest.raises(ValueError):
+
+        encode_string(b"\x0a" + PUZZLES[1][1:])
+
+def test_packed_codec():
+
+    assert all(len(pack(cells)) == 41 and unpack(pack(cells)) == cells for cells in PUZZLES)
+
+    with pytest.raises(ValueError):
+
+        pack(b"\x0a" * 81)
+
+@pytest.mark.parametrize("write, read", [(write_strings, read_strings), (write_packed, read_packed)])
+def test_bulk_round_trip(write, read):
+
+    file = io.BytesIO()
+
+    assert write(file, PUZZLES * 100) == 300
+
+    file.seek(0)
+
+    # A small chunk size reads the file across many chunks, splitting lines between them.
+    assert list(read(file, chunk_size=100)) == PUZZLES * 100
+
+# A file returning at most 50 bytes per read, as an unbuffered file or a pipe may.
+class ShortReads(io.BytesIO):
+
+    def read(self, size=-1):
+
+        return super().read(min(size, 50) if size >= 0 else 50)
+
+def test_read_packed_short_reads():
+
+    file = io.BytesIO()
+
+    write_packed(file, PUZZLES)
+
+    assert list(read_packed(ShortReads(file.getvalue()))) == PUZZLES
+
+    with pytest.raises(ValueError):
+
+        list(read_packed(ShortReads(file.getvalue()[:-1])))
+
+def test_write_strings_rejects_invalid_cells():
+
+    for puzzles, blank in (([PUZZLES[0], b"\x0a" * 81], b"0"), ([PUZZLES[0][:80]], b"0"), (PUZZLES, b"x")):
+
+        with pytest.raises(ValueError):
+
+            write_strings(io.BytesIO(), puzzles, blank)
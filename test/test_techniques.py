@@ -0,0 +1,195 @@
+import pytest
+from app.main import SudokuFacade
+from app.techniques import naked_single, hidden_single, describe_step
+from app.registry import REGISTRY, TechniqueRegistry, register_technique
+from app.iteration import SudokuIteration
+from app.library.grids import (
+
+    easy_grid,
+    hard_grid,
+    expert_grid,
+    master_grid,
+    extreme_grid,
+    mit,
+
+)
+
+@pytest.mark.parametrize("test_grid", [hard_grid, expert_grid, master_grid, extreme_grid])
+def test_candidate_techniques_solve(test_grid):
+
+    sudoku = SudokuFacade(test_grid)
+
+    sudoku.iteration.candidate_techniques()
+
+    assert sudoku.grid.count_empty_cells() == 0
+    assert sudoku.validator.is_grid_valid()
+
+def test_candidate_techniques_records():
+
+    sudoku = SudokuFacade(extreme_grid)
+
+    results = sudoku.iteration.candidate_techniques()
+
+    assert results["pointing"]["count"] > 0
+    assert results["pointing"]["eliminations"]
+    assert sum(len(result["indices"]) for result in results.values()) == 81 - sum(1 for row in extreme_grid for num in row if num)
+
+def test_describe_step():
+
+    sudoku = SudokuFacade(hard_grid)
+
+    step = next(naked_single(sudoku.iteration.candidates))
+
+    assert describe_step(step).startswith("Naked single: cell ")
+
+@pytest.mark.parametrize("test_grid", [hard_grid, extreme_grid, mit])
+def test_solve(test_grid):
+
+    sudoku = SudokuFacade(test_grid)
+
+    assert sudoku.solve()
+    assert sudoku.grid.count_empty_cells() == 0
+    assert sudoku.validator.is_grid_valid()
+    assert all(num in (0, sudoku.grid.get_cell(row_index, col_index)) for row_index, row in enumerate(test_grid) for col_index, num in enumerate(row))
+
+def test_solve_unsolvable():
+
+    test_grid = [[0] * 9 for _ in range(9)]
+    test_grid[0][:8] = [1, 2, 3, 4, 5, 6, 7, 8]
+    test_grid[1][8] = 9
+
+    sudoku = SudokuFacade(test_grid)
+
+    assert not sudoku.solve()
+    assert sudoku.grid.to_list() == test_grid
+
+def test_next_hint():
+
+    sudoku = SudokuFacade(extreme_grid)
+
+    before = sudoku.grid.to_string()
+
+    hint = sudoku.iteration.next_hint()
+
+    assert sudoku.grid.to_string() == before
+    assert hint["technique"] in ("naked_single", "hidden_single")
+    assert hint["digit"] in sudoku.grid.possible_values(*hint["cell"])
+    assert hint["justification"]
+
+    hints = 1
+
+    while hint is not None:
+
+        sudoku.iteration.apply_step(hint["step"])
+
+        hint = sudoku.iteration.next_hint()
+
+        hints += 1
+
+    assert sudoku.grid.count_empty_cells() == 0
+    assert sudoku.validator.is_grid_valid()
+
+def test_technique_registry():
+
+    registry = TechniqueRegistry(adaptive=True, min_samples=1)
+
+    @register_technique(cost=5, registry=registry)
+    def never_productive(candidates):
+
+        return iter(())
+
+    registry.register("hidden_single", hidden_single, 2)
+    registry.register("naked_single", naked_single, 1)
+
+    assert [name for name, _ in registry.ordered(adaptive=False)] == ["naked_single", "hidden_single", "never_productive"]
+    assert [name for name, _ in REGISTRY.ordered(adaptive=False)[:2]] == ["naked_single", "hidden_single"]
+
+    with pytest.raises(ValueError):
+
+        registry.register("free", naked_single, 0)
+
+    sudoku = SudokuFacade(extreme_grid)
+
+    iteration = SudokuIteration(sudoku.grid, sudoku.validator, registry=registry)
+
+    iteration.candidate_techniques()
+
+    stats = registry.get_stats()
+
+    assert stats["naked_single"]["hits"] > 0
+    assert stats["never_productive"]["calls"] > 0
+    assert stats["never_productive"]["hit_rate"] == 0.0
+
+    # A fixed ordering does not measure its techniques.
+    registry.adaptive = False
+
+    registry.reset_stats()
+
+    sudoku = SudokuFacade(extreme_grid)
+
+    SudokuIteration(sudoku.grid, sudoku.validator, registry=registry).candidate_techniques()
+
+    assert all(entry["calls"] == 0 for entry in registry.get_stats().values())
+
+    registry.adaptive = True
+
+    registry.reset_stats()
+
+    for _ in range(4):
+
+        registry.record("naked_single", True, 0.04)
+        registry.record("hidden_single", True, 0.02)
+        registry.record("never_productive", False, 0.01)
+
+    assert [name for name, _ in registry.ordered()] == ["hidden_single", "naked_single", "never_productive"]
+
+def test_batch_methods():
+
+    sudoku = SudokuFacade()
+
+    for count, target_removal, difficulty_level in ((-1, 40, None), (1, None, None), (1, 40, "easy"), (1, None, "trivial"), (1, 0, None)):
+
+        # Raised by the call itself, before any iteration.
+        with pytest.raises(ValueError):
+
+            sudoku.generate_many(count, target_removal, difficulty_level)
+
+    records = list(sudoku.generate_many(3, target_removal=45))
+
+    assert [record["clues"] for record in records] == [36, 36, 36]
+
+    puzzles = [record["puzzle"] for record in records] + [extreme_grid]
+
+    assert list(sudoku.validate_many(puzzles)) == [True] * 4
+    assert list(sudoku.solve_many(puzzles))[:3] == [record["solution"] for record in records]
+
+def test_placement_technique_after_grid_edit():
+
+    sudoku = SudokuFacade(easy_grid)
+
+    sudoku.iteration.candidates.sync()
+
+    # An edit made directly to the grid, which the candidates have not seen.
+    sudoku.grid.grid[1][5] = 2
+
+    for technique in (sudoku.iteration.naked_single, sudoku.iteration.only_containing_option, sudoku.iteration.placement_by_adjacent_units):
+
+        technique(1, 2)
+
+        assert sudoku.validator.is_grid_valid()
+
+def test_placement_techniques_counts():
+
+    sudoku = SudokuFacade(easy_grid)
+
+    placements = sudoku.iteration.placement_techniques()
+
+    assert {technique_type: result["count"] for technique_type, result in placements.items()} == {
+
+        "only_containing_option": 2,
+        "naked_single": 32,
+        "placement_by_adjacent_units": 9
+
+    }
+    assert sudoku.grid.count_empty_cells() == 0
+    assert sudoku.validator.is_grid_valid()
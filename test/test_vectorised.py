@@ -0,0 +1,36 @@
+import random
+import pytest
+from app.main import SudokuFacade
+from app.serialisation import decode_string
+
+np = pytest.importorskip("numpy")
+
+from app.vectorised import validate_grids
+
+def test_validate_grids():
+
+    sudoku = SudokuFacade(rng=random.Random(0))
+
+    records = list(sudoku.generate_many(4, target_removal=40))
+
+    puzzles = np.array([list(decode_string(record["puzzle"])) for record in records])
+    solutions = np.array([list(decode_string(record["solution"])) for record in records])
+
+    # A repeated value in the first row, second column and first subgrid of the last grid.
+    solutions[3, 1] = solutions[3, 0]
+
+    valid, conflicts = validate_grids(solutions.reshape(4, 9, 9), conflicts=True)
+
+    assert valid.tolist() == [True, True, True, False]
+    assert conflicts[3].nonzero()[0].tolist() == [0, 10, 18]
+    assert not conflicts[:3].any()
+
+    assert validate_grids(puzzles).all()
+    assert not validate_grids(puzzles, complete=True).any()
+    assert validate_grids(solutions[:3], complete=True).all()
+
+    assert list(sudoku.validate_many(solutions.astype(np.uint8).tobytes()[index * 81:(index + 1) * 81] for index in range(4))) == valid.tolist()
+
+    with pytest.raises(ValueError):
+
+        validate_grids(np.full((1, 81), 10))